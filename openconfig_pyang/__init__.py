@@ -1 +1,12 @@
 __version__="0.1.10"
+
+# The lint API imports pyang, which setup.py is run without, so it is
+# only imported when one of its names is first used.
+_API_NAMES = ("ErrorLevel", "LintError", "LintResult", "Linter", "lint")
+
+
+def __getattr__(name):
+  if name in _API_NAMES:
+    from openconfig_pyang import api
+    return getattr(api, name)
+  raise AttributeError("module %r has no attribute %r" % (__name__, name))
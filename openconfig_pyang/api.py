@@ -0,0 +1,221 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+Python API of the OpenConfig linter.
+
+Lints YANG modules, from files or from text held in memory, within the
+calling process, and returns the errors that pyang would report as
+LintError records rather than as text:
+
+  import openconfig_pyang
+  result = openconfig_pyang.lint(texts={"openconfig-foo.yang": text},
+                                 path=["public/release/models"])
+  for err in result.errors:
+    if err.level <= openconfig_pyang.ErrorLevel.MAJOR:
+      ...
+
+A Linter is kept to lint many sets of modules with the same search path
+and options. It scans the search path once, and keeps the OpenConfig
+parse and lint result caches in a directory, such that the modules that
+the sets import are not parsed, and their checks not run, again.
+
+pyang's validation state is global to the process, so calls from
+different threads are linted one at a time.
+"""
+
+from __future__ import unicode_literals
+
+import collections
+import shutil
+import tempfile
+import threading
+
+from pyang import error
+
+from openconfig_pyang import oclint
+
+oclint.init_plugins()
+_plugin = oclint.openconfig_plugin_module()
+
+ErrorLevel = _plugin.ErrorLevel
+
+_lock = threading.Lock()
+
+
+class LintError(collections.namedtuple("LintError", [
+    "code", "level", "kind", "file", "line", "module", "args", "message",
+    "uses"])):
+  """An error that pyang reports.
+
+  Attributes:
+    code: the error code, e.g. "OC_OPSTATE_CONTAINER_NAME".
+    level: the ErrorLevel of the code, or None for levels outside it.
+    kind: "error" or "warning", as pyang reports it with the options.
+    file: the file, or the key of the text, of the error.
+    line: the line of the error.
+    module: the name of the module that the error is in, or None.
+    args: tuple of the arguments of the error message, as strings.
+    message: the error message.
+    uses: a tuple of the file and line of the uses statement through
+      which an error within a grouping was found, or None.
+  """
+  __slots__ = ()
+
+  def __str__(self):
+    """Return the error as pyang writes it."""
+    label = "%s:%d" % (self.file, self.line)
+    if self.uses is not None:
+      label = "%s:%d (at %s)" % (self.uses[0], self.uses[1], label)
+    return "%s: %s: %s" % (label, self.kind, self.message)
+
+
+class LintResult(collections.namedtuple("LintResult",
+                                        ["exit_code", "errors"])):
+  """The result of linting a set of modules.
+
+  Attributes:
+    exit_code: the exit code that pyang returns for the modules.
+    errors: list of LintErrors, in the order that pyang reports them.
+  """
+  __slots__ = ()
+
+  @property
+  def ok(self):
+    return self.exit_code == 0
+
+
+class Linter(object):
+  """Lints sets of modules with the same search path and options.
+
+  The search path is scanned when the Linter is created; create a new
+  Linter to find modules that are added to it later.
+  """
+
+  def __init__(self, path=(), args=(), cache=True, cache_dir=None):
+    """Create a Linter.
+
+    Args:
+      path: list of directories to search for the modules that are
+        imported or included.
+      args: list of further oclint command line arguments, such as
+        ["--oc-only"] or ["--oc-disable", "OC_STYLE_AVOID_PRESENCE"].
+      cache: whether to keep the OpenConfig parse and lint result caches.
+      cache_dir: directory of the caches, a temporary directory that is
+        removed by close is used if it is not given. Ignored if args give
+        --oc-cache-dir.
+
+    Raises:
+      ValueError: if the arguments are invalid, or request output that is
+        written by pyang rather than returned.
+    """
+    args = [a for p in path for a in ("-p", p)] + list(args)
+    self.tmpdir = None
+    if cache and "--oc-cache-dir" not in args:
+      if cache_dir is None:
+        cache_dir = self.tmpdir = tempfile.mkdtemp(prefix="oclint-api-")
+      args = ["--oc-cache-dir", cache_dir] + args
+
+    try:
+      self.opts, filenames = oclint.parse_args(args)
+    except SystemExit:
+      self.close()
+      raise ValueError("invalid arguments: %s" % " ".join(args))
+    if (filenames or self.opts.watch or self.opts.jobs != 1 or
+        self.opts.openconfig_output_format):
+      self.close()
+      raise ValueError("unsupported arguments: %s" % " ".join(args))
+    self.repos = oclint.new_repository(self.opts)
+
+  def lint(self, files=(), texts=None):
+    """Lint a set of modules within a single pyang context.
+
+    Args:
+      files: list of paths of the modules to lint.
+      texts: optional dictionary of the text of modules to lint, keyed by
+        the name that errors refer to the module by, such as its filename.
+        Where the name is a YANG filename, the module name and revision
+        are checked against it, as for files.
+
+    Returns:
+      A LintResult.
+
+    Raises:
+      IOError: if a file cannot be read.
+      ValueError: if no modules are given, or a feature that a module
+        does not define is given.
+    """
+    files = list(files)
+    texts = dict(texts or {})
+    filenames = files + [t for t in texts if t not in files]
+    if not filenames:
+      raise ValueError("no modules to lint")
+
+    with _lock:
+      exit_code, ctx, _ = oclint.validate_module_set(
+          self.opts, filenames, texts, self.repos)
+      errors = []
+      for pos, tag, args in ctx.errors:
+        record = _plugin.OCLintOutput.record(ctx, pos, tag, args)
+        if record is None:
+          continue
+        try:
+          level = ErrorLevel(error.err_level(tag))
+        except ValueError:
+          level = None
+        uses = record["uses"]
+        errors.append(LintError(
+            record["code"], level, record["kind"], record["file"],
+            record["line"], record["module"], tuple(record["args"]),
+            record["message"],
+            (uses["file"], uses["line"]) if uses is not None else None))
+
+    if any(e.kind == "error" for e in errors):
+      exit_code = 1
+    # pyang reports the errors of the first input first, then by position.
+    errors.sort(key=lambda e: (e.file != filenames[0], e.file, e.line))
+    return LintResult(exit_code, errors)
+
+  def close(self):
+    """Remove the Linter's temporary cache directory, if it has one."""
+    if self.tmpdir is not None:
+      shutil.rmtree(self.tmpdir, ignore_errors=True)
+      self.tmpdir = None
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc):
+    self.close()
+
+
+def lint(files=(), texts=None, path=(), args=()):
+  """Lint a set of modules with the OpenConfig checks.
+
+  Args:
+    files: list of paths of the modules to lint.
+    texts: optional dictionary of the text of modules to lint, keyed by
+      the name that errors refer to the module by.
+    path: list of directories to search for the modules that are
+      imported or included.
+    args: list of further oclint command line arguments.
+
+  Returns:
+    A LintResult.
+
+  Raises:
+    IOError: if a file cannot be read.
+    ValueError: if the arguments are invalid, or no modules are given.
+  """
+  return Linter(path, args, cache=False).lint(files, texts)
@@ -0,0 +1,450 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+Batch linter for the build sets of an OpenConfig model repository.
+
+Reads the .spec.yml manifests of a checkout of openconfig/public, as
+tests/integration/gen.go does, and lints each build set that is marked
+run-ci with the OpenConfig checks, as the script generated by gen.go
+does with one pyang process for each set:
+
+  pyang --openconfig --oc-only -p <root> -p <root>/third_party/ietf ...
+
+The build sets are instead linted by a few long-running worker
+processes, one for each CPU by default, each linting one set at a time
+in its own pyang context. The scan of the search path is shared by the
+sets that a worker lints, and parsed modules are shared by all of the
+workers through the OpenConfig parse cache, in the directory given by
+--oc-cache-dir or otherwise in a temporary directory for the run, such
+that the IETF modules and the shared OpenConfig types are parsed once.
+
+Before the sets are linted, the import and include graph of the modules
+on the search path is read, and the sets are scheduled onto the workers
+by the modules that they load: sets that share large dependencies, such
+as openconfig-network-instance, are linted by the same worker, which
+parses those modules once and finds them in the cache for the rest of
+its sets, while sets with little in common are linted in parallel. With
+--schedule manifest, each set is instead given to the next free worker.
+
+The result of each set is written, in manifest order, as it is known,
+followed by the errors of a set that fails, and then the total time.
+
+  python -m openconfig_pyang.batch --models public
+"""
+
+from __future__ import print_function, unicode_literals
+
+import collections
+import multiprocessing
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import time
+
+import yaml
+
+from openconfig_pyang import oclint
+
+SPEC_FILENAME = ".spec.yml"
+
+# A set of modules that is built, and linted, together.
+BuildSet = collections.namedtuple("BuildSet", ["name", "directory", "files"])
+
+# The ways that build sets can be given to the workers.
+SCHEDULES = ("imports", "manifest")
+
+# The estimated cost of validating a build set, per byte of the modules
+# it loads, relative to parsing them and running the checks of modules
+# that are cached; each set validates all of the modules it loads, but
+# those are parsed and checked once by a worker.
+VALIDATE_COST = 2
+
+_clock = getattr(time, "perf_counter", time.time)
+
+# The repository of each search path in this process, keyed by the search
+# path and whether it is recursed into.
+_repositories = {}
+
+
+def read_manifest(model_root):
+  """Read the build sets of the models in a model repository.
+
+  Build files are named relative to the parent of the directory holding
+  the .spec.yml file, with their first path element replaced by it, as
+  gen.go names them.
+
+  Args:
+    model_root: path to a checkout of openconfig/public.
+
+  Returns:
+    A tuple of the list of BuildSets marked run-ci, ordered by directory,
+    and a list of warnings for the entries that could not be read.
+
+  Raises:
+    IOError: if a .spec.yml file cannot be read.
+  """
+  specs = {}
+  for dirpath, _, filenames in os.walk(model_root):
+    if SPEC_FILENAME in filenames:
+      reldir = os.path.relpath(dirpath, model_root)
+      specs[reldir.replace(os.sep, ":")] = os.path.join(dirpath,
+                                                        SPEC_FILENAME)
+
+  build_sets = []
+  warnings = []
+  for dirname in sorted(specs):
+    try:
+      with open(specs[dirname]) as fd:
+        models = yaml.safe_load(fd) or []
+    except yaml.YAMLError as e:
+      raise IOError("%s: %s" % (specs[dirname], e))
+
+    dir_parts = dirname.split(":")
+    for model in models:
+      if not model.get("run-ci"):
+        continue
+      if len(dir_parts) < 2:
+        warnings.append("cannot parse directory %s, expected >2 elements" %
+                        dirname)
+        continue
+      directory = os.path.join(*dir_parts[:-1])
+      files = []
+      for f in model.get("build") or []:
+        parts = f.split("/")
+        if len(parts) < 2:
+          warnings.append("invalid filename %s, expected >2 parts" % f)
+          continue
+        files.append(os.path.join(model_root, directory, *parts[1:]))
+      build_sets.append(BuildSet(model.get("name"), dirname.replace(":", "/"),
+                                 files))
+  return build_sets, warnings
+
+
+def lint_build_set(opts, filenames):
+  """Lint the modules of a build set within a new pyang context.
+
+  Args:
+    opts: the parsed command line options.
+    filenames: list of the build set's modules.
+
+  Returns:
+    A tuple of the exit code and the list of lines to report, as pyang
+    reports them for the modules.
+  """
+  search_path = oclint.search_path(opts)
+  key = (search_path, bool(opts.no_path_recurse))
+  if key not in _repositories:
+    _repositories[key] = oclint.new_repository(opts)
+  exit_code, reported = oclint.lint_module_set(
+      opts, filenames, repos=_repositories[key])
+  return exit_code, oclint.order_reported(reported, filenames)
+
+
+def _lint_build_set_worker(args):
+  opts, build_set = args
+  start = _clock()
+  try:
+    exit_code, lines = lint_build_set(opts, build_set.files)
+  except (IOError, ValueError) as e:
+    exit_code, lines = 1, ["%s" % e]
+  return exit_code, lines, _clock() - start
+
+
+def import_graph(opts):
+  """Read the modules that the modules on the search path refer to.
+
+  Args:
+    opts: the parsed command line options.
+
+  Returns:
+    A dictionary keyed by module name of a tuple of the size of the
+    module's text and the set of names of the modules it imports,
+    includes or belongs to. Where the search path holds several revisions
+    of a module, the largest is given with the references of all of them.
+  """
+  repos = oclint.new_repository(opts)
+  graph = {}
+  for name, _, handle in repos.get_modules_and_revisions(None):
+    try:
+      text = repos.get_module_from_handle(handle)[2]
+    except repos.ReadError:
+      continue
+    size, deps = graph.get(name, (0, set()))
+    graph[name] = (max(size, len(text)),
+                   deps | oclint.module_dependencies(text)[1])
+  return graph
+
+
+def build_set_closure(build_set, graph):
+  """Return the modules that linting a build set loads.
+
+  Args:
+    build_set: a BuildSet.
+    graph: the import graph of the search path, from import_graph.
+
+  Returns:
+    A dictionary of the size of each module that the set loads, keyed by
+    name, with the set's own modules given by their filenames.
+  """
+  closure = {}
+  pending = []
+  for filename in build_set.files:
+    try:
+      text = oclint.read_module_text(filename)
+    except IOError:
+      continue
+    name, deps, _ = oclint.module_dependencies(text)
+    closure[filename] = len(text)
+    pending.extend(deps - set([name]))
+
+  while pending:
+    name = pending.pop()
+    if name in closure or name not in graph:
+      continue
+    size, deps = graph[name]
+    closure[name] = size
+    pending.extend(deps)
+  return closure
+
+
+def schedule_build_sets(build_sets, graph, workers):
+  """Assign build sets to workers by the modules that they share.
+
+  The sets are placed, largest first, on the worker whose estimated work
+  grows the least by linting them: the set's own modules and the modules
+  that the worker has not yet loaded are parsed and checked, and all of
+  the modules it loads are validated. Sets that share the bulk of their
+  dependencies are thus placed together, until a worker is loaded more
+  than the others by more than it saves by reusing them.
+
+  Args:
+    build_sets: list of BuildSets.
+    graph: the import graph of the search path, from import_graph.
+    workers: the number of workers.
+
+  Returns:
+    A tuple of the list of the indices in build_sets of the sets given to
+    each worker, in manifest order and leaving out workers with no sets,
+    and a tuple of the estimated bytes of modules parsed by the workers
+    and by linting each set on its own.
+  """
+  closures = [build_set_closure(s, graph) for s in build_sets]
+  costs = [sum(c.values()) for c in closures]
+  loads = [0] * workers
+  loaded = [set() for _ in range(workers)]
+  groups = [[] for _ in range(workers)]
+  parsed = 0
+  for i in sorted(range(len(build_sets)), key=lambda i: (-costs[i], i)):
+    best = None
+    for w in range(workers):
+      parse = sum(size for name, size in closures[i].items()
+                  if name not in loaded[w])
+      key = (loads[w] + parse + VALIDATE_COST * costs[i], parse, w)
+      if best is None or key < best:
+        best = key
+    load, parse, w = best
+    loads[w] = load
+    loaded[w].update(closures[i])
+    groups[w].append(i)
+    parsed += parse
+  return [sorted(g) for g in groups if g], (parsed, sum(costs))
+
+
+def _lint_build_set_group_worker(plugindirs, opts, group, results):
+  oclint.init_plugins(plugindirs)
+  for index, build_set in group:
+    results.put((index, _lint_build_set_worker((opts, build_set))))
+
+
+def _lint_build_set_groups(opts, build_sets, groups):
+  """Lint groups of build sets, each in its own worker process.
+
+  Yields:
+    A tuple of the index of each build set and its result, as the sets
+    are linted.
+
+  Raises:
+    RuntimeError: if a worker exits without linting all of its sets.
+  """
+  results = multiprocessing.Queue()
+  workers = [multiprocessing.Process(
+      target=_lint_build_set_group_worker,
+      args=(oclint.loaded_plugin_dirs(), opts,
+            [(i, build_sets[i]) for i in group], results))
+             for group in groups]
+  for worker in workers:
+    worker.daemon = True
+    worker.start()
+  try:
+    for _ in range(sum(len(g) for g in groups)):
+      while True:
+        try:
+          yield results.get(timeout=1)
+          break
+        except queue.Empty:
+          if not any(w.is_alive() for w in workers) and results.empty():
+            raise RuntimeError("a batch worker exited unexpectedly")
+  finally:
+    for worker in workers:
+      worker.join(1)
+      if worker.is_alive():
+        worker.terminate()
+
+
+def lint_build_sets(opts, build_sets, stats=None):
+  """Lint build sets, in parallel where requested.
+
+  Args:
+    opts: the parsed command line options.
+    build_sets: list of BuildSets.
+    stats: optional dictionary that the number of workers, and the
+      estimated bytes parsed by them and by linting each set on its own,
+      are written to when the sets are scheduled by their imports.
+
+  Yields:
+    A tuple of the exit code, the lines to report and the time taken for
+    each build set, in the order of build_sets.
+  """
+  jobs = opts.jobs if opts.jobs > 0 else multiprocessing.cpu_count()
+  work = [(opts, s) for s in build_sets]
+  if jobs == 1 or len(build_sets) < 2:
+    for args in work:
+      yield _lint_build_set_worker(args)
+    return
+
+  jobs = min(jobs, len(build_sets))
+  if getattr(opts, "schedule", "imports") == "manifest":
+    # Workers are kept for all of the sets that they lint, since each
+    # context restores pyang's registrations before it is set up.
+    pool = multiprocessing.Pool(jobs, initializer=oclint.init_plugins,
+                                initargs=(oclint.loaded_plugin_dirs(),))
+    try:
+      for result in pool.imap(_lint_build_set_worker, work, chunksize=1):
+        yield result
+    finally:
+      pool.close()
+      pool.join()
+    return
+
+  groups, (parsed, unshared) = schedule_build_sets(
+      build_sets, import_graph(opts), jobs)
+  if stats is not None:
+    stats.update(workers=len(groups), parsed_bytes=parsed,
+                 unshared_bytes=unshared)
+  # Results are held until those of the sets before them are written.
+  done = {}
+  following = 0
+  for index, result in _lint_build_set_groups(opts, build_sets, groups):
+    done[index] = result
+    while following in done:
+      yield done.pop(following)
+      following += 1
+
+
+def add_batch_opts(optparser):
+  """Add the options of the batch linter to an oclint option parser."""
+  optparser.set_usage("""%prog --models <path> [options]
+
+Lints the build sets of the OpenConfig models in <path> that are marked
+run-ci in its .spec.yml files.""")
+  optparser.set_defaults(jobs=0)
+  g = optparser.add_option_group("Batch options")
+  g.add_option("--models",
+               dest="models",
+               metavar="PATH",
+               help="Path to the openconfig/public repo to lint models from")
+  g.add_option("--schedule",
+               dest="schedule",
+               type="choice",
+               choices=SCHEDULES,
+               default="imports",
+               help="""How build sets are given to the workers: imports
+               places sets that load the same modules on the same
+               worker, manifest gives each set to the next free worker
+               (default imports)""")
+
+
+def main(args=None):
+  """Lint the build sets of a model repository.
+
+  Args:
+    args: list of command line arguments, defaults to sys.argv[1:].
+
+  Returns:
+    0 if every build set passes, otherwise 1.
+  """
+  if args is None:
+    args = sys.argv[1:]
+  opts, extra = oclint.parse_args(args, add_batch_opts)
+  if not opts.models or extra:
+    sys.stderr.write("specify the OpenConfig model path with --models\n")
+    return 1
+  if (opts.watch or getattr(opts, "openconfig_output_format", None) or
+      getattr(opts, "openconfig_trace", None)):
+    sys.stderr.write("--watch, --oc-output-format and --oc-trace cannot be "
+                     "used with the batch linter\n")
+    return 1
+
+  # The options of the command that gen.go generates for each set.
+  opts.lint = False
+  opts.openconfig_only = True
+  opts.path = [opts.models,
+               os.path.join(opts.models, "third_party", "ietf")] + opts.path
+
+  start = _clock()
+  try:
+    build_sets, warnings = read_manifest(opts.models)
+  except IOError as e:
+    sys.stderr.write("%s\n" % e)
+    return 1
+  for warning in warnings:
+    sys.stderr.write("%s\n" % warning)
+
+  cachedir = None
+  if not opts.openconfig_cache_dir:
+    cachedir = tempfile.mkdtemp(prefix="oclint-batch-")
+    opts.openconfig_cache_dir = cachedir
+
+  failed = 0
+  stats = {}
+  try:
+    results = lint_build_sets(opts, build_sets, stats)
+    for build_set, (exit_code, lines, seconds) in zip(build_sets, results):
+      if exit_code != 0:
+        failed += 1
+      print("%s %s (%s, %d files) %.2fs" % (
+          "FAIL" if exit_code else "PASS", build_set.name,
+          build_set.directory, len(build_set.files), seconds))
+      if exit_code:
+        for line in lines:
+          print(line)
+      sys.stdout.flush()
+  finally:
+    if cachedir is not None:
+      shutil.rmtree(cachedir, ignore_errors=True)
+
+  summary = "%d build set(s), %d failed" % (len(build_sets), failed)
+  if stats:
+    summary += ", %d worker(s) parsing %d of %d kB" % (
+        stats["workers"], stats["parsed_bytes"] // 1024,
+        stats["unshared_bytes"] // 1024)
+  print("%s, %.2fs" % (summary, _clock() - start))
+  return 1 if failed else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,473 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+Benchmarks of the OpenConfig linter.
+
+Lints synthetic models of a range of sizes, generated by
+openconfig_pyang.modelgen, within this process as oclint does, and
+records for each size the wall time of the fastest of a number of runs,
+the peak memory allocated by a run, and the time of each validation
+phase and OpenConfig check from a run with --oc-stats. The time taken to
+import oclint and initialise pyang's plugins in a new interpreter, which
+every invocation of the linter pays, is also recorded, with the number
+of modules that were imported. The results are written as JSON.
+
+With --module, the given modules, such as openconfig-network-instance
+from a checkout of the OpenConfig public models, are linted rather than
+generated models. With --grouping-memo, each model is also timed with
+--oc-grouping-memo, to show the time that reusing the checks of grouping
+copies saves.
+
+With --compare, the results are compared with those of a baseline, and
+each time or peak memory that has grown by more than the threshold is
+reported as a regression. Times that are below --min-seconds in both are
+not compared, as they are dominated by noise.
+
+  python -m openconfig_pyang.benchmark -o baseline.json
+  python -m openconfig_pyang.benchmark -o current.json \\
+      --compare baseline.json
+  python -m openconfig_pyang.benchmark --grouping-memo -p public \\
+      --module public/release/models/network-instance/\\
+openconfig-network-instance.yang
+"""
+
+from __future__ import print_function, unicode_literals
+
+import collections
+import json
+import optparse
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+  import tracemalloc
+except ImportError:
+  tracemalloc = None
+
+import pyang
+
+from openconfig_pyang import modelgen
+from openconfig_pyang import oclint
+
+# The modelgen parameters of each size of model.
+SIZES = collections.OrderedDict([
+    ("small", {"depth": 1, "fanout": 2, "lists": 2, "leaves": 4}),
+    ("medium", {"modules": 2, "depth": 2, "fanout": 4, "lists": 10,
+                "leaves": 8}),
+    ("large", {"modules": 3, "depth": 3, "fanout": 4, "lists": 40,
+               "leaves": 8}),
+])
+
+# The phases of the OpenConfig plugin, which are reported first.
+PLUGIN_PHASES = ("preinit", "openconfig_type", "reference_2")
+
+_clock = getattr(time, "perf_counter", time.time)
+
+# Run in a new interpreter to time the start of the linter.
+_STARTUP_SCRIPT = """
+import sys, time
+clock = getattr(time, "perf_counter", time.time)
+start = clock()
+from openconfig_pyang import oclint
+oclint.init_plugins()
+print("%r %d" % (clock() - start, len(sys.modules)))
+"""
+
+
+def default_search_path():
+  """Return the directory of the modules that generated models import.
+
+  The directory is that of the test cases in a checkout of this
+  repository, which is not installed with the package.
+
+  Returns:
+    The directory, or None if it does not exist.
+  """
+  path = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                      "tests", "oclinter", "common")
+  if not os.path.isdir(path):
+    return None
+  return os.path.normpath(path)
+
+
+def openconfig_stats():
+  """Return the OpenConfig plugin's statistics, read by this module."""
+  stats = oclint.openconfig_plugin_module().OCLintStats
+  return stats.instance("json", report_at_exit=False)
+
+
+def memoized_checks():
+  """Return the names of the checks that --oc-grouping-memo reuses."""
+  memo = oclint.openconfig_plugin_module().OCGroupingMemo
+  return sorted(fn.__name__ for fn in memo.context_functions())
+
+
+def lint_once(path, filenames, args=()):
+  """Lint modules in-process, and return the time taken.
+
+  Args:
+    path: the search path for the modules.
+    filenames: list of the modules to lint.
+    args: list of further oclint arguments.
+  """
+  opts, _ = oclint.parse_args(["-p", path] + list(args) + filenames)
+  start = _clock()
+  oclint.lint_module_set(opts, filenames)
+  return _clock() - start
+
+
+def lint_stats(path, filenames, args=()):
+  """Lint modules in-process with --oc-stats, and return the statistics.
+
+  Args:
+    path: the search path for the modules.
+    filenames: list of the modules to lint.
+    args: list of further oclint arguments.
+
+  Returns:
+    A tuple of dictionaries of the calls, time and errors of each
+    validation phase and of each OpenConfig check, keyed by name.
+  """
+  stats = openconfig_stats()
+  stats.counters.clear()
+  lint_once(path, filenames, ["--oc-stats", "json"] + list(args))
+  phases = collections.OrderedDict()
+  checks = collections.OrderedDict()
+  for counter, (calls, total, _, errors, _) in sorted(
+      stats.counters.items()):
+    kind, _, counter = counter.partition(" ")
+    table = phases if kind == "phase" else checks
+    table[counter] = {"calls": calls, "seconds": total, "errors": errors}
+  stats.counters.clear()
+  return phases, checks
+
+
+def run_startup(repeat):
+  """Time the start of the linter in new interpreters.
+
+  Args:
+    repeat: number of timed starts.
+
+  Returns:
+    A tuple of the fastest start, in seconds, and the number of modules
+    loaded by it.
+  """
+  starts = []
+  for _ in range(repeat):
+    output = subprocess.check_output([sys.executable, "-c", _STARTUP_SCRIPT])
+    seconds, modules = output.decode("utf-8").split()
+    starts.append((float(seconds), int(modules)))
+  return min(starts)
+
+
+def run_size(name, params, path, repeat, grouping_memo=False):
+  """Benchmark the linter on a model of one size.
+
+  Args:
+    name: name of the size.
+    params: modelgen parameters of the model.
+    path: the search path for the modules that the model imports.
+    repeat: number of timed runs.
+    grouping_memo: whether to also time the runs with --oc-grouping-memo.
+
+  Returns:
+    A dictionary of the results for the size.
+  """
+  modules = modelgen.generate(**params)
+  directory = tempfile.mkdtemp(prefix="oclint-benchmark-")
+  try:
+    filenames = modelgen.write_modules(modules, directory)
+    return run_modules(name, filenames, path, repeat, grouping_memo,
+                       params)
+  finally:
+    shutil.rmtree(directory)
+
+
+def run_modules(name, filenames, path, repeat, grouping_memo=False,
+                params=None):
+  """Benchmark the linter on a set of modules.
+
+  Args:
+    name: name of the results.
+    filenames: list of the modules to lint.
+    path: the search path for the modules that they import.
+    repeat: number of timed runs.
+    grouping_memo: whether to also time the runs with --oc-grouping-memo.
+    params: modelgen parameters of the modules, if they were generated.
+
+  Returns:
+    A dictionary of the results for the modules.
+  """
+  lines = 0
+  for filename in filenames:
+    with open(filename) as fd:
+      lines += fd.read().count("\n")
+
+  # The first run also loads pyang's and the plugin's lazily loaded state.
+  lint_once(path, filenames)
+  wall = min(lint_once(path, filenames) for _ in range(repeat))
+  memo_wall = None
+  if grouping_memo:
+    memo_wall = min(lint_once(path, filenames, ["--oc-grouping-memo"])
+                    for _ in range(repeat))
+
+  peak = None
+  if tracemalloc is not None:
+    tracemalloc.start()
+    lint_once(path, filenames)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+  phases, checks = lint_stats(path, filenames)
+  memo_checks = None
+  if grouping_memo:
+    _, memo_checks = lint_stats(path, filenames, ["--oc-grouping-memo"])
+
+  result = collections.OrderedDict([("name", name)])
+  if params is not None:
+    result["params"] = params
+  result.update([
+      ("lines", lines),
+      ("wall_seconds", wall),
+      ("grouping_memo_wall_seconds", memo_wall),
+      ("peak_memory_bytes", peak),
+      ("plugin_phases", collections.OrderedDict(
+          (p, phases[p]["seconds"]) for p in PLUGIN_PHASES if p in phases)),
+      ("phases", phases),
+      ("checks", checks),
+      ("grouping_memo_checks", memo_checks),
+  ])
+  return result
+
+
+def run(sizes, path, repeat, grouping_memo=False, modules=None):
+  """Benchmark the linter on models of each size.
+
+  Args:
+    sizes: list of names of sizes in SIZES.
+    path: the search path for the modules that the models import.
+    repeat: number of timed runs of each size.
+    grouping_memo: whether to also time the runs with --oc-grouping-memo.
+    modules: optional list of modules to lint after the sizes, whose
+      results are named after the first of them.
+
+  Returns:
+    A dictionary of the results, and of the environment they were
+    recorded in.
+  """
+  startup_seconds, startup_modules = run_startup(repeat)
+  oclint.init_plugins()
+  results = [run_size(s, SIZES[s], path, repeat, grouping_memo)
+             for s in sizes]
+  if modules:
+    name = os.path.splitext(os.path.basename(modules[0]))[0]
+    results.append(run_modules(name, modules, path, repeat, grouping_memo))
+  return collections.OrderedDict([
+      ("pyang", pyang.__version__),
+      ("python", platform.python_version()),
+      ("platform", platform.platform()),
+      ("repeat", repeat),
+      ("startup_seconds", startup_seconds),
+      ("startup_modules", startup_modules),
+      ("sizes", results),
+  ])
+
+
+def startup_metrics(results):
+  """Return the compared metrics of the start of the linter."""
+  return collections.OrderedDict(
+      (m, results.get(m)) for m in ("startup_seconds", "startup_modules"))
+
+
+def metrics(result):
+  """Return the compared metrics of a size, keyed by name."""
+  values = collections.OrderedDict()
+  values["wall_seconds"] = result["wall_seconds"]
+  if result.get("grouping_memo_wall_seconds") is not None:
+    values["grouping_memo_wall_seconds"] = (
+        result["grouping_memo_wall_seconds"])
+  for phase, seconds in result["plugin_phases"].items():
+    values["phase %s seconds" % phase] = seconds
+  for check, counter in result["checks"].items():
+    values["check %s seconds" % check] = counter["seconds"]
+  if result["peak_memory_bytes"] is not None:
+    values["peak_memory_bytes"] = result["peak_memory_bytes"]
+  return values
+
+
+def compare(baseline, current, threshold, min_seconds):
+  """Compare results with those of a baseline.
+
+  Args:
+    baseline: results of the baseline.
+    current: results to compare.
+    threshold: the fraction by which a metric may grow.
+    min_seconds: times that are below this in both results are not
+      compared.
+
+  Returns:
+    A tuple of the lines of the comparison, and the list of regressions,
+    each a tuple of the size, the metric, and its baseline and current
+    values.
+  """
+  lines = []
+  compared = [("startup", startup_metrics(baseline), startup_metrics(current))]
+  base_sizes = dict((r["name"], r) for r in baseline["sizes"])
+  for result in current["sizes"]:
+    base = base_sizes.get(result["name"])
+    if base is None:
+      lines.append("%s: not in the baseline" % result["name"])
+      continue
+    compared.append((result["name"], metrics(base), metrics(result)))
+
+  regressions = []
+  for name, base_metrics, current_metrics in compared:
+    for metric, value in current_metrics.items():
+      old = base_metrics.get(metric)
+      if old is None or value is None:
+        continue
+      if metric.endswith("seconds") and max(old, value) < min_seconds:
+        continue
+      change = (value - old) / float(old) if old else 0.0
+      flag = ""
+      if value > old * (1 + threshold):
+        flag = "REGRESSION"
+        regressions.append((name, metric, old, value))
+      lines.append("%-8s %-48s %14.6g %14.6g %+8.1f%% %s" % (
+          name, metric, old, value, 100 * change, flag))
+  return lines, regressions
+
+
+def main(args=None):
+  """Run the benchmarks, and compare them with a baseline if given.
+
+  Args:
+    args: list of command line arguments, defaults to sys.argv[1:].
+
+  Returns:
+    1 if a regression was found, otherwise 0.
+  """
+  if args is None:
+    args = sys.argv[1:]
+  optparser = optparse.OptionParser("%prog [options]")
+  optparser.add_option("-o", "--output",
+                       dest="output",
+                       default="oclint-benchmark.json",
+                       help="""File to write the results to (default
+                       oclint-benchmark.json)""")
+  optparser.add_option("--sizes",
+                       dest="sizes",
+                       default=",".join(SIZES),
+                       help="""Comma-separated sizes of model to lint, of
+                       %s (default all)""" % ", ".join(SIZES))
+  optparser.add_option("--module",
+                       dest="modules",
+                       action="append",
+                       default=[],
+                       help="""Module to lint rather than the generated
+                       models of --sizes, which may be given more than
+                       once""")
+  optparser.add_option("--grouping-memo",
+                       dest="grouping_memo",
+                       action="store_true",
+                       help="""Also time each model with
+                       --oc-grouping-memo""")
+  optparser.add_option("--repeat",
+                       dest="repeat",
+                       type="int",
+                       default=3,
+                       help="Number of timed runs of each size (default 3)")
+  optparser.add_option("-p", "--path",
+                       dest="path",
+                       default=default_search_path(),
+                       help="""Search path containing
+                       openconfig-extensions, required unless run from a
+                       checkout of oc-pyang""")
+  optparser.add_option("--compare",
+                       dest="compare",
+                       metavar="BASELINE",
+                       help="Compare the results with those in BASELINE")
+  optparser.add_option("--threshold",
+                       dest="threshold",
+                       type="float",
+                       default=0.2,
+                       help="""Fraction by which a time or the peak memory
+                       may grow before it is a regression (default 0.2)""")
+  optparser.add_option("--min-seconds",
+                       dest="min_seconds",
+                       type="float",
+                       default=0.005,
+                       help="""Times below this in both the baseline and
+                       the results are not compared (default 0.005)""")
+  opts, _ = optparser.parse_args(args)
+
+  if opts.path is None:
+    optparser.error("-p is required where the test modules of oc-pyang "
+                    "are not found")
+
+  sizes = []
+  if not opts.modules:
+    sizes = [s.strip() for s in opts.sizes.split(",") if s.strip()]
+  unknown = [s for s in sizes if s not in SIZES]
+  if unknown or opts.repeat < 1:
+    optparser.error("unknown size(s): %s" % ", ".join(unknown) if unknown
+                    else "--repeat must be at least 1")
+
+  results = run(sizes, opts.path, opts.repeat, opts.grouping_memo,
+                opts.modules)
+  with open(opts.output, "w") as fd:
+    json.dump(results, fd, indent=2)
+    fd.write("\n")
+
+  print("startup: %.3fs, %d modules" % (results["startup_seconds"],
+                                        results["startup_modules"]))
+  for result in results["sizes"]:
+    print("%s: %d lines, %.3fs, %s" % (
+        result["name"], result["lines"], result["wall_seconds"],
+        ", ".join("%s %.3fs" % i for i in result["plugin_phases"].items())))
+    memo_wall = result["grouping_memo_wall_seconds"]
+    if memo_wall is not None:
+      print("%s: %.3fs with --oc-grouping-memo (%.2fx)" % (
+          result["name"], memo_wall, result["wall_seconds"] / memo_wall))
+      for check in memoized_checks():
+        full = result["checks"].get(check)
+        memo = result["grouping_memo_checks"].get(check)
+        if full is not None and memo is not None:
+          print("  %s: %.3fs, %.3fs with --oc-grouping-memo" % (
+              check, full["seconds"], memo["seconds"]))
+
+  if not opts.compare:
+    return 0
+
+  with open(opts.compare) as fd:
+    baseline = json.load(fd)
+  lines, regressions = compare(baseline, results, opts.threshold,
+                               opts.min_seconds)
+  for line in lines:
+    print(line)
+  if regressions:
+    print("%d regression(s) beyond %.0f%%" % (len(regressions),
+                                              100 * opts.threshold))
+    return 1
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
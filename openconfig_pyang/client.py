@@ -0,0 +1,222 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+Client for the OpenConfig lint daemon.
+
+Sends the oclint arguments to a daemon started with oclint --serve, and
+writes the errors that it returns. pyang is only imported where no
+daemon is running, in which case the modules are linted in-process.
+
+Each request is a single line of JSON, an object with the working
+directory ("cwd") and the oclint arguments ("args"). The response is a
+single line of JSON, an object with the exit code ("exit_code") and the
+lines that oclint writes ("lines"), or an "error" message where the
+daemon could not lint the modules. Where the daemon cannot be reached,
+does not respond within the timeout, or returns an error, the modules
+are linted in-process.
+"""
+
+from __future__ import print_function, unicode_literals
+
+import errno
+import json
+import os
+import socket
+import stat
+import sys
+import tempfile
+
+# Arguments that are handled by the client, and not sent to the daemon.
+CLIENT_FLAGS = ("--client", "--json")
+
+# Seconds to wait for the daemon to respond to a request, after which the
+# modules are linted in-process.
+REQUEST_TIMEOUT = 300
+
+
+def private_socket_dir():
+  """Return the directory for the default socket in the temp directory."""
+  return os.path.join(tempfile.gettempdir(), "oclint-%d" % os.getuid())
+
+
+def default_socket_path():
+  """Return the default path of the daemon's Unix domain socket.
+
+  The socket is kept in XDG_RUNTIME_DIR, which only the user may access,
+  or otherwise in a directory of the temporary directory that is created
+  for the user, see check_socket_path.
+  """
+  runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+  if runtime_dir:
+    return os.path.join(runtime_dir, "oclint-%d.sock" % os.getuid())
+  return os.path.join(private_socket_dir(), "oclint.sock")
+
+
+def check_socket_path(path, create=False):
+  """Check that the daemon's socket was not created by another user.
+
+  Other users may create files in a shared directory such as /tmp, where
+  a socket that they created in place of the daemon's would otherwise be
+  sent the working directory and arguments of each request, and return
+  its own results. A socket that exists must belong to the user, and the
+  directory of the default socket in the temporary directory must belong
+  to the user and be accessible by the user only.
+
+  Args:
+    path: path of the socket.
+    create: whether to create the directory of the default socket, where
+      it does not exist.
+
+  Raises:
+    socket.error: if the socket, or its directory, is not the user's.
+  """
+  uid = os.getuid()
+  directory = os.path.dirname(os.path.abspath(path))
+  if directory == os.path.abspath(private_socket_dir()):
+    if create:
+      try:
+        os.mkdir(directory, 0o700)
+      except OSError as e:
+        if e.errno != errno.EEXIST:
+          raise
+    st = os.lstat(directory)
+    if (not stat.S_ISDIR(st.st_mode) or st.st_uid != uid or
+        st.st_mode & 0o077):
+      raise socket.error("%s is not a directory that only the user may "
+                         "access" % directory)
+
+  try:
+    st = os.lstat(path)
+  except OSError:
+    return
+  if not stat.S_ISSOCK(st.st_mode) or st.st_uid != uid:
+    raise socket.error("%s is not a socket that belongs to the user" % path)
+
+
+def split_client_args(args):
+  """Separate the client's own arguments from the oclint arguments.
+
+  Args:
+    args: list of command line arguments.
+
+  Returns:
+    A tuple of the oclint arguments, the socket path, and whether the
+    response is to be written as JSON.
+  """
+  path = default_socket_path()
+  as_json = False
+  lint_args = []
+  i = 0
+  while i < len(args):
+    arg = args[i]
+    if arg == "--socket" and i + 1 < len(args):
+      path = args[i+1]
+      i += 1
+    elif arg.startswith("--socket="):
+      path = arg[len("--socket="):]
+    elif arg == "--json":
+      as_json = True
+    elif arg not in CLIENT_FLAGS:
+      lint_args.append(arg)
+    i += 1
+  return lint_args, path, as_json
+
+
+def request(path, cwd, args, timeout=REQUEST_TIMEOUT):
+  """Send a lint request to the daemon.
+
+  Args:
+    path: path of the daemon's socket.
+    cwd: the directory that relative filenames are resolved from.
+    args: list of oclint arguments.
+    timeout: seconds to wait for each operation on the socket, or None
+      to wait indefinitely.
+
+  Returns:
+    The response from the daemon.
+
+  Raises:
+    socket.error: if the daemon cannot be reached, the socket is not the
+      user's, or the daemon does not respond within the timeout.
+    ValueError: if the response cannot be decoded.
+  """
+  check_socket_path(path)
+  sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+  try:
+    sock.settimeout(timeout)
+    sock.connect(path)
+    payload = json.dumps({"cwd": cwd, "args": args}) + "\n"
+    sock.sendall(payload.encode("utf-8"))
+    sock.shutdown(socket.SHUT_WR)
+    chunks = []
+    while True:
+      chunk = sock.recv(65536)
+      if not chunk:
+        break
+      chunks.append(chunk)
+  finally:
+    sock.close()
+  return json.loads(b"".join(chunks).decode("utf-8"))
+
+
+def lint_in_process(args):
+  """Lint the modules within this process where no daemon is running.
+
+  Args:
+    args: list of oclint arguments.
+
+  Returns:
+    A response in the same form as that returned by the daemon.
+  """
+  # pyang is imported only when it is needed.
+  from openconfig_pyang import oclint
+  opts, filenames = oclint.parse_args(args)
+  try:
+    exit_code, lines = oclint.lint(opts, filenames)
+  except (IOError, ValueError) as e:
+    exit_code, lines = 1, ["%s" % e]
+  return {"exit_code": exit_code, "lines": lines}
+
+
+def main(args=None):
+  """Run the OpenConfig linter through the daemon.
+
+  Args:
+    args: list of command line arguments, defaults to sys.argv[1:].
+
+  Returns:
+    The exit code that oclint returns for the same arguments.
+  """
+  if args is None:
+    args = sys.argv[1:]
+  lint_args, path, as_json = split_client_args(args)
+
+  try:
+    response = request(path, os.getcwd(), lint_args, REQUEST_TIMEOUT)
+  except (socket.error, ValueError):
+    response = None
+  if response is None or "error" in response:
+    response = lint_in_process(lint_args)
+
+  if as_json:
+    print(json.dumps(response))
+  else:
+    for line in response["lines"]:
+      sys.stderr.write(line + "\n")
+  return response["exit_code"]
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,227 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+Long-lived OpenConfig lint daemon.
+
+Loads pyang and its plugins once, and serves lint requests from
+openconfig_pyang.client over a Unix domain socket. A LintSession is kept
+for each recent combination of working directory and arguments, such
+that modules that have not changed since the last request, such as the
+IETF and OpenConfig modules in the search path, are not parsed again.
+The parsed modules are also kept in a parse cache that is shared by all
+sessions, keyed by the path and text of each module, such that a
+request for a new set of modules, such as the files staged for each
+commit, does not parse the modules that they import again.
+
+pyang's validation state is global to the process, so requests are
+accepted concurrently and queued, and linted one at a time.
+"""
+
+from __future__ import print_function, unicode_literals
+
+import collections
+import json
+import optparse
+import os
+import socket
+import sys
+import threading
+import traceback
+
+try:
+  import socketserver
+except ImportError:
+  import SocketServer as socketserver
+
+from openconfig_pyang import client
+from openconfig_pyang import oclint
+from openconfig_pyang.plugins.util import lint_cache
+
+
+class LintRequestHandler(socketserver.StreamRequestHandler):
+  """Handles a single JSON lint request on a connection."""
+
+  def handle(self):
+    try:
+      req = json.loads(self.rfile.readline().decode("utf-8"))
+      cwd, args = req["cwd"], list(req["args"])
+    except (ValueError, KeyError, TypeError) as e:
+      response = {"error": "invalid request: %s" % e}
+    else:
+      try:
+        response = self.server.lint(cwd, args)
+      except Exception as e:
+        # The client lints the modules in-process instead.
+        traceback.print_exc()
+        response = {"error": "lint failed: %s: %s" % (type(e).__name__, e)}
+    self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+
+
+class LintServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+  """Unix domain socket server that lints modules with kept sessions."""
+
+  daemon_threads = True
+
+  def __init__(self, path, max_sessions=8, parse_cache_size=256):
+    socketserver.UnixStreamServer.__init__(self, path, LintRequestHandler)
+    os.chmod(path, 0o600)
+    self.path = path
+    self.max_sessions = max_sessions
+    self.parse_cache = lint_cache.MemoryParsedModuleCache(
+        parse_cache_size * 1024 * 1024)
+    self.lock = threading.Lock()
+    # (session, filenames) keyed by working directory and arguments, in
+    # order of least recent use.
+    self.sessions = collections.OrderedDict()
+
+  def lint(self, cwd, args):
+    """Lint modules with the session for the directory and arguments.
+
+    Args:
+      cwd: the directory that relative filenames are resolved from.
+      args: list of oclint arguments.
+
+    Returns:
+      The response to send to the client.
+    """
+    with self.lock:
+      try:
+        os.chdir(cwd)
+      except OSError as e:
+        return {"error": "%s" % e}
+
+      key = (cwd, tuple(args))
+      entry = self.sessions.pop(key, None)
+      if entry is None:
+        try:
+          opts, filenames = oclint.parse_args(args)
+        except SystemExit:
+          return {"error": "invalid arguments"}
+        if (not filenames or opts.watch or
+            getattr(opts, "openconfig_output_format", None) or
+            getattr(opts, "openconfig_fail_fast", None)):
+          # The output format is written to the daemon's stdout, and
+          # modules that validation is stopped in cannot be kept, so these
+          # are only supported when linting in-process.
+          return {"error": "unsupported arguments"}
+        # Used unless the arguments give --oc-cache-dir.
+        opts.openconfig_parse_cache = self.parse_cache
+        entry = (oclint.LintSession(opts), filenames)
+
+      self.sessions[key] = entry
+      while len(self.sessions) > self.max_sessions:
+        self.sessions.popitem(last=False)
+
+      session, filenames = entry
+      try:
+        exit_code, lines = session.lint(filenames)
+      except Exception:
+        # The state of the session is not known, so it is not kept.
+        self.sessions.pop(key, None)
+        raise
+      return {"exit_code": exit_code, "lines": lines}
+
+  def server_close(self):
+    socketserver.UnixStreamServer.server_close(self)
+    try:
+      os.remove(self.path)
+    except OSError:
+      pass
+
+
+def remove_stale_socket(path):
+  """Remove a socket left by a daemon that is no longer running.
+
+  Args:
+    path: path of the daemon's socket.
+
+  Returns:
+    False if a daemon is already listening on the socket.
+  """
+  if not os.path.exists(path):
+    return True
+  sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+  try:
+    sock.connect(path)
+    return False
+  except socket.error:
+    os.remove(path)
+    return True
+  finally:
+    sock.close()
+
+
+def main(args=None):
+  """Run the lint daemon until it is interrupted.
+
+  Args:
+    args: list of command line arguments, defaults to sys.argv[1:].
+
+  Returns:
+    The exit code of the daemon.
+  """
+  if args is None:
+    args = sys.argv[1:]
+  optparser = optparse.OptionParser("%prog [options]")
+  optparser.add_option("--socket",
+                       dest="socket",
+                       default=client.default_socket_path(),
+                       help="Path of the Unix domain socket to listen on")
+  optparser.add_option("--max-sessions",
+                       dest="max_sessions",
+                       type="int",
+                       default=8,
+                       help="""Number of sets of modules and options to keep
+                       parsed (default 8)""")
+  optparser.add_option("--parse-cache-size",
+                       dest="parse_cache_size",
+                       type="int",
+                       default=256,
+                       metavar="MB",
+                       help="""Maximum size of the parsed modules kept for
+                       all sets of modules (default 256)""")
+  optparser.add_option("--plugindir",
+                       dest="plugindir",
+                       action="append",
+                       default=[],
+                       help="Load pyang plugins from PLUGINDIR")
+  optparser.add_option("--serve", action="store_true",
+                       help=optparse.SUPPRESS_HELP)
+  opts, _ = optparser.parse_args(args)
+
+  oclint.init_plugins(opts.plugindir)
+  try:
+    client.check_socket_path(opts.socket, create=True)
+  except (OSError, socket.error) as e:
+    sys.stderr.write("oclint: cannot serve on %s: %s\n" % (opts.socket, e))
+    return 1
+  if not remove_stale_socket(opts.socket):
+    sys.stderr.write("oclint: a daemon is already listening on %s\n" %
+                     opts.socket)
+    return 1
+
+  server = LintServer(opts.socket, opts.max_sessions, opts.parse_cache_size)
+  sys.stderr.write("oclint: serving on %s\n" % opts.socket)
+  try:
+    server.serve_forever()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    server.server_close()
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
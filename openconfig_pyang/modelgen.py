@@ -0,0 +1,496 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+Synthetic OpenConfig-style model generator.
+
+Writes a set of YANG modules in the style of the OpenConfig models, of a
+size given by the generator's parameters, for testing the linter and the
+output plugins at scale. A types module defines identities and typedefs,
+and each data module defines a tree of containers with "config" and
+"state" containers, lists within surrounding containers, and groupings
+that are shared by the "state" containers. Each data module after the
+first augments containers of the module before it.
+
+Without violations, the modules are free of OpenConfig lint errors, given
+a search path that contains openconfig-extensions. Each violation adds a
+single instance of one of VIOLATIONS, in turn, at a location that is
+chosen at random. The same parameters and seed always generate the same
+modules.
+
+  python -m openconfig_pyang.modelgen --depth 3 --fanout 4 -o models
+  pyang --openconfig --plugindir openconfig_pyang/plugins \\
+      -p tests/oclinter/common models/*.yang
+"""
+
+from __future__ import print_function, unicode_literals
+
+import collections
+import io
+import optparse
+import os
+import random
+import sys
+
+# The parameters of the generator, and their defaults.
+DEFAULTS = collections.OrderedDict([
+    ("modules", 1),
+    ("depth", 2),
+    ("fanout", 3),
+    ("lists", 2),
+    ("leaves", 4),
+    ("state_leaves", 1),
+    ("groupings", 2),
+    ("augments", 1),
+    ("identities", 8),
+    ("typedefs", 4),
+    ("violations", 0),
+    ("seed", 0),
+    ("name", "openconfig-synth"),
+])
+
+# The kinds of violation, and the error codes that they are reported with.
+VIOLATIONS = collections.OrderedDict([
+    ("opstate", "OC_OPSTATE_CONTAINER_NAME"),
+    ("presence", "OC_STYLE_AVOID_PRESENCE"),
+    ("config-property", "OC_OPSTATE_CONFIG_PROPERTY"),
+    ("bad-type", "OC_BAD_TYPE"),
+    ("unquoted-key", "OC_KEY_ARGUMENT_UNQUOTED"),
+    ("list-sibling", "OC_LIST_HAS_SIBLING"),
+    ("enum-case", "OC_ENUM_CASE"),
+    ("identity-case", "OC_IDENTITY_CASE"),
+])
+
+VERSION = "1.0.0"
+REVISION = "2026-01-01"
+
+# Keywords whose argument is written quoted, as the OpenConfig models do.
+QUOTED_KEYWORDS = frozenset([
+    "yang-version", "namespace", "prefix", "organization", "contact",
+    "description", "reference", "revision", "key", "path", "presence",
+    "range", "length", "oc-ext:openconfig-version",
+])
+
+
+class Stmt(object):
+  """A YANG statement to be written."""
+
+  def __init__(self, keyword, arg=None, substmts=None, quoted=None):
+    self.keyword = keyword
+    self.arg = arg
+    self.substmts = substmts if substmts is not None else []
+    if quoted is None:
+      quoted = keyword in QUOTED_KEYWORDS
+    self.quoted = quoted
+
+  def add(self, keyword, arg=None, substmts=None, quoted=None):
+    """Add a substatement, and return it."""
+    stmt = Stmt(keyword, arg, substmts, quoted)
+    self.substmts.append(stmt)
+    return stmt
+
+  def search_one(self, keyword):
+    for s in self.substmts:
+      if s.keyword == keyword:
+        return s
+    return None
+
+  def write(self, out, indent=""):
+    """Write the statement to a list of lines.
+
+    Args:
+      out: list that the lines are appended to.
+      indent: the indentation of the statement.
+    """
+    line = indent + self.keyword
+    if self.arg is not None:
+      if self.quoted:
+        arg = self.arg.replace("\\", "\\\\").replace("\"", "\\\"")
+        line += " \"%s\"" % arg
+      else:
+        line += " " + self.arg
+    if not self.substmts:
+      out.append(line + ";")
+      return
+    out.append(line + " {")
+    for s in self.substmts:
+      s.write(out, indent + "  ")
+    out.append(indent + "}")
+
+
+class ModelGenerator(object):
+  """Generates the modules for a set of parameters.
+
+  Args:
+    params: dictionary of parameters, missing values are taken from
+      DEFAULTS.
+  """
+
+  def __init__(self, params=None):
+    self.params = dict(DEFAULTS)
+    self.params.update(params or {})
+    for name, default in DEFAULTS.items():
+      if isinstance(default, int) and self.params[name] < 0:
+        raise ValueError("%s must not be negative" % name)
+    self.random = random.Random(self.params["seed"])
+    # Statements that violations can be added at.
+    self.sites = collections.defaultdict(list)
+    self.modules = collections.OrderedDict()
+
+  def name(self, suffix=None):
+    """Return the name of a generated module."""
+    if suffix is None:
+      return self.params["name"]
+    return "%s-%s" % (self.params["name"], suffix)
+
+  def prefix(self, suffix):
+    """Return the prefix of a generated module."""
+    return "oc-synth-%s" % suffix
+
+  def module_header(self, suffix, description, imports=()):
+    """Return a module statement with its header statements.
+
+    Args:
+      suffix: suffix of the module name.
+      description: description of the module.
+      imports: list of tuples of a module name and its prefix.
+    """
+    module = Stmt("module", self.name(suffix))
+    module.add("yang-version", "1")
+    module.add("namespace", "http://openconfig.net/yang/synth/%s" % suffix)
+    module.add("prefix", self.prefix(suffix))
+    for name, prefix in [("openconfig-extensions", "oc-ext")] + list(imports):
+      module.add("import", name, [Stmt("prefix", prefix, quoted=False)])
+    module.add("organization", "OpenConfig working group")
+    module.add("contact", "www.openconfig.net")
+    module.add("description", description)
+    module.add("oc-ext:openconfig-version", VERSION)
+    module.add("revision", REVISION, [
+        Stmt("description", "Generated revision."),
+        Stmt("reference", VERSION)])
+    return module
+
+  def generate(self):
+    """Generate the modules.
+
+    Returns:
+      An ordered dictionary keyed by module name, with values of the
+      module text.
+    """
+    self.types_module()
+    paths = []
+    for m in range(self.params["modules"]):
+      paths = self.data_module(m, paths)
+
+    for i in range(self.params["violations"]):
+      kinds = [k for k in VIOLATIONS if self.sites[k]]
+      if not kinds:
+        raise ValueError("the model has too few locations for %d violations"
+                         % self.params["violations"])
+      self.violate(kinds[i % len(kinds)], i)
+
+    texts = collections.OrderedDict()
+    for name, module in self.modules.items():
+      lines = []
+      module.write(lines)
+      texts[name] = "\n".join(lines) + "\n"
+    return texts
+
+  def types_module(self):
+    """Generate the module of identities and typedefs."""
+    module = self.module_header("types", "Types of the synthetic model.")
+    if self.params["identities"]:
+      module.add("identity", "SYNTH_TYPE", [
+          Stmt("description", "Base identity of the synthetic types.")])
+      for i in range(self.params["identities"]):
+        identity = module.add("identity", "SYNTH_TYPE_%d" % i, [
+            Stmt("base", "SYNTH_TYPE"),
+            Stmt("description", "Synthetic type %d." % i)])
+        self.sites["identity-case"].append(identity)
+
+    for i in range(self.params["typedefs"]):
+      typedef = module.add("typedef", "synth-type-%d" % i)
+      kind = i % 4
+      if kind == 0:
+        typedef.add("type", "string", [Stmt("length", "1..64")])
+      elif kind == 1:
+        typedef.add("type", "uint32", [Stmt("range", "1..%d" % (100 * i))])
+      elif kind == 2:
+        enumeration = typedef.add("type", "enumeration")
+        for e in range(3):
+          enum = enumeration.add("enum", "VALUE_%d" % e, [
+              Stmt("description", "Value %d." % e)])
+          self.sites["enum-case"].append(enum)
+      else:
+        typedef.add("type", "union", [Stmt("type", "uint32"),
+                                      Stmt("type", "string")])
+      typedef.add("description", "Synthetic typedef %d." % i)
+    self.modules[self.name("types")] = module
+
+  def leaf_type(self):
+    """Return a randomly chosen type statement for a leaf."""
+    choices = ["string", "uint32", "boolean", "uint64"]
+    if self.params["typedefs"]:
+      choices.append("typedef")
+    if self.params["identities"]:
+      choices.append("identityref")
+    kind = self.random.choice(choices)
+    if kind == "typedef":
+      return Stmt("type", "%s:synth-type-%d" % (
+          self.prefix("types"),
+          self.random.randrange(self.params["typedefs"])))
+    elif kind == "identityref":
+      return Stmt("type", "identityref", [
+          Stmt("base", "%s:SYNTH_TYPE" % self.prefix("types"))])
+    return Stmt("type", kind)
+
+  def opstate_groupings(self, module, name, key=False):
+    """Add the config and state groupings for a container or list.
+
+    Args:
+      module: the module statement.
+      name: the name of the container or list.
+      key: whether the groupings are of a list, with a "name" key.
+    """
+    config = module.add("grouping", "%s-config" % name, [
+        Stmt("description", "Configuration data of %s." % name)])
+    if key:
+      config.add("leaf", "name", [Stmt("type", "string"),
+                                  Stmt("description", "Name of the entry.")])
+    for i in range(self.params["leaves"]):
+      leaf = config.add("leaf", "value-%d" % i, [
+          self.leaf_type(), Stmt("description", "Value %d." % i)])
+      self.sites["bad-type"].append(leaf)
+
+    state = module.add("grouping", "%s-state" % name, [
+        Stmt("description", "Operational state data of %s." % name)])
+    for i in range(self.params["state_leaves"]):
+      state.add("leaf", "counter-%d" % i, [
+          Stmt("type", "uint64"), Stmt("description", "Counter %d." % i)])
+
+  def opstate_containers(self, parent, name):
+    """Add the config and state containers of a container or list."""
+    parent.add("container", "config", [
+        Stmt("description", "Configuration data of %s." % name),
+        Stmt("uses", "%s-config" % name)])
+    state = parent.add("container", "state", [
+        Stmt("config", "false"),
+        Stmt("description", "Operational state data of %s." % name),
+        Stmt("uses", "%s-config" % name),
+        Stmt("uses", "%s-state" % name)])
+    for g in range(self.params["groupings"]):
+      state.add("uses", "shared-%d-state" % g)
+    self.sites["config-property"].append(state)
+
+  def data_module(self, m, augment_paths):
+    """Generate a data module.
+
+    Args:
+      m: the index of the module.
+      augment_paths: list of the schema paths of the containers of the
+        previous module, which this module augments.
+
+    Returns:
+      The list of the schema paths of the containers of the module.
+    """
+    imports = [(self.name("types"), self.prefix("types"))]
+    if augment_paths and self.params["augments"]:
+      imports.append((self.name(m - 1), self.prefix(m - 1)))
+    module = self.module_header(
+        m, "Synthetic data module %d." % m, imports)
+
+    for g in range(self.params["groupings"]):
+      shared = module.add("grouping", "shared-%d-state" % g, [
+          Stmt("description", "Shared operational state %d." % g)])
+      for i in range(2):
+        shared.add("leaf", "shared-%d-counter-%d" % (g, i), [
+            Stmt("type", "uint64"),
+            Stmt("description", "Shared counter %d." % i)])
+
+    prefix = self.prefix(m)
+    containers = []
+    paths = []
+    # (name, schema path, depth) of each container, breadth first.
+    root = "synth-%d" % m
+    pending = collections.deque([(root, "/%s:%s" % (prefix, root), 0)])
+    while pending:
+      name, path, depth = pending.popleft()
+      paths.append(path)
+      self.opstate_groupings(module, name)
+      top = module.add("grouping", "%s-top" % name, [
+          Stmt("description", "Top-level grouping of %s." % name)])
+      container = top.add("container", name, [
+          Stmt("description", "Container %s." % name)])
+      self.opstate_containers(container, name)
+      containers.append(container)
+      self.sites["opstate"].append(container)
+      self.sites["presence"].append(container)
+      if depth < self.params["depth"]:
+        for i in range(self.params["fanout"]):
+          child = "%s-%d" % (name, i)
+          container.add("uses", "%s-top" % child)
+          pending.append((child, "%s/%s:%s" % (path, prefix, child),
+                          depth + 1))
+
+    for i in range(self.params["lists"]):
+      name = "entry-%d-%d" % (m, i)
+      self.opstate_groupings(module, name, key=True)
+      parent = self.random.choice(containers)
+      surrounding = parent.add("container", "%ss" % name, [
+          Stmt("description", "Surrounding container of %s." % name)])
+      lst = surrounding.add("list", name, [
+          Stmt("key", "name"),
+          Stmt("description", "List %s." % name),
+          Stmt("leaf", "name", [
+              Stmt("type", "leafref", [Stmt("path", "../config/name")]),
+              Stmt("description", "Reference to the key of %s." % name)])])
+      self.opstate_containers(lst, name)
+      self.sites["unquoted-key"].append(lst.search_one("key"))
+      self.sites["list-sibling"].append((parent, surrounding))
+
+    if augment_paths:
+      for i in range(self.params["augments"]):
+        name = "augment-%d-%d" % (m, i)
+        self.opstate_groupings(module, name)
+        top = module.add("grouping", "%s-top" % name, [
+            Stmt("description", "Augmented data %s." % name)])
+        container = top.add("container", name, [
+            Stmt("description", "Container %s." % name)])
+        self.opstate_containers(container, name)
+        module.add("augment", self.random.choice(augment_paths), [
+            Stmt("description", "Add %s." % name),
+            Stmt("uses", "%s-top" % name)])
+
+    module.add("uses", "%s-top" % root)
+    self.modules[self.name(m)] = module
+    return paths
+
+  def violate(self, kind, i):
+    """Add a violation at a randomly chosen location.
+
+    Args:
+      kind: the kind of violation, from VIOLATIONS.
+      i: the index of the violation.
+    """
+    sites = self.sites[kind]
+    site = sites.pop(self.random.randrange(len(sites)))
+    if kind == "opstate":
+      site.add("leaf", "misplaced-%d" % i, [
+          Stmt("type", "string"),
+          Stmt("description", "A leaf outside of config and state.")])
+    elif kind == "presence":
+      site.substmts.insert(0, Stmt("presence", "violation %d" % i))
+    elif kind == "config-property":
+      site.substmts.remove(site.search_one("config"))
+    elif kind == "bad-type":
+      site.substmts[0] = Stmt("type", "empty")
+    elif kind == "unquoted-key":
+      site.quoted = False
+    elif kind == "list-sibling":
+      parent, surrounding = site
+      index = parent.substmts.index(surrounding)
+      parent.substmts[index] = surrounding.search_one("list")
+    elif kind == "enum-case":
+      site.arg = site.arg.lower()
+    elif kind == "identity-case":
+      site.arg = site.arg.lower()
+
+
+def generate(**params):
+  """Generate the modules of a synthetic model.
+
+  Args:
+    params: parameters of the model, see DEFAULTS.
+
+  Returns:
+    An ordered dictionary keyed by module name, with values of the module
+    text.
+  """
+  return ModelGenerator(params).generate()
+
+
+def write_modules(modules, directory):
+  """Write generated modules to a directory.
+
+  Args:
+    modules: dictionary of module text keyed by module name.
+    directory: the directory to write the modules to, which is created if
+      it does not exist.
+
+  Returns:
+    The list of the filenames written.
+  """
+  if not os.path.isdir(directory):
+    os.makedirs(directory)
+  filenames = []
+  for name, text in modules.items():
+    filename = os.path.join(directory, name + ".yang")
+    with io.open(filename, "w", encoding="utf-8") as fd:
+      fd.write(text)
+    filenames.append(filename)
+  return filenames
+
+
+def main(args=None):
+  """Generate a synthetic model, and write the filenames to stdout.
+
+  Args:
+    args: list of command line arguments, defaults to sys.argv[1:].
+
+  Returns:
+    The exit code.
+  """
+  if args is None:
+    args = sys.argv[1:]
+  optparser = optparse.OptionParser("%prog [options]")
+  optparser.add_option("-o", "--output-dir",
+                       dest="output_dir",
+                       default=".",
+                       help="Directory to write the modules to")
+  helps = {
+      "modules": "Number of data modules",
+      "depth": "Depth of the tree of containers below the root",
+      "fanout": "Number of child containers of each container",
+      "lists": "Number of lists in each data module",
+      "leaves": "Number of config leaves, mirrored in state, per container",
+      "state_leaves": "Number of state-only leaves per container",
+      "groupings": "Number of groupings used in every state container",
+      "augments": "Number of augments of the previous module per module",
+      "identities": "Number of identities",
+      "typedefs": "Number of typedefs",
+      "violations": "Number of lint violations to add",
+      "seed": "Seed of the random choices",
+      "name": "Name of the model, which is the prefix of each module name",
+  }
+  for name, default in DEFAULTS.items():
+    optparser.add_option("--" + name.replace("_", "-"),
+                         dest=name,
+                         type="int" if isinstance(default, int) else "string",
+                         default=default,
+                         help="%s (default %s)" % (helps[name], default))
+  opts, _ = optparser.parse_args(args)
+
+  params = dict((name, getattr(opts, name)) for name in DEFAULTS)
+  try:
+    modules = generate(**params)
+  except ValueError as e:
+    sys.stderr.write("%s\n" % e)
+    return 1
+  for filename in write_modules(modules, opts.output_dir):
+    print(filename)
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
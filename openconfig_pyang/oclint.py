@@ -0,0 +1,1143 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+In-process driver for the OpenConfig linter.
+
+Runs pyang with the OpenConfig plugin within the current Python process,
+such that a set of input modules can be split into independent module
+sets and linted in parallel worker processes. Errors are merged and
+written in the same order and format as a single pyang run.
+"""
+
+from __future__ import print_function, unicode_literals
+
+import io
+import multiprocessing
+import optparse
+import os
+import re
+import sys
+import time
+
+from pyang import context
+from pyang import error
+from pyang import plugin
+from pyang import statements
+from pyang import syntax
+from pyang import util
+
+from openconfig_pyang import repository_index
+
+# The statements that a module uses to refer to other modules.
+MODULE_HEADER_RE = re.compile(
+    r"^\s*(?:module|submodule)\s+[\"']?([A-Za-z0-9_.\-]+)", re.M)
+MODULE_DEPENDENCY_RE = re.compile(
+    r"^\s*(?:import|include|belongs-to)\s+[\"']?([A-Za-z0-9_.\-]+)", re.M)
+MODULE_NAMESPACE_RE = re.compile(
+    r"^\s*namespace\s+[\"']?([^\"';\s]+)", re.M)
+
+_plugins_initialised = False
+# The plugin directories loaded by init_plugins.
+_plugin_dirs = []
+# pyang's global validation and error code registrations as they are
+# before any context is set up, see restore_registrations.
+_registrations = None
+
+
+def plugin_dir():
+  """Return the directory containing the OpenConfig pyang plugins."""
+  return os.path.join(os.path.dirname(os.path.abspath(__file__)), "plugins")
+
+
+def init_plugins(plugindirs=None):
+  """Initialise pyang's plugins once for this process.
+
+  Args:
+    plugindirs: list of additional plugin directories to load.
+  """
+  global _plugins_initialised
+  if _plugins_initialised:
+    return
+  dirs = [plugin_dir()]
+  for d in plugindirs or []:
+    if os.path.abspath(d) not in [os.path.abspath(i) for i in dirs]:
+      dirs.append(d)
+  plugin.init(dirs)
+  _plugins_initialised = True
+  global _plugin_dirs, _registrations
+  _plugin_dirs = dirs
+  _registrations = save_registrations()
+
+
+def loaded_plugin_dirs():
+  """Return the plugin directories that init_plugins has loaded.
+
+  Worker processes that are not forked from this process, such as where
+  multiprocessing's start method is spawn, start without any plugins
+  loaded, and pass these to init_plugins before they lint any modules.
+  """
+  return list(_plugin_dirs)
+
+
+def openconfig_plugin_module():
+  """Return the module of the OpenConfig plugin that pyang has loaded.
+
+  pyang imports plugins by their filename, so the plugin's classes, such
+  as ErrorLevel, are those of this module rather than of
+  openconfig_pyang.plugins.openconfig.
+
+  Raises:
+    ValueError: if the OpenConfig plugin is not loaded.
+  """
+  for p in plugin.plugins:
+    if type(p).__name__ == "OpenConfigPlugin":
+      return sys.modules[type(p).__module__]
+  raise ValueError("the OpenConfig plugin is not loaded")
+
+
+def save_registrations():
+  """Return a copy of pyang's validation and error code registrations."""
+  return (
+      dict(statements._validation_map),
+      list(statements._validation_phases),
+      list(statements._validation_variables),
+      dict(statements._v_i_children),
+      dict(statements._v_i_children_keywords),
+      dict(error.error_codes),
+  )
+
+
+def restore_registrations(saved=None):
+  """Restore pyang's global validation and error code registrations.
+
+  Plugins register their validation functions and error codes with pyang
+  globally when a context is set up, so these are reset before each
+  context that is created within the process, rather than being
+  registered again on top of those of the previous context.
+
+  Args:
+    saved: registrations returned by save_registrations, defaults to
+      those recorded by init_plugins before any context was set up.
+  """
+  if saved is None:
+    saved = _registrations
+  if saved is None:
+    return
+  registered = (
+      statements._validation_map,
+      statements._validation_phases,
+      statements._validation_variables,
+      statements._v_i_children,
+      statements._v_i_children_keywords,
+      error.error_codes,
+  )
+  for current, value in zip(registered, saved):
+    if isinstance(current, dict):
+      current.clear()
+      current.update(value)
+    else:
+      current[:] = value
+
+
+def make_optparser():
+  """Build an option parser accepting the pyang options used for linting.
+
+  The options of every registered plugin are included, such that the
+  OpenConfig options can be given as they would be to pyang.
+
+  Returns:
+    An optparse.OptionParser.
+  """
+  usage = """%prog [options] <filename>...
+
+Validates the YANG module(s) in <filename> according to OpenConfig
+conventions."""
+
+  optlist = [
+      optparse.make_option("-h", "--help",
+                           action="help",
+                           help="Show this help message and exit"),
+      optparse.make_option("-V", "--verbose",
+                           action="store_true"),
+      optparse.make_option("-j", "--jobs",
+                           dest="jobs",
+                           type="int",
+                           default=1,
+                           help="""Number of worker processes to lint
+                           independent module sets with, 0 uses one per
+                           CPU"""),
+      optparse.make_option("--watch",
+                           dest="watch",
+                           action="store_true",
+                           help="""Lint the modules again whenever an input
+                           module, or a module in the search path,
+                           changes. Modules that are not affected by a
+                           change are not parsed again"""),
+      optparse.make_option("--watch-interval",
+                           dest="watch_interval",
+                           type="float",
+                           default=0.5,
+                           metavar="SECONDS",
+                           help="""Interval at which to check for changed
+                           modules with --watch (default 0.5)"""),
+      optparse.make_option("--print-error-code",
+                           dest="print_error_code",
+                           action="store_true",
+                           help="""On errors, print the error code instead
+                           of the error message."""),
+      optparse.make_option("--print-error-basename",
+                           dest="print_error_basename",
+                           action="store_true",
+                           help="""On errors, print the basename of files
+                           of the error message."""),
+      optparse.make_option("--msg-template",
+                           dest="msg_template",
+                           type="string",
+                           help="""Template used to display error messages,
+                           with keys file, line, code, type, level and
+                           msg."""),
+      optparse.make_option("-W",
+                           dest="warnings",
+                           action="append",
+                           default=[],
+                           metavar="WARNING",
+                           help="""If WARNING is 'error', treat all warnings
+                           as errors, except any listed WARNING. If WARNING
+                           is 'none', do not report any warnings."""),
+      optparse.make_option("-E",
+                           dest="errors",
+                           action="append",
+                           default=[],
+                           metavar="WARNING",
+                           help="Treat each WARNING as an error."),
+      optparse.make_option("--ignore-error",
+                           dest="ignore_error_tags",
+                           action="append",
+                           default=[],
+                           metavar="ERROR",
+                           help="Ignore ERROR. Use with care."),
+      optparse.make_option("--ignore-errors",
+                           dest="ignore_errors",
+                           action="store_true",
+                           help="Ignore all errors. Use with care."),
+      optparse.make_option("--canonical",
+                           dest="canonical",
+                           action="store_true",
+                           help="""Validate the module(s) according to the
+                           canonical YANG order."""),
+      optparse.make_option("--max-line-length",
+                           type="int",
+                           dest="max_line_len"),
+      optparse.make_option("--max-identifier-length",
+                           type="int",
+                           dest="max_identifier_len"),
+      optparse.make_option("-F", "--features",
+                           metavar="FEATURES",
+                           dest="features",
+                           default=[],
+                           action="append",
+                           help="""Features to support, default all.
+                           <modname>:[<feature>,]*"""),
+      optparse.make_option("--max-status",
+                           metavar="MAXSTATUS",
+                           dest="max_status",
+                           help="""Max status to support, one of: current,
+                           deprecated, obsolete"""),
+      optparse.make_option("--deviation-module",
+                           metavar="DEVIATION",
+                           dest="deviations",
+                           default=[],
+                           action="append",
+                           help="Deviation module"),
+      optparse.make_option("-p", "--path",
+                           dest="path",
+                           default=[],
+                           action="append",
+                           help="""%s-separated search path for yin and yang
+                           modules""" % os.pathsep),
+      optparse.make_option("--plugindir",
+                           dest="plugindir",
+                           help="Load pyang plugins from PLUGINDIR"),
+      optparse.make_option("--strict",
+                           dest="strict",
+                           action="store_true",
+                           help="Force strict YANG compliance."),
+      optparse.make_option("--lax-quote-checks",
+                           dest="lax_quote_checks",
+                           action="store_true",
+                           help="Lax check of backslash in quoted strings."),
+      optparse.make_option("--lax-xpath-checks",
+                           dest="lax_xpath_checks",
+                           action="store_true",
+                           help="Lax check of XPath expressions."),
+      optparse.make_option("--trim-yin",
+                           dest="trim_yin",
+                           action="store_true",
+                           help="""In YIN input modules, trim whitespace in
+                           textual arguments."""),
+      optparse.make_option("--keep-comments",
+                           dest="keep_comments",
+                           action="store_true",
+                           help="Keep comments in the parsed modules."),
+      optparse.make_option("--no-path-recurse",
+                           dest="no_path_recurse",
+                           action="store_true",
+                           help="""Do not recurse into directories in the
+                           yang path."""),
+  ]
+
+  optparser = optparse.OptionParser(usage, add_help_option=False)
+  optparser.add_options(optlist)
+  for p in plugin.plugins:
+    p.add_opts(optparser)
+  return optparser
+
+
+def parse_args(args, add_opts=None):
+  """Parse oclint command line arguments.
+
+  The OpenConfig and lint checks are always enabled, as they are by the
+  oclint wrapper script.
+
+  Args:
+    args: list of command line arguments, excluding the program name.
+    add_opts: optional function called with the option parser, once the
+      plugins are initialised, to add further options to it.
+
+  Returns:
+    A tuple of the parsed options and the list of input filenames.
+  """
+  plugindirs = []
+  for i, arg in enumerate(args[:-1]):
+    if arg == "--plugindir":
+      plugindirs.append(args[i+1])
+  init_plugins(plugindirs)
+
+  optparser = make_optparser()
+  if add_opts is not None:
+    add_opts(optparser)
+  opts, filenames = optparser.parse_args(args)
+  opts.openconfig = True
+  opts.lint = True
+  return opts, filenames
+
+
+def restore_pyang(ctx):
+  """Restore what the plugins replaced in pyang's modules for a context.
+
+  Plugins may replace pyang's parser or validation functions while the
+  modules of a context are parsed and validated, which are restored once
+  the context is validated, or otherwise by this function.
+
+  Args:
+    ctx: the pyang.Context.
+  """
+  for p in plugin.plugins:
+    if hasattr(p, "restore_pyang"):
+      p.restore_pyang(ctx)
+
+
+def search_path(opts):
+  """Return the pyang module search path for the options."""
+  if not opts.path:
+    return "."
+  return os.pathsep.join(opts.path) + os.pathsep + "."
+
+
+def read_module_text(filename):
+  """Read the text of an input module as pyang does.
+
+  Args:
+    filename: path to the module.
+
+  Returns:
+    The text of the module.
+
+  Raises:
+    IOError: if the file cannot be read, with the message that pyang
+      reports for the failure.
+  """
+  try:
+    with io.open(filename, "r", encoding="utf-8") as fd:
+      return fd.read()
+  except IOError as ex:
+    raise IOError("error %s: %s" % (filename, ex))
+  except UnicodeDecodeError as ex:
+    s = str(ex).replace("utf-8", "utf8")
+    raise IOError("%s: unicode error: %s" % (filename, s))
+
+
+def module_dependencies(text):
+  """Return the name of a module and the modules it refers to.
+
+  Args:
+    text: the YANG text of a module or submodule.
+
+  Returns:
+    A tuple of the module name (None if it cannot be found), the set of
+    names of modules that it imports, includes or belongs to, and its
+    namespace (None for a submodule).
+  """
+  header = MODULE_HEADER_RE.search(text)
+  name = header.group(1) if header is not None else None
+  namespace = MODULE_NAMESPACE_RE.search(text)
+  namespace = namespace.group(1) if namespace is not None else None
+  return name, set(MODULE_DEPENDENCY_RE.findall(text)), namespace
+
+
+def split_module_sets(filenames, texts, path, no_path_recurse=False,
+                      index_path=None):
+  """Split input modules into sets that can be linted independently.
+
+  Inputs are placed in the same set where linting them in separate
+  pyang contexts could change the result, that is where:
+    - either of them reaches the other through imports, includes or
+      belongs-to statements, including through modules that are only
+      found on the search path,
+    - they define modules with the same name, since pyang only loads the
+      first of them,
+    - the modules that they load declare the same namespace, which pyang
+      reports as an error across all modules in a context.
+
+  Args:
+    filenames: list of input filenames.
+    texts: dictionary keyed by filename of the input module text.
+    path: the pyang module search path.
+    no_path_recurse: whether to recurse into search path directories.
+    index_path: optional path of the search path index.
+
+  Returns:
+    A list of lists of filenames, ordered by the first input in each set,
+    with the inputs in each set in their original order.
+  """
+  inputs_by_name = {}
+  input_info = {}
+  for filename in filenames:
+    name, deps, namespace = module_dependencies(texts[filename])
+    inputs_by_name.setdefault(name, []).append(filename)
+    input_info[filename] = (name, deps, namespace)
+
+  repos = repository_index.IndexedFileRepository(
+      path, index_path=index_path, use_env=False,
+      no_path_recurse=no_path_recurse)
+  handles = {}
+  for name, _, handle in repos.get_modules_and_revisions(None):
+    handles.setdefault(name, []).append(handle)
+
+  search_info = {}
+  def search_module_info(name):
+    if name not in search_info:
+      deps, namespaces = set(), set()
+      for handle in handles.get(name, []):
+        try:
+          _, d, ns = module_dependencies(
+              repos.get_module_from_handle(handle)[2])
+        except repos.ReadError:
+          continue
+        deps.update(d)
+        if ns is not None:
+          namespaces.add(ns)
+      search_info[name] = (deps, namespaces)
+    return search_info[name]
+
+  parent = dict((f, f) for f in filenames)
+  def find(f):
+    while parent[f] != f:
+      parent[f] = parent[parent[f]]
+      f = parent[f]
+    return f
+
+  def union(files):
+    for f in files[1:]:
+      parent[find(f)] = find(files[0])
+
+  for files in inputs_by_name.values():
+    union(files)
+
+  # inputs keyed by the namespace and name of each module they load
+  namespace_users = {}
+  for filename in filenames:
+    name, deps, namespace = input_info[filename]
+    if namespace is not None:
+      namespace_users.setdefault(namespace, {}).setdefault(
+          name, []).append(filename)
+
+    seen = set([name])
+    pending = list(deps)
+    while pending:
+      dep = pending.pop()
+      if dep in seen:
+        continue
+      seen.add(dep)
+      if dep in inputs_by_name:
+        # The input's own dependencies are followed when it is the
+        # starting point.
+        union([filename] + inputs_by_name[dep])
+      else:
+        deps, namespaces = search_module_info(dep)
+        for ns in namespaces:
+          namespace_users.setdefault(ns, {}).setdefault(
+              dep, []).append(filename)
+        pending.extend(deps)
+
+  for users in namespace_users.values():
+    if len(users) > 1:
+      union([f for files in users.values() for f in files])
+
+  sets = {}
+  for filename in filenames:
+    sets.setdefault(find(filename), []).append(filename)
+  return sorted(sets.values(), key=lambda s: filenames.index(s[0]))
+
+
+def repository_index_path(opts):
+  """Return the path of the search path index, or None if it is not kept.
+
+  The index is kept in the OpenConfig cache directory, if one is given.
+  """
+  cache_dir = getattr(opts, "openconfig_cache_dir", None)
+  if not cache_dir:
+    return None
+  return os.path.join(cache_dir, repository_index.INDEX_FILENAME)
+
+
+def new_repository(opts):
+  """Create the pyang module repository for the command line options."""
+  return repository_index.IndexedFileRepository(
+      search_path(opts), index_path=repository_index_path(opts),
+      no_path_recurse=opts.no_path_recurse, verbose=opts.verbose)
+
+
+def new_context(opts, repos=None):
+  """Create a pyang context configured from the command line options.
+
+  Args:
+    opts: the parsed command line options.
+    repos: optional pyang.repository.Repository for the context, a new
+      repository for the search path is created if it is not given.
+
+  Returns:
+    A pyang.Context that has been set up by all registered plugins.
+  """
+  if repos is None:
+    repos = new_repository(opts)
+  ctx = context.Context(repos)
+  ctx.opts = opts
+  ctx.canonical = opts.canonical
+  ctx.max_line_len = opts.max_line_len
+  ctx.max_identifier_len = opts.max_identifier_len
+  ctx.trim_yin = opts.trim_yin
+  ctx.lax_xpath_checks = opts.lax_xpath_checks
+  ctx.lax_quote_checks = opts.lax_quote_checks
+  ctx.strict = opts.strict
+  ctx.max_status = opts.max_status
+  ctx.keep_comments = bool(opts.keep_comments)
+  for f in opts.features:
+    modulename, _, features = f.partition(":")
+    ctx.features[modulename] = [i for i in features.split(",") if i]
+
+  restore_registrations()
+  for p in plugin.plugins:
+    p.setup_ctx(ctx)
+
+  # patch the error spec so that -W errors are treated as warnings
+  for w in opts.warnings:
+    if w in error.error_codes:
+      (level, wstr) = error.error_codes[w]
+      if error.allow_warning(level):
+        error.error_codes[w] = (4, wstr)
+  return ctx
+
+
+def add_input_modules(ctx, filenames, texts=None):
+  """Parse input modules and add them to a context as pyang does.
+
+  Args:
+    ctx: the pyang.Context to add the modules to.
+    filenames: list of input filenames, read from stdin if empty.
+    texts: optional dictionary keyed by filename of module text that
+      has already been read.
+
+  Returns:
+    A tuple of the exit code for modules that could not be parsed and
+    the list of parsed modules.
+  """
+  exit_code = 0
+  modules = []
+  if not filenames:
+    module = ctx.add_module("<stdin>", sys.stdin.read())
+    if module is None:
+      exit_code = 1
+    else:
+      modules.append(module)
+
+  for filename in filenames:
+    if texts is not None and filename in texts:
+      text = texts[filename]
+    else:
+      text = read_module_text(filename)
+    m = syntax.re_filename.search(filename)
+    ctx.yin_module_map = {}
+    if m is not None:
+      name, rev, in_format = m.groups()
+      name = os.path.basename(name)
+      module = ctx.add_module(filename, text, in_format, name, rev,
+                              expect_failure_error=False)
+    else:
+      module = ctx.add_module(filename, text)
+    if module is None:
+      exit_code = 1
+    else:
+      modules.append(module)
+  return exit_code, modules
+
+
+def input_module_names(modules):
+  """Return the names of input modules and the submodules they include."""
+  modulenames = []
+  for m in modules:
+    modulenames.append(m.arg)
+    for s in m.search("include"):
+      modulenames.append(s.arg)
+  return modulenames
+
+
+def add_deviation_modules(ctx, opts):
+  """Parse the deviation modules given in the options into a context."""
+  for filename in opts.deviations:
+    m = ctx.add_module(filename, read_module_text(filename))
+    if m is not None:
+      ctx.deviation_modules.append(m)
+
+
+def validate_modules(ctx, modules):
+  """Validate the modules of a context and run the plugins' checks.
+
+  Args:
+    ctx: the pyang.Context containing the modules.
+    modules: list of the input modules.
+
+  Raises:
+    ValueError: if a feature that is not defined by an input module is
+      given for it.
+  """
+  for p in plugin.plugins:
+    p.pre_validate_ctx(ctx, modules)
+
+  ctx.validate()
+
+  for m in modules:
+    m.prune()
+
+  for m in modules:
+    if m.arg in ctx.features:
+      for f in ctx.features[m.arg]:
+        if f not in m.i_features:
+          raise ValueError("unknown feature %s in module %s" % (f, m.arg))
+
+  for p in plugin.plugins:
+    p.post_validate_ctx(ctx, modules)
+
+
+def validate_module_set(opts, filenames, texts=None, repos=None):
+  """Parse and validate a set of modules within a new pyang context.
+
+  Args:
+    opts: the parsed command line options.
+    filenames: list of input filenames, read from stdin if empty.
+    texts: optional dictionary keyed by filename of module text that
+      has already been read.
+    repos: optional pyang.repository.Repository for the search path of
+      the options, which may be shared between module sets.
+
+  Returns:
+    A tuple of the exit code for modules that could not be parsed, the
+    validated pyang.Context, and the names of the input modules and
+    their submodules.
+  """
+  ctx = new_context(opts, repos)
+  try:
+    for p in plugin.plugins:
+      p.pre_load_modules(ctx)
+
+    exit_code, modules = add_input_modules(ctx, filenames, texts)
+    modulenames = input_module_names(modules)
+    add_deviation_modules(ctx, opts)
+    validate_modules(ctx, modules)
+  finally:
+    restore_pyang(ctx)
+  return exit_code, ctx, modulenames
+
+
+def lint_module_set(opts, filenames, texts=None, repos=None):
+  """Lint a set of modules within a single pyang context.
+
+  Args:
+    opts: the parsed command line options.
+    filenames: list of input filenames, read from stdin if empty.
+    texts: optional dictionary keyed by filename of module text that
+      has already been read.
+    repos: optional pyang.repository.Repository for the search path of
+      the options, which may be shared between module sets.
+
+  Returns:
+    A tuple of the exit code that pyang would return for the modules and
+    a list of reported errors, each a tuple of the file reference, line
+    number and text that pyang would write for the error.
+  """
+  exit_code, ctx, modulenames = validate_module_set(opts, filenames, texts,
+                                                    repos)
+  reported, error_exit = report_errors(ctx, opts, filenames, modulenames)
+  return max(exit_code, error_exit), reported
+
+
+def report_errors(ctx, opts, filenames, modulenames):
+  """Select and format the errors in a context as pyang reports them.
+
+  Args:
+    ctx: the validated pyang.Context.
+    opts: the parsed command line options.
+    filenames: list of input filenames for the context.
+    modulenames: names of the input modules and their submodules.
+
+  Returns:
+    A tuple of the list of reported errors, each a tuple of the file
+    reference, line number and text for the error, and the exit code
+    implied by the errors.
+  """
+  if opts.ignore_errors:
+    return [], 0
+
+  exit_code = 0
+  reported = []
+  for epos, etag, eargs in ctx.errors:
+    if etag in opts.ignore_error_tags:
+      continue
+    if (ctx.implicit_errors is False and
+        hasattr(epos.top, "i_modulename") and
+        epos.top.arg not in modulenames and
+        epos.top.i_modulename not in modulenames and
+        epos.ref not in filenames):
+      # this module was added implicitly (by import); skip this error
+      continue
+    elevel = error.err_level(etag)
+    if error.is_warning(elevel) and etag not in opts.errors:
+      kind = "warning"
+      if "error" in opts.warnings and etag not in opts.warnings:
+        kind = "error"
+        exit_code = 1
+      elif "none" in opts.warnings:
+        continue
+    else:
+      kind = "error"
+      exit_code = 1
+
+    if opts.msg_template is not None:
+      text = str(opts.msg_template).format(
+          file=epos.ref, line=epos.line, code=etag, type=kind,
+          msg=error.err_to_str(etag, eargs), level=elevel)
+    else:
+      emsg = etag if opts.print_error_code else error.err_to_str(etag, eargs)
+      text = "%s: %s: %s" % (epos.label(opts.print_error_basename), kind,
+                             emsg)
+    reported.append((epos.ref, epos.line, text))
+  return reported, exit_code
+
+
+class LintSession(object):
+  """A pyang context that is kept between lint runs of the same inputs.
+
+  The modules that the inputs depend on are parsed and validated once.
+  Before each run, the input modules and the modules in the search path
+  are checked for changes, and only the modules that are changed, that
+  depend on a changed module, or whose schema tree is augmented or
+  deviated by a changed module are removed from the context and parsed
+  again. The context is rebuilt when modules are added to or removed
+  from the search path.
+
+  More than one session may be kept in a process. The registrations
+  that the plugins make with pyang for a session's context are restored
+  before the session is validated again.
+  """
+
+  def __init__(self, opts):
+    self.opts = opts
+    self.ctx = None
+    self.registrations = None
+    self.filenames = None
+    # stat signature of each module file, keyed by absolute path
+    self.sources = {}
+    # parsed module of each input, None where it could not be parsed
+    self.inputs = {}
+    self.result = None
+
+  def scan(self, filenames):
+    """Find the module files that a lint of the inputs can read.
+
+    Args:
+      filenames: list of input filenames.
+
+    Returns:
+      A tuple of a new repository for the search path and a dictionary
+      keyed by absolute path of the modification time and size of each
+      module file.
+    """
+    repos = new_repository(self.opts)
+    files = list(filenames) + list(self.opts.deviations)
+    for _, _, handle in repos.get_modules_and_revisions(None):
+      files.append(handle[1])
+
+    sources = {}
+    for f in files:
+      try:
+        st = os.stat(f)
+      except OSError:
+        sources[os.path.abspath(f)] = None
+        continue
+      sources[os.path.abspath(f)] = (st.st_mtime, st.st_size)
+    return repos, sources
+
+  def lint(self, filenames):
+    """Lint the input modules, re-using the unchanged modules.
+
+    Args:
+      filenames: list of input filenames.
+
+    Returns:
+      A tuple of the exit code and the list of lines to report, as
+      returned by lint. The same tuple is returned until a module is
+      changed. Where a module cannot be read, or an unknown feature is
+      given, the lines are the error message.
+    """
+    repos, sources = self.scan(filenames)
+    if (self.result is not None and filenames == self.filenames and
+        sources == self.sources):
+      return self.result
+
+    try:
+      if (self.ctx is None or filenames != self.filenames or
+          set(sources) != set(self.sources)):
+        self.ctx = None
+        self.lint_all(filenames, repos)
+      else:
+        self.relint(set(f for f in sources if sources[f] != self.sources[f]),
+                    repos)
+    except (IOError, ValueError) as e:
+      # The context is rebuilt once the modules are changed again.
+      self.ctx = None
+      self.result = (1, ["%s" % e])
+    self.filenames = filenames
+    self.sources = sources
+    return self.result
+
+  def lint_all(self, filenames, repos):
+    """Lint the inputs within a new context."""
+    ctx = new_context(self.opts, repos)
+    try:
+      self.registrations = save_registrations()
+      for p in plugin.plugins:
+        p.pre_load_modules(ctx)
+
+      self.inputs = {}
+      for filename in filenames:
+        _, modules = add_input_modules(ctx, [filename])
+        self.inputs[filename] = modules[0] if modules else None
+      add_deviation_modules(ctx, self.opts)
+
+      self.ctx = ctx
+      self.filenames = filenames
+      self.validate()
+    finally:
+      # What the plugins replaced in pyang is restored where the modules
+      # are not validated.
+      restore_pyang(ctx)
+
+  def relint(self, changed, repos):
+    """Lint the inputs again after the files in changed are modified."""
+    restore_registrations(self.registrations)
+    ctx = self.ctx
+    try:
+      loaded = [m for m in ctx.modules.values() if m is not None]
+      stale = self.stale_modules(
+          [m for m in loaded if os.path.abspath(m.pos.ref) in changed],
+          loaded)
+      stale_refs = set(changed)
+      stale_refs.update(os.path.abspath(m.pos.ref) for m in stale.values())
+      stale_refs.update(os.path.abspath(f) for f in self.filenames
+                        if id(self.inputs[f]) in stale)
+
+      for key in [k for k, m in ctx.modules.items() if id(m) in stale]:
+        del ctx.modules[key]
+      ctx.deviation_modules = [m for m in ctx.deviation_modules
+                               if id(m) not in stale]
+
+      # The revisions of modules in the repository are re-read, since
+      # pyang retains modules that it parsed to find their revision.
+      ctx.repository = repos
+      ctx.revs = {}
+      for name, rev, handle in repos.get_modules_and_revisions(ctx):
+        ctx.revs.setdefault(name, []).append((rev, handle))
+      for p in plugin.plugins:
+        if hasattr(p, "forget_modules"):
+          p.forget_modules(ctx, list(stale.values()))
+
+      ctx.errors[:] = [e for e in ctx.errors
+                       if not self.stale_error(e, stale, stale_refs)]
+
+      # Inputs are added in their original order, and modules that are not
+      # stale are registered as pyang's add_module does, such that the
+      # same module is found for a name as in a new context.
+      for filename in self.filenames:
+        module = self.inputs[filename]
+        if os.path.abspath(filename) in stale_refs:
+          _, modules = add_input_modules(ctx, [filename])
+          self.inputs[filename] = modules[0] if modules else None
+        elif module is not None and module.arg not in ctx.revs:
+          ctx.revs[module.arg] = [(util.get_latest_revision(module), None)]
+      for filename in self.opts.deviations:
+        if os.path.abspath(filename) in stale_refs:
+          m = ctx.add_module(filename, read_module_text(filename))
+          if m is not None:
+            ctx.deviation_modules.append(m)
+
+      self.validate()
+    finally:
+      restore_pyang(ctx)
+
+  @staticmethod
+  def stale_modules(changed, loaded):
+    """Find the modules that must be parsed again after a change.
+
+    Args:
+      changed: list of (sub)modules whose files have changed.
+      loaded: list of all (sub)modules in the context.
+
+    Returns:
+      A dictionary keyed by id of the stale (sub)modules.
+    """
+    dependents = {}
+    by_name = {}
+    for m in loaded:
+      by_name.setdefault(m.arg, []).append(m)
+      for s in m.search("import") + m.search("include"):
+        dependents.setdefault(s.arg, []).append(m)
+      belongs_to = m.search_one("belongs-to")
+      if belongs_to is not None:
+        dependents.setdefault(belongs_to.arg, []).append(m)
+
+    stale = {}
+    pending = list(changed)
+    while pending:
+      m = pending.pop()
+      if id(m) in stale:
+        continue
+      stale[id(m)] = m
+      # Revisions of a module, and inputs that pyang did not load since
+      # another module has the same name, are parsed again with it.
+      pending.extend(by_name[m.arg])
+      pending.extend(dependents.get(m.arg, []))
+      # augment and deviation statements modify the schema tree of the
+      # module that they target.
+      for s in m.search("augment") + m.search("deviation"):
+        target = getattr(s, "i_target_node", None)
+        if getattr(target, "i_module", None) is not None:
+          pending.append(target.i_module)
+    return stale
+
+  @staticmethod
+  def stale_error(err, stale, stale_refs):
+    """Return whether an error was reported for a stale module."""
+    pos = err[0]
+    if id(pos.top) in stale:
+      return True
+    while pos is not None:
+      if os.path.abspath(pos.ref) in stale_refs:
+        return True
+      pos = pos.uses_pos
+    return False
+
+  def validate(self):
+    """Validate the context and record the errors to report."""
+    exit_code = 0
+    modules = []
+    for filename in self.filenames:
+      if self.inputs[filename] is None:
+        exit_code = 1
+      else:
+        modules.append(self.inputs[filename])
+
+    validate_modules(self.ctx, modules)
+    reported, error_exit = report_errors(self.ctx, self.opts, self.filenames,
+                                         input_module_names(modules))
+    self.result = (max(exit_code, error_exit),
+                   order_reported(reported, self.filenames))
+
+
+def watch(opts, filenames):
+  """Lint the input modules whenever they, or their dependencies, change.
+
+  Changes are found by polling the modification time and size of the
+  module files, since the standard library has no portable interface to
+  filesystem notifications.
+
+  Args:
+    opts: the parsed command line options.
+    filenames: list of input filenames.
+
+  Returns:
+    The exit code of the last lint when interrupted.
+  """
+  session = LintSession(opts)
+  result = None
+  try:
+    while True:
+      current = session.lint(filenames)
+      if current is not result:
+        result = current
+        for line in result[1]:
+          sys.stderr.write(line + "\n")
+        sys.stderr.write("oclint: %d error(s) and warning(s), watching for "
+                         "changes\n" % len(result[1]))
+      time.sleep(opts.watch_interval)
+  except KeyboardInterrupt:
+    pass
+  return result[0] if result is not None else 1
+
+
+def _lint_module_set_worker(args):
+  opts, filenames = args
+  return lint_module_set(opts, filenames)
+
+
+def lint(opts, filenames):
+  """Lint the input modules, in parallel where requested.
+
+  Args:
+    opts: the parsed command line options.
+    filenames: list of input filenames.
+
+  Returns:
+    A tuple of the exit code and the list of lines to report, in the
+    order that a single pyang run reports them.
+  """
+  texts = {}
+  for filename in filenames:
+    texts[filename] = read_module_text(filename)
+
+  jobs = opts.jobs if opts.jobs > 0 else multiprocessing.cpu_count()
+  module_sets = [filenames]
+  if jobs > 1 and len(filenames) > 1:
+    module_sets = split_module_sets(filenames, texts, search_path(opts),
+                                    opts.no_path_recurse,
+                                    repository_index_path(opts))
+
+  if len(module_sets) == 1:
+    results = [lint_module_set(opts, module_sets[0], texts)]
+  else:
+    # Each module set is linted in a fresh worker process, since pyang
+    # registers validation functions globally when a context is set up.
+    pool = multiprocessing.Pool(min(jobs, len(module_sets)),
+                                initializer=init_plugins,
+                                initargs=(loaded_plugin_dirs(),),
+                                maxtasksperchild=1)
+    try:
+      results = pool.map(_lint_module_set_worker,
+                         [(opts, s) for s in module_sets], chunksize=1)
+    finally:
+      pool.close()
+      pool.join()
+
+  exit_code = 0
+  reported = []
+  seen = set()
+  for set_exit_code, set_reported in results:
+    exit_code = max(exit_code, set_exit_code)
+    for e in set_reported:
+      # Modules outside the inputs can be loaded by more than one set.
+      if e not in seen:
+        seen.add(e)
+        reported.append(e)
+
+  return exit_code, order_reported(reported, filenames)
+
+
+def order_reported(reported, filenames):
+  """Order reported errors as pyang writes them.
+
+  Args:
+    reported: list of reported errors, each a tuple of the file
+      reference, line number and text for the error.
+    filenames: list of input filenames.
+
+  Returns:
+    The list of the text of each error, in the order to be written.
+  """
+  reported = sorted(reported, key=lambda e: (e[0], e[1]))
+  if filenames:
+    # first print errors for the first filename given
+    reported.sort(key=lambda e: 0 if e[0] == filenames[0] else 1)
+  return [e[2] for e in reported]
+
+
+def main(args=None):
+  """Run the OpenConfig linter.
+
+  Args:
+    args: list of command line arguments, defaults to sys.argv[1:].
+
+  Returns:
+    The exit code that pyang returns for the same arguments.
+  """
+  if args is None:
+    args = sys.argv[1:]
+  opts, filenames = parse_args(args)
+
+  if getattr(opts, "openconfig_output_format", None) and (
+      opts.watch or opts.jobs != 1):
+    # The output is written by the pyang context, one for each module set,
+    # or each time that the modules are linted again.
+    sys.stderr.write("--oc-output-format cannot be used with --watch or "
+                     "--jobs\n")
+    return 1
+
+  if getattr(opts, "openconfig_trace", None) and opts.jobs != 1:
+    # Worker processes exit without writing the spans that they record.
+    sys.stderr.write("--oc-trace cannot be used with --jobs\n")
+    return 1
+
+  if opts.watch and getattr(opts, "openconfig_fail_fast", None):
+    # Modules that validation is stopped in cannot be kept between runs.
+    sys.stderr.write("--oc-fail-fast cannot be used with --watch\n")
+    return 1
+
+  if opts.watch:
+    if not filenames:
+      sys.stderr.write("--watch requires input filenames\n")
+      return 1
+    return watch(opts, filenames)
+
+  try:
+    exit_code, lines = lint(opts, filenames)
+  except (IOError, ValueError) as e:
+    sys.stderr.write("%s\n" % e)
+    return 1
+
+  for line in lines:
+    sys.stderr.write(line + "\n")
+  return exit_code
+
+
+if __name__ == "__main__":
+  sys.exit(main())
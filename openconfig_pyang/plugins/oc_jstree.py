@@ -44,6 +44,8 @@ from pyang import plugin
 from pyang import statements
 from pyang import util
 
+from util import trace
+
 def pyang_plugin_init():
     plugin.register_plugin(JSTreePlugin())
 
@@ -73,12 +75,18 @@ class JSTreePlugin(plugin.PyangPlugin):
         ctx.implicit_errors = False
 
     def emit(self, ctx, modules, fd):
-        emit_header(modules, fd, ctx)
-        emit_css(fd, ctx)
-        emit_js(fd, ctx)
-        emit_bodystart(modules,fd, ctx)
-        emit_tree(modules, fd, ctx)
-        emit_footer(fd, ctx)
+        with trace.span("oc-jstree header", "emit"):
+            emit_header(modules, fd, ctx)
+        with trace.span("oc-jstree css", "emit"):
+            emit_css(fd, ctx)
+        with trace.span("oc-jstree js", "emit"):
+            emit_js(fd, ctx)
+        with trace.span("oc-jstree body", "emit"):
+            emit_bodystart(modules,fd, ctx)
+        with trace.span("oc-jstree tree", "emit"):
+            emit_tree(modules, fd, ctx)
+        with trace.span("oc-jstree footer", "emit"):
+            emit_footer(fd, ctx)
 
 def emit_css(fd, ctx):
     fd.write("""
@@ -21,23 +21,38 @@ modules according the YANG usage guidelines in RFC 6087.
 
 from __future__ import print_function, unicode_literals
 
+import atexit
+import collections
+import hashlib
+import json
 import re
 from enum import IntEnum
 import optparse
 import os.path
+import sys
+import time
+import pyang
 from pyang import error
 from pyang import plugin
 from pyang import statements
+from pyang import yang_parser
 from pyang.error import err_add
 from pyang.plugins import lint
 
 
+from util import lint_cache
+from util import lint_output
+from util import text_scan
+from util import trace
 from util import yangpath
 
 # Keywords which result in data nodes being created in a YANG tree
 INSTANTIATED_DATA_KEYWORDS = [u"leaf", u"leaf-list", u"container", u"list",
                               u"choice"]
 LEAFNODE_KEYWORDS = [u"leaf", u"leaf-list"]
+# Keywords of the data nodes that appear in compressed paths.
+COMPRESSED_PATH_KEYWORDS = [u"leaf", u"leaf-list", u"container", u"list",
+                            u"anydata", u"anyxml"]
 
 # YANG types that should not be used in OpenConfig models.
 BAD_TYPES = [u"empty", u"bits"]
@@ -48,6 +63,11 @@ OPENCONFIG_OPSTATE_CONTAINERS = [u"config", u"state"]
 OPENCONFIG_CONFIG_CONTAINER = u"config"
 OPENCONFIG_STATE_CONTAINER = u"state"
 
+# Regular expressions used to find unquoted key arguments in the raw text
+# of a module, line by line.
+KEY_STATEMENT_PATTERN = r"^[ ]*key[ ]+(?P<key_arg>[^\"\n][a-zA-Z0-9\-_]+);$"
+QUOTED_ARGUMENT_RE = re.compile(r"^\".*\"$")
+
 
 class ErrorLevel(IntEnum):
   """An enumeration of the Pyang error levels.
@@ -112,6 +132,51 @@ def pyang_plugin_init():
   """
   plugin.register_plugin(OpenConfigPlugin())
 
+def schema_path(stmt):
+  """Return the schema path of a node, and the opstate containers on it.
+
+    The result is cached on the node, and derived from the cached result
+    for its parent, such that the paths of all of the nodes in a tree are
+    computed with one visit of each node. As for pyang's mk_path_str,
+    case, input and output statements do not appear in the path.
+
+    Args:
+        stmt: pyang.Statement for the node.
+
+    Returns:
+      A tuple of the tuple of node names on the path, and the number of
+      "config" and of "state" containers on the path.
+  """
+  # The parent is recorded with the path, since pyang copies statements,
+  # and their cached path, when groupings are expanded.
+  cached = stmt.__dict__.get("oc_schema_path")
+  if cached is not None and cached[0] is stmt.parent:
+    return cached[1]
+
+  if stmt.keyword in [u"case", u"input", u"output"]:
+    path = schema_path(stmt.parent)
+  elif stmt.parent.keyword in [u"module", u"submodule"]:
+    path = ((stmt.arg,),
+            int(stmt.arg == OPENCONFIG_CONFIG_CONTAINER),
+            int(stmt.arg == OPENCONFIG_STATE_CONTAINER))
+  else:
+    elements, confignum, statenum = schema_path(stmt.parent)
+    path = (elements + (stmt.arg,),
+            confignum + (stmt.arg == OPENCONFIG_CONFIG_CONTAINER),
+            statenum + (stmt.arg == OPENCONFIG_STATE_CONTAINER))
+
+  stmt.oc_schema_path = (stmt.parent, path)
+  return path
+
+
+def schema_path_str(stmt):
+  """Return the schema path of a node as a string, as mk_path_str does.
+
+    Args:
+        stmt: pyang.Statement for the node.
+  """
+  return u"/" + u"/".join(schema_path(stmt)[0])
+
 def print_path(stmt):
   """Return a string of the path for a particular node by traversing
      the hierarchy.
@@ -129,6 +194,154 @@ def print_path(stmt):
   p.append("")
   return "/".join(p[::-1])
 
+def reference_statements(module):
+  """Yield the statements of a module that pyang visits in reference_2.
+
+    The statements are visited in the order that pyang's validate_module
+    visits them, such that a check run over them once the whole model is
+    validated sees the statements that it would see per statement.
+
+    Args:
+        module: pyang.Statement for a validated module or submodule.
+  """
+  stack = [module]
+  while stack:
+    stmt = stack.pop()
+    if getattr(stmt, "is_grammatically_valid", None) is False:
+      continue
+    yield stmt
+    if stmt.keyword == u"grouping":
+      continue
+    if stmt.i_module is not None and stmt.i_module is not module:
+      continue
+    children = list(getattr(stmt, "i_children", []))
+    children.extend(
+        s for s in stmt.substmts
+        if (hasattr(s, "i_has_i_children") or
+            (u"reference_2", s.keyword) in statements._v_i_children_keywords))
+    stack.extend(reversed(children))
+
+def index_module_handles(ctx):
+  """Build the map of module name to repository handle for a context.
+
+    Args:
+        ctx: pyang.Context whose repository is to be indexed.
+  """
+  ctx.oc_module_handles = {}
+  for name, _, handle in ctx.repository.get_modules_and_revisions(ctx):
+    # The first handle for a name is the one that a linear search of
+    # the repository would return.
+    ctx.oc_module_handles.setdefault(name, handle)
+
+
+def index_module_sources(ctx):
+  """Index the module sources that are available to a context.
+
+  The repository is scanned once to build a map of module name to
+  repository handle, and pyang's add_module is wrapped such that the
+  text of each module that is parsed is retained until its raw text
+  checks have been run, rather than being re-read from the repository.
+  Text is only retained for the OpenConfig modules, which are the only
+  modules whose raw text is checked, and not at all where the raw text
+  checks are disabled.
+
+    Args:
+        ctx: pyang.Context to be indexed.
+  """
+  index_module_handles(ctx)
+
+  ctx.oc_module_text = {}
+  ctx.oc_module_digests = {}
+  add_module = ctx.add_module
+  record_digests = getattr(ctx, "oc_cache", None) is not None
+  disabled_codes = getattr(ctx, "oc_disabled_codes", ())
+  record_text = any(r.code not in disabled_codes
+                    for r in OCLintFunctions.text_rules())
+
+  def add_module_with_text(ref, text, *args, **kwargs):
+    if record_text and OCLintStages.module_type_of_ref(ctx, ref) in [
+        ModuleType.OC, ModuleType.OCINFRA]:
+      ctx.oc_module_text[ref] = text
+    if record_digests:
+      ctx.oc_module_digests[ref] = lint_cache.text_digest(text)
+    return add_module(ref, text, *args, **kwargs)
+
+  ctx.add_module = add_module_with_text
+
+
+def append_error_codes(option, opt_str, value, parser):
+  """Append the value of --oc-enable or --oc-disable to the options.
+
+  The error codes are checked as the options are parsed, such that an
+  unknown code is reported as a usage error by the option parser.
+
+    Args:
+        option: optparse.Option that is being parsed.
+        opt_str: the option string given on the command line.
+        value: the value of the option.
+        parser: the optparse.OptionParser.
+  """
+  try:
+    OCLintStages.error_codes([value])
+  except ValueError as e:
+    parser.error("%s: %s" % (opt_str, e))
+  # The default list is shared between parses, so it is not appended to.
+  setattr(parser.values, option.dest,
+          getattr(parser.values, option.dest) + [value])
+
+
+def add_validation_phase(phase, before=None, after=None):
+  """Register a validation phase with pyang, unless it is registered.
+
+  pyang adds a phase each time that it is registered, whereas the phases
+  of this plugin are registered each time that a context is set up.
+
+    Args:
+        phase: name of the phase.
+        before: optional name of the phase that it is run before.
+        after: optional name of the phase that it is run after.
+  """
+  if phase not in statements._validation_phases:
+    statements.add_validation_phase(phase, before=before, after=after)
+
+
+def patch_pyang(ctx, module, name, value):
+  """Replace an attribute of a pyang module until a context is validated.
+
+  pyang looks up its YANG parser, validate_module and validation phases
+  in its modules each time that it uses them, so these are replaced for
+  the parse and validation of the modules of a context, and restored by
+  restore_pyang once the context is validated, rather than being
+  replaced for the rest of the process.
+
+    Args:
+        ctx: pyang.Context that the attribute is replaced for.
+        module: the pyang module, such as pyang.statements.
+        name: name of the attribute.
+        value: the value that replaces it.
+  """
+  if not hasattr(ctx, "oc_pyang_patches"):
+    ctx.oc_pyang_patches = []
+  ctx.oc_pyang_patches.append((module, name, getattr(module, name)))
+  setattr(module, name, value)
+
+
+def restore_pyang(ctx):
+  """Restore the attributes of pyang's modules replaced for a context.
+
+  A list is restored with the entries that were added to its replacement,
+  such as the validation phases that plugins register.
+
+    Args:
+        ctx: pyang.Context whose replacements are restored.
+  """
+  patches = getattr(ctx, "oc_pyang_patches", [])
+  while patches:
+    module, name, value = patches.pop()
+    if isinstance(value, list):
+      value[:] = getattr(module, name)
+    setattr(module, name, value)
+
 class OpenConfigPlugin(lint.LintPlugin):
   """Plugin for Pyang to validate OpenConfig style guide conventions."""
 
@@ -148,16 +361,104 @@ class OpenConfigPlugin(lint.LintPlugin):
                              action="store_true",
                              help="""Do not include standard lint (RFC 6087)
                              checking"""),
+        optparse.make_option("--oc-enable",
+                             dest="openconfig_enable",
+                             action="callback",
+                             callback=append_error_codes,
+                             type="string",
+                             default=[],
+                             metavar="ERROR",
+                             help="""Only run the OpenConfig checks that
+                             report ERROR. May be given multiple times, or
+                             as a comma-separated list"""),
+        optparse.make_option("--oc-disable",
+                             dest="openconfig_disable",
+                             action="callback",
+                             callback=append_error_codes,
+                             type="string",
+                             default=[],
+                             metavar="ERROR",
+                             help="""Do not report the OpenConfig error
+                             ERROR. May be given multiple times, or as a
+                             comma-separated list"""),
+        optparse.make_option("--oc-cache-dir",
+                             dest="openconfig_cache_dir",
+                             metavar="DIR",
+                             help="""Cache the parsed modules, and the
+                             results of the OpenConfig checks for each
+                             module, in DIR, and reuse them when the module
+                             and its dependencies are unchanged. oclint
+                             also keeps an index of the module files on
+                             the search path in DIR"""),
+        optparse.make_option("--oc-cache-size",
+                             dest="openconfig_cache_size",
+                             type="int",
+                             default=256,
+                             metavar="MB",
+                             help="""Maximum size of the OpenConfig cache,
+                             least recently used entries are removed first
+                             (default 256)"""),
+        optparse.make_option("--oc-stats",
+                             dest="openconfig_stats",
+                             type="choice",
+                             choices=["table", "json"],
+                             metavar="FORMAT",
+                             help="""Write the number of calls, time taken
+                             and errors reported by each OpenConfig check
+                             and validation phase to stderr on exit, as a
+                             table or json"""),
+        optparse.make_option("--oc-trace",
+                             dest="openconfig_trace",
+                             metavar="FILE",
+                             help="""Write a timeline of the parse and each
+                             validation phase of every module, and of the
+                             stages of the docs, paths and oc-jstree
+                             outputs, to FILE as Chrome trace events, for
+                             chrome://tracing or Perfetto"""),
+        optparse.make_option("--oc-grouping-memo",
+                             dest="openconfig_grouping_memo",
+                             action="store_true",
+                             help="""Reuse the results of OpenConfig checks
+                             for the copies of a grouping's statements that
+                             are in the same instantiation context"""),
+        optparse.make_option("--oc-output-format",
+                             dest="openconfig_output_format",
+                             type="choice",
+                             choices=["jsonl", "sarif"],
+                             metavar="FORMAT",
+                             help="""Also write the errors that are reported
+                             to stdout as JSON Lines, written as each module
+                             is validated, or as a SARIF log"""),
+        optparse.make_option("--oc-fail-fast",
+                             dest="openconfig_fail_fast",
+                             type="choice",
+                             choices=OCFailFast.LEVEL_CHOICES,
+                             metavar="LEVEL",
+                             help="""Stop validation at the first error at
+                             or above LEVEL (critical, major or minor), and
+                             only run and report the checks at or above
+                             it"""),
         ]
     g = optparser.add_option_group(optparse.OptionGroup(optparser, "OpenConfig specific options"))
     g.add_options(optlist)
 
   def setup_ctx(self, ctx):
+    # The parse and validation of modules, and the outputs, are traced
+    # whether or not the OpenConfig checks are run.
+    OCTrace.setup(ctx)
     if not ctx.opts.openconfig:
       return
+
+    self.setup_validation_maps(ctx)
+    OCLintCache.setup(ctx)
+    OCParseCache.setup(ctx)
+    OCLintOutput.setup(ctx)
+    index_module_sources(ctx)
+
     if not ctx.opts.openconfig_only:
-      # Support IETF as a prefix for modules
-      self.modulename_prefixes.extend(["ietf", "iana"])
+      # Support IETF as a prefix for modules. The list is rebuilt rather
+      # than extended, since a process may set up more than one context.
+      self.modulename_prefixes = ["openconfig", "ietf", "iana"]
 
       # We do not want all RFC6087 rules, so we need to borrow some
       # from the standard linter. We cannot simply call the _setup_ctx
@@ -242,13 +543,13 @@ class OpenConfigPlugin(lint.LintPlugin):
 
     # Add a pre-initialisation phase where we can read the
     # modules before they have been parsed by pyang fully.
-    statements.add_validation_phase("preinit", before="init")
+    add_validation_phase("preinit", before="init")
     statements.add_validation_fun("preinit", ["*"],
                                   OCLintStages.preinitialisation)
 
     # Add an openconfig types validation phase where we can
     # get types and then validate them further.
-    statements.add_validation_phase("openconfig_type", after="type_2")
+    add_validation_phase("openconfig_type", after="type_2")
     statements.add_validation_fun("openconfig_type", ["*"],
                                   OCLintStages.openconfig_type)
 
@@ -344,16 +645,16 @@ class OpenConfigPlugin(lint.LintPlugin):
     # or state containers that will be removed.
     error.add_error_code(
         "OC_LIST_DUPLICATE_COMPRESSED_NAME", ErrorLevel.MAJOR,
-        "List %s (%s) has a duplicate name (with %s) when the parent container %s" + \
-        " is removed.")
+        "List %s (%s) has a duplicate name (with %s at %s) when the parent" + \
+        " container %s is removed.")
 
     # when path compression is performed, the config and state containers
     # are removed, if there is a grandparent of a leaf with the same name,
     # the names will clash.
     error.add_error_code(
       "OC_LEAF_DUPLICATE_COMPRESSED_NAME", ErrorLevel.MAJOR,
-      "Leaf %s (%s) has a duplicate name (with %s) when the parent %s container" + \
-      " is removed.")
+      "Leaf %s (%s) has a duplicate name (with %s at %s) when the parent %s" + \
+      " container is removed.")
 
     # a module defines data nodes at the top-level
     error.add_error_code(
@@ -433,6 +734,130 @@ class OpenConfigPlugin(lint.LintPlugin):
         "statements (%d)",
     )
 
+  def setup_validation_maps(self, ctx):
+    """Compile the OpenConfig checks that are enabled for the context.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+    """
+    all_codes = OCLintStages.all_error_codes()
+    enabled_codes = (OCLintStages.error_codes(ctx.opts.openconfig_enable) or
+                     all_codes)
+    enabled_codes = enabled_codes - OCLintStages.error_codes(
+        ctx.opts.openconfig_disable)
+
+    ctx.oc_fail_fast = None
+    if ctx.opts.openconfig_fail_fast:
+      ctx.oc_fail_fast = OCFailFast(ctx.opts.openconfig_fail_fast)
+      # Checks that only report errors below the level are not run.
+      enabled_codes = set(c for c in enabled_codes
+                          if ctx.oc_fail_fast.applies(c))
+
+    ctx.oc_disabled_codes = all_codes - enabled_codes
+    ctx.oc_validation_maps = OCLintStages.compile_validation_maps(
+        enabled_codes)
+    error_codes = OCLintStages.lint_function_error_codes()
+    ctx.oc_model_checks = [fn for fn in OCLintStages.model_checks()
+                           if enabled_codes.intersection(error_codes[fn])]
+
+    ctx.oc_grouping_memo = None
+    if ctx.opts.openconfig_grouping_memo:
+      ctx.oc_grouping_memo = OCGroupingMemo()
+      ctx.oc_validation_maps = ctx.oc_grouping_memo.wrap_validation_maps(
+          ctx.oc_validation_maps)
+
+    ctx.oc_stats = None
+    if ctx.opts.openconfig_stats:
+      ctx.oc_stats = OCLintStats.instance(ctx.opts.openconfig_stats)
+      ctx.oc_validation_maps = ctx.oc_stats.wrap_validation_maps(
+          ctx.oc_validation_maps)
+      ctx.oc_model_checks = [
+          ctx.oc_stats.wrap(u"check " + fn.__name__, fn)
+          for fn in ctx.oc_model_checks]
+
+  def pre_validate_ctx(self, ctx, modules):
+    if not ctx.opts.openconfig:
+      return
+
+    if ctx.oc_grouping_memo is not None:
+      # Modules may have changed since a previous validation of a context
+      # that is kept between lint runs.
+      ctx.oc_grouping_memo.clear()
+
+    OCLintOutput.begin(ctx, modules)
+
+    if ctx.oc_stats is not None:
+      # All plugins have registered their validation functions by now.
+      ctx.oc_stats.wrap_validation_phases()
+
+    if ctx.oc_fail_fast is not None:
+      ctx.oc_fail_fast.begin(ctx)
+
+  def forget_modules(self, ctx, modules):
+    """Discard the state held for modules that are removed from a context.
+
+    Used where a context is kept between lint runs, and modules are
+    removed from it so that they can be re-parsed. The repository of the
+    context may also have been replaced, so it is re-indexed.
+
+    Args:
+        ctx: pyang.Context that the modules are removed from.
+        modules: list of pyang.Statement (sub)modules being removed.
+    """
+    if not ctx.opts.openconfig:
+      return
+
+    # The modules are parsed and validated again.
+    OCTrace.install(ctx)
+    OCParseCache.install(ctx)
+
+    index_module_handles(ctx)
+    for m in modules:
+      ctx.oc_module_text.pop(m.pos.ref, None)
+      ctx.oc_module_digests.pop(m.pos.ref, None)
+      getattr(ctx, "oc_module_types", {}).pop(m.pos.ref, None)
+      if ctx.oc_cache is not None:
+        ctx.oc_cache_modules.pop(m, None)
+
+  def restore_pyang(self, ctx):
+    """Restore what was replaced in pyang's modules for a context.
+
+    Used where the parse or validation of the modules of a context is
+    interrupted, since what is replaced is otherwise restored once the
+    context is validated.
+
+    Args:
+        ctx: pyang.Context whose replacements are restored.
+    """
+    restore_pyang(ctx)
+
+  def post_validate_ctx(self, ctx, modules):
+    restore_pyang(ctx)
+    if not ctx.opts.openconfig:
+      return
+
+    OCParseCache.evict(ctx)
+
+    if ctx.oc_fail_fast is None or ctx.oc_fail_fast.failed is None:
+      # Where validation was stopped modules are incomplete, so their
+      # results are not cached, and the whole-model checks are not run.
+      OCLintCache.store(ctx)
+      OCLintStages.openconfig_model(ctx)
+
+    if ctx.oc_disabled_codes:
+      # Checks that report both enabled and disabled codes are still run,
+      # so remove the errors that were reported for disabled codes.
+      ctx.errors[:] = [e for e in ctx.errors
+                       if e[1] not in ctx.oc_disabled_codes]
+
+    if ctx.oc_fail_fast is not None:
+      # pyang's own checks below the level are still run.
+      ctx.errors[:] = [e for e in ctx.errors
+                       if ctx.oc_fail_fast.applies(e[1])]
+
+    if ctx.oc_output is not None:
+      OCLintOutput.finish(ctx)
+
 
 class OCLintStages(object):
   """Containing class for OpenConfig linter stages.
@@ -474,12 +899,8 @@ class OCLintStages(object):
         ctx: pyang.Context for the current validation.
         stmt: pyang.Statement matching the validation call.
     """
-    validmap = {
-        u"module": [OCLintFunctions.check_module_rawtext],
-        u"submodule": [OCLintFunctions.check_module_rawtext],
-    }
-
-    for fn in OCLintStages.map_statement_to_lint_fn(stmt, validmap):
+    for fn in OCLintStages.map_statement_to_lint_fn(
+        ctx, stmt, ctx.oc_validation_maps[u"preinit"]):
       fn(ctx, stmt)
 
   @staticmethod
@@ -493,36 +914,13 @@ class OCLintStages(object):
         ctx: pyang.Context for the current validation
         stmt: pyang.Statement matching the validation call.
     """
+    functions = OCLintStages.map_statement_to_lint_fn(
+        ctx, stmt, ctx.oc_validation_maps[u"openconfig_type"])
+    if ctx.oc_cache is not None:
+      OCLintCache.run(ctx, stmt, functions)
+      return
 
-    validmap = {
-        u"*": [
-            OCLintFunctions.check_yang_feature_usage,
-        ],
-        u"LEAVES": [
-            OCLintFunctions.check_enumeration_style,
-            OCLintFunctions.check_bad_types,
-            OCLintFunctions.check_posix_pattern_equal,
-        ],
-        u"identity": [
-            OCLintFunctions.check_identity_style,
-        ],
-        u"module": [
-            OCLintFunctions.check_versioning,
-            OCLintFunctions.check_top_level_data_definitions,
-            OCLintFunctions.check_standard_groupings,
-        ],
-        u"augment": [
-            OCLintFunctions.check_relative_paths,
-        ],
-        u"path": [
-            OCLintFunctions.check_relative_paths,
-        ],
-        u"typedef": [
-            OCLintFunctions.check_typedef_style,
-        ],
-    }
-
-    for fn in OCLintStages.map_statement_to_lint_fn(stmt, validmap):
+    for fn in functions:
       fn(ctx, stmt)
 
   @staticmethod
@@ -536,65 +934,1435 @@ class OCLintStages(object):
         ctx: pyang.Context for the current validation
         stmt: pyang.Statement matching the validation call
     """
-    validmap = {
-        "*": [
-            OCLintFunctions.check_list_no_sibling,
-        ],
-        u"LEAVES": [
-            OCLintFunctions.check_opstate,
-            OCLintFunctions.check_compressed_names,
-        ],
-        u"list": [
-            OCLintFunctions.check_list_enclosing_container,
-            OCLintFunctions.check_leaf_mirroring,
-        ],
-        u"container": [
-            OCLintFunctions.check_leaf_mirroring,
-        ],
-    }
+    functions = OCLintStages.map_statement_to_lint_fn(
+        ctx, stmt, ctx.oc_validation_maps[u"openconfig_reference"])
+    if ctx.oc_cache is not None:
+      OCLintCache.run(ctx, stmt, functions)
+      return
 
-    for fn in OCLintStages.map_statement_to_lint_fn(stmt, validmap):
+    for fn in functions:
       fn(ctx, stmt)
 
   @staticmethod
-  def map_statement_to_lint_fn(stmt, validation_map):
+  def openconfig_model(ctx):
+    """OpenConfig whole-model validation stage.
+
+    Validation functions that require all of the modules, and the
+    augments between them, to have been validated. Called once per
+    validation of a context, rather than per statement, with the
+    validated OpenConfig modules. Errors from a previous call for the
+    same context, where it is kept between lint runs, are replaced.
+
+    Args:
+        ctx: pyang.Context for the current validation
+    """
+    previous = set(id(e) for e in getattr(ctx, "oc_model_errors", []))
+    if previous:
+      ctx.errors[:] = [e for e in ctx.errors if id(e) not in previous]
+
+    modules = [m for m in ctx.modules.values()
+               if m is not None and m.keyword == u"module" and
+               getattr(m, "i_is_validated", False) is True and
+               OCLintStages.defining_module_type(ctx, m) in
+               [ModuleType.OC, ModuleType.OCINFRA]]
+    start = len(ctx.errors)
+    for fn in ctx.oc_model_checks:
+      fn(ctx, modules)
+    ctx.oc_model_errors = ctx.errors[start:]
+
+  @staticmethod
+  def model_checks():
+    """Return the lint functions that are run for the whole model.
+
+    Returns:
+      A list of functions, called with a pyang.Context and a list of
+      pyang.Statement for the validated OpenConfig modules.
+    """
+    return [OCLintFunctions.check_list_no_sibling,
+            OCLintFunctions.check_compressed_paths]
+
+  @staticmethod
+  def validation_maps():
+    """Return the lint functions that are run in each OpenConfig stage.
+
+    Returns:
+      A dictionary keyed by stage name, with values of a dictionary
+      keyed by statement keyword, "*" for all statements, or "LEAVES"
+      for leaf and leaf-list statements, with values of a list of
+      functions that are to be run for that keyword.
+    """
+    return {
+        u"preinit": {
+            u"module": [OCLintFunctions.check_module_rawtext],
+            u"submodule": [OCLintFunctions.check_module_rawtext],
+        },
+        u"openconfig_type": {
+            u"*": [
+                OCLintFunctions.check_yang_feature_usage,
+            ],
+            u"LEAVES": [
+                OCLintFunctions.check_enumeration_style,
+                OCLintFunctions.check_bad_types,
+                OCLintFunctions.check_posix_pattern_equal,
+            ],
+            u"identity": [
+                OCLintFunctions.check_identity_style,
+            ],
+            u"module": [
+                OCLintFunctions.check_versioning,
+                OCLintFunctions.check_top_level_data_definitions,
+                OCLintFunctions.check_standard_groupings,
+            ],
+            u"augment": [
+                OCLintFunctions.check_relative_paths,
+            ],
+            u"path": [
+                OCLintFunctions.check_relative_paths,
+            ],
+            u"typedef": [
+                OCLintFunctions.check_typedef_style,
+            ],
+        },
+        u"openconfig_reference": {
+            u"LEAVES": [
+                OCLintFunctions.check_opstate,
+            ],
+            u"list": [
+                OCLintFunctions.check_list_enclosing_container,
+                OCLintFunctions.check_leaf_mirroring,
+            ],
+            u"container": [
+                OCLintFunctions.check_leaf_mirroring,
+            ],
+        },
+    }
+
+  @staticmethod
+  def all_error_codes():
+    """Return the set of the error codes of all the lint functions."""
+    all_codes = set()
+    for codes in OCLintStages.lint_function_error_codes().values():
+      all_codes.update(codes)
+    return all_codes
+
+  @staticmethod
+  def error_codes(values):
+    """Return the error codes given to --oc-enable or --oc-disable.
+
+    Args:
+        values: list of the values of the option, each an error code or
+          a comma-separated list of them.
+
+    Returns:
+      The set of the error codes.
+
+    Raises:
+      ValueError: if a code is not reported by any lint function.
+    """
+    codes = set()
+    for value in values:
+      codes.update(c.strip() for c in value.split(",") if c.strip())
+    unknown = codes - OCLintStages.all_error_codes()
+    if unknown:
+      raise ValueError("unknown OpenConfig error code(s): %s" %
+                       ", ".join(sorted(unknown)))
+    return codes
+
+  @staticmethod
+  def lint_function_error_codes():
+    """Return the error codes that can be emitted by each lint function.
+
+    Returns:
+      A dictionary keyed by lint function, with values of a tuple of
+      the error codes that the function can add to the context.
+    """
+    return {
+        OCLintFunctions.check_module_rawtext: tuple(
+            r.code for r in OCLintFunctions.text_rules()),
+        OCLintFunctions.check_yang_feature_usage: (
+            u"OC_STYLE_AVOID_CHOICE", u"OC_STYLE_AVOID_PRESENCE",
+            u"OC_STYLE_AVOID_FEATURES"),
+        OCLintFunctions.check_enumeration_style: (
+            u"OC_ENUM_CASE", u"OC_ENUM_UNDERSCORES"),
+        OCLintFunctions.check_bad_types: (u"OC_BAD_TYPE",),
+        OCLintFunctions.check_posix_pattern_equal: (
+            u"OC_POSIX_PATTERN_COUNT_UNEQUAL",),
+        OCLintFunctions.check_identity_style: (
+            u"OC_IDENTITY_CASE", u"OC_IDENTITY_UNDERSCORES"),
+        OCLintFunctions.check_versioning: (
+            u"OC_MODULE_MISSING_VERSION", u"OC_INVALID_SEMVER",
+            u"OC_MISSING_SEMVER_REVISION"),
+        OCLintFunctions.check_top_level_data_definitions: (
+            u"OC_MODULE_DATA_DEFINITIONS",),
+        OCLintFunctions.check_standard_groupings: (
+            u"OC_MISSING_STANDARD_GROUPING",),
+        OCLintFunctions.check_relative_paths: (u"OC_RELATIVE_PATH",),
+        OCLintFunctions.check_typedef_style: (
+            u"OC_ENUM_CASE", u"OC_ENUM_UNDERSCORES", u"OC_BAD_TYPE",
+            u"OC_POSIX_PATTERN_COUNT_UNEQUAL"),
+        OCLintFunctions.check_list_no_sibling: (u"OC_LIST_HAS_SIBLING",),
+        OCLintFunctions.check_opstate: (
+            u"OC_OPSTATE_KEY_LEAFREF", u"OC_OPSTATE_KEY_LEAFREF_DIRECT",
+            u"OC_OPSTATE_CONTAINER_COUNT", u"OC_OPSTATE_CONFIG_PROPERTY",
+            u"OC_OPSTATE_CONTAINER_NAME"),
+        OCLintFunctions.check_list_enclosing_container: (
+            u"OC_LIST_NO_ENCLOSING_CONTAINER",),
+        OCLintFunctions.check_compressed_paths: (
+            u"OC_LEAF_DUPLICATE_COMPRESSED_NAME",
+            u"OC_LIST_DUPLICATE_COMPRESSED_NAME"),
+        OCLintFunctions.check_leaf_mirroring: (
+            u"OC_OPSTATE_APPLIED_CONFIG",),
+    }
+
+  @staticmethod
+  def compile_validation_maps(enabled_codes):
+    """Compile the validation maps into per-keyword lookup tables.
+
+    Each stage's validation map is flattened such that the functions
+    for "*", "LEAVES" and a specific keyword are combined into a
+    single tuple per keyword. Functions that cannot emit any enabled
+    error code are omitted such that they are never dispatched.
+
+    Args:
+        enabled_codes: set of error codes that are enabled.
+
+    Returns:
+      A dictionary keyed by stage name, with values of a dictionary
+      keyed by statement keyword, with values of a tuple of functions
+      to be run. The "*" key holds the functions run for a keyword
+      that does not otherwise appear in the table.
+    """
+    error_codes = OCLintStages.lint_function_error_codes()
+
+    def enabled(functions):
+      return [fn for fn in functions
+              if enabled_codes.intersection(error_codes[fn])]
+
+    compiled = {}
+    for stage, validmap in OCLintStages.validation_maps().items():
+      all_fns = enabled(validmap.get(u"*", []))
+      leaf_fns = enabled(validmap.get(u"LEAVES", []))
+
+      keywords = [k for k in validmap if k not in [u"*", u"LEAVES"]]
+      if leaf_fns:
+        keywords.extend(LEAFNODE_KEYWORDS)
+
+      table = {u"*": tuple(all_fns)}
+      for keyword in keywords:
+        functions = list(all_fns)
+        if keyword in LEAFNODE_KEYWORDS:
+          functions.extend(leaf_fns)
+        functions.extend(enabled(validmap.get(keyword, [])))
+        table[keyword] = tuple(functions)
+      compiled[stage] = table
+
+    return compiled
+
+  @staticmethod
+  def map_statement_to_lint_fn(ctx, stmt, validation_map):
     """Map for a statement to the lint functions to be run.
 
     Args:
+        ctx: pyang.Context for the current validation.
         stmt: pyang.Statement object for the statement that needs
           the validation functions calculated.
-        validation_map: dictionary keyed by statement keyword or a
-          list of statement keywords, with values of a list of functions
-          that are to be run for that keyword.
+        validation_map: compiled validation map for the stage, as
+          returned by compile_validation_maps.
 
     Returns:
-      Complete list of functions to be run for the statement.
+      Tuple of functions to be run for the statement.
     """
-    functions = []
-    defining_module = stmt.pos.ref.split("/")[-1].split(".")[0]
-    if (OCLintFunctions.is_openconfig_validatable_module(defining_module) not in
+    if (OCLintStages.defining_module_type(ctx, stmt) not in
             [ModuleType.OC, ModuleType.OCINFRA]):
-      return []
+      return ()
+
+    return validation_map.get(stmt.keyword, validation_map[u"*"])
+
+  @staticmethod
+  def defining_module_type(ctx, stmt):
+    """Determine the type of the module that a statement is defined in.
+
+    The type is determined from the name of the file that the statement
+    was read from, and is cached on the context per file, such that it
+    is computed only once for all the statements within a module.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+        stmt: pyang.Statement whose defining module is to be classified.
+
+    Returns:
+      An enumerated ModuleType
+    """
+    return OCLintStages.module_type_of_ref(ctx, stmt.pos.ref)
+
+  @staticmethod
+  def module_type_of_ref(ctx, ref):
+    """Determine the type of the module read from a file.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+        ref: the name of the file that the module was read from.
+
+    Returns:
+      An enumerated ModuleType
+    """
+    module_types = getattr(ctx, "oc_module_types", None)
+    if module_types is None:
+      module_types = ctx.oc_module_types = {}
+
+    module_type = module_types.get(ref)
+    if module_type is None:
+      defining_module = ref.split("/")[-1].split(".")[0]
+      module_type = OCLintFunctions.is_openconfig_validatable_module(
+          defining_module)
+      module_types[ref] = module_type
+    return module_type
+
+
+class OCLintStats(object):
+  """Call counts and timings of the OpenConfig checks and pyang phases.
+
+    Checks are wrapped when the validation maps are compiled, and the
+    functions that pyang runs in each validation phase are wrapped
+    before validation, only where --oc-stats is given. Phase timings
+    include the time of the checks that are run within the phase.
+    pyang validates imported modules from within the import phase, so
+    the time of a call that is nested within a call with the same name
+    is not counted again.
+  """
+
+  _instance = None
+  _clock = getattr(time, "perf_counter", time.time)
+
+  def __init__(self, output_format):
+    self.output_format = output_format
+    # name -> [calls, cumulative time, max time, errors, depth]
+    self.counters = {}
+
+  @classmethod
+  def instance(cls, output_format, report_at_exit=True):
+    """Return the statistics of the process, reported at exit.
+
+    Args:
+        output_format: "table" or "json".
+        report_at_exit: whether the statistics are written to stderr at
+          exit, rather than read by the caller.
+    """
+    if cls._instance is None:
+      cls._instance = cls(output_format)
+      if report_at_exit:
+        atexit.register(cls._instance.report, sys.stderr)
+    return cls._instance
+
+  def wrap(self, name, fn):
+    """Return fn wrapped to record its statistics under name.
+
+    Args:
+        name: name that the statistics are reported with.
+        fn: function, called with a pyang.Context and a pyang.Statement.
+    """
+    counter = self.counters.setdefault(name, [0, 0.0, 0.0, 0, 0])
+    clock = OCLintStats._clock
+
+    def timed(ctx, stmt):
+      counter[0] += 1
+      counter[4] += 1
+      errors = len(ctx.errors)
+      start = clock()
+      try:
+        return fn(ctx, stmt)
+      finally:
+        elapsed = clock() - start
+        counter[4] -= 1
+        if not counter[4]:
+          counter[1] += elapsed
+          counter[2] = max(counter[2], elapsed)
+          counter[3] += len(ctx.errors) - errors
+
+    timed.oc_stats_wrapped = fn
+    return timed
 
-    if u"*" in validation_map:
-      functions.extend(validation_map[u"*"])
+  def wrap_validation_maps(self, compiled):
+    """Wrap the checks in compiled validation maps.
 
-    if u"LEAVES" in validation_map:
-      if stmt.keyword in LEAFNODE_KEYWORDS:
-        functions.extend(validation_map[u"LEAVES"])
+    Args:
+        compiled: validation maps as returned by
+          OCLintStages.compile_validation_maps.
+
+    Returns:
+      The validation maps with each check wrapped.
+    """
+    wrapped = {}
+    for table in compiled.values():
+      for functions in table.values():
+        for fn in functions:
+          if fn not in wrapped:
+            wrapped[fn] = self.wrap(u"check " + fn.__name__, fn)
+
+    return dict(
+        (stage, dict((keyword, tuple(wrapped[fn] for fn in functions))
+                     for keyword, functions in table.items()))
+        for stage, table in compiled.items())
+
+  def wrap_validation_phases(self):
+    """Wrap the functions that pyang runs in each validation phase."""
+    validation_map = statements._validation_map
+    for (phase, keyword), fn in list(validation_map.items()):
+      if not hasattr(fn, "oc_stats_wrapped"):
+        validation_map[(phase, keyword)] = self.wrap(u"phase " + phase, fn)
+
+  def report(self, stream):
+    """Write the statistics to stream.
+
+    Args:
+        stream: file object to write to.
+    """
+    rows = sorted(self.counters.items(), key=lambda i: -i[1][1])
+    rows = [(name, c[0], c[1], c[2], c[3]) for name, c in rows if c[0]]
+    if self.output_format == "json":
+      stream.write(json.dumps([
+          {"name": name, "calls": calls, "total_seconds": total,
+           "max_seconds": longest, "errors": errors}
+          for name, calls, total, longest, errors in rows]) + "\n")
+      return
 
-    if stmt.keyword in validation_map:
-      functions.extend(validation_map[stmt.keyword])
+    width = max([len(r[0]) for r in rows] + [4])
+    stream.write("%-*s %10s %12s %12s %8s\n" %
+                 (width, "name", "calls", "total (s)", "max (s)", "errors"))
+    for name, calls, total, longest, errors in rows:
+      stream.write("%-*s %10d %12.6f %12.6f %8d\n" %
+                   (width, name, calls, total, longest, errors))
+
+
+class OCTrace(object):
+  """Spans of the parse and validation of each module, for --oc-trace.
+
+    The parse of each module is traced by OCCachingYangParser, which
+    replaces pyang's YANG parser, and its validation by wrapping pyang's
+    validate_module. pyang's list of validation phases is replaced by an
+    OCTracedPhases, such that the iteration of the phases by
+    validate_module records a span for each phase, including those of
+    the OpenConfig stages. These are replaced while the modules of the
+    context are parsed and validated. Modules are parsed and validated
+    from within the import phase of the modules that import them, and
+    their spans are nested within it.
+  """
+
+  @staticmethod
+  def setup(ctx):
+    """Start tracing the modules of a context, if it is requested.
 
-    return functions
+    Args:
+        ctx: pyang.Context for the current validation.
+    """
+    filename = getattr(ctx.opts, "openconfig_trace", None)
+    if not filename:
+      return
+
+    trace.start(filename)
+    OCTrace.install(ctx)
+
+  @staticmethod
+  def install(ctx):
+    """Replace pyang's parser and validation for a context that is traced.
+
+    Args:
+        ctx: pyang.Context whose modules are to be parsed and validated.
+    """
+    if not getattr(ctx.opts, "openconfig_trace", None):
+      return
+
+    OCCachingYangParser.install(ctx)
+    if not hasattr(statements.validate_module, "oc_trace_wrapped"):
+      patch_pyang(ctx, statements, "validate_module",
+                  OCTrace.wrap_validate_module(statements.validate_module))
+    if not isinstance(statements._validation_phases, OCTracedPhases):
+      patch_pyang(ctx, statements, "_validation_phases",
+                  OCTracedPhases(statements._validation_phases))
+
+  @staticmethod
+  def wrap_validate_module(validate_module):
+    """Return pyang's validate_module wrapped to trace each module."""
+
+    def traced(ctx, module):
+      tracer = trace.tracer()
+      if tracer is None or module.i_is_validated:
+        return validate_module(ctx, module)
+
+      OCTracedPhases.pending = module.arg
+      begin = trace.clock()
+      try:
+        return validate_module(ctx, module)
+      finally:
+        OCTracedPhases.pending = None
+        tracer.add(u"validate %s" % module.arg, u"validate", begin,
+                   trace.clock(), {u"ref": module.pos.ref})
+
+    traced.oc_trace_wrapped = validate_module
+    return traced
+
+
+class OCTracedPhases(list):
+  """pyang's list of validation phases, tracing validate_module's phases.
+
+    The iteration that follows the start of the validation of a module,
+    which is that of validate_module, records a span for each phase as
+    the next phase is started. Other iterations are not traced.
+  """
+
+  # The name of the module whose validation is starting.
+  pending = None
+
+  def __iter__(self):
+    module = OCTracedPhases.pending
+    tracer = trace.tracer()
+    if module is None or tracer is None:
+      return list.__iter__(self)
+    OCTracedPhases.pending = None
+    return self._traced(tracer, module)
+
+  def _traced(self, tracer, module):
+    for phase in list.__iter__(self):
+      begin = trace.clock()
+      try:
+        yield phase
+      finally:
+        # Also recorded where validation is stopped within the phase.
+        tracer.add(u"phase %s" % phase, u"phase", begin, trace.clock(),
+                   {u"module": module})
+
+
+class OCGroupingMemo(object):
+  """Reuse of the results of checks for statements copied from groupings.
+
+    pyang expands each use of a grouping into a copy of its statements,
+    and the checks of the reference stage visit every copy. A copy is
+    recognised by its keyword, argument and the position of the grouping
+    statement that it was copied from, which pyang retains in the copy.
+
+    Each memoized check is paired with functions that return the parts
+    of the instantiation context that the check reads: that of the parent
+    of a statement, such as the opstate containers on its path, which is
+    computed once for each copy of the parent, and that of the statement,
+    such as its inherited config property. Either returns None where the
+    check is to be run in full. The errors of the first copy with an
+    origin and context are recorded, and replayed for the later copies,
+    at the position of the copy or of its parent. Results with errors
+    whose arguments include the path of the copy are not reused. Checks
+    that read the children of a node, which augments may add to, are not
+    memoized.
+  """
+
+  # Codes whose arguments include the path of the statement.
+  PATH_ERROR_CODES = frozenset([
+      u"OC_OPSTATE_CONTAINER_COUNT", u"OC_OPSTATE_CONTAINER_NAME",
+  ])
+
+  def __init__(self):
+    # Per memoized check, (parent origin, parent context) -> (origin,
+    # context) -> tuple of (relation, tag, args) of the errors reported,
+    # or False where the check is always to be run.
+    self.results = {}
+
+  def clear(self):
+    """Discard the recorded results, such as where modules have changed."""
+    # Nodes that are kept hold references to the tables of results.
+    for results in self.results.values():
+      for table in results.values():
+        table.clear()
+      results.clear()
+
+  @staticmethod
+  def context_functions():
+    """Return the memoized checks, and their context functions.
+
+    Returns:
+      A dictionary keyed by lint function, with values of a tuple of the
+      functions that return the context of the parent of a statement,
+      and of the statement.
+    """
+    return {
+        OCLintFunctions.check_opstate: (OCGroupingMemo.opstate_parent_context,
+                                        OCGroupingMemo.opstate_context),
+    }
+
+  @staticmethod
+  def opstate_parent_context(parent):
+    """Return the context that check_opstate reads from a leaf's parent.
+
+    Args:
+        parent: pyang.Statement for the parent of a leaf or leaf-list.
+    """
+    if parent.keyword in [u"module", u"submodule"]:
+      return None
+    _, confignum, statenum = schema_path(parent)
+    return (parent.keyword, parent.arg, confignum, statenum)
+
+  @staticmethod
+  def opstate_context(stmt):
+    """Return the context that check_opstate reads from a leaf.
+
+    Args:
+        stmt: pyang.Statement for a leaf or leaf-list.
+    """
+    if OCLintFunctions._is_key(stmt):
+      return None
+    return stmt.i_config
+
+  def wrap(self, fn, parent_context, context):
+    """Return fn wrapped such that its results are reused.
+
+    Args:
+        fn: function, called with a pyang.Context and a pyang.Statement.
+        parent_context: function that returns the context of the parent
+          of a statement.
+        context: function that returns the context of a statement.
+    """
+    results = self.results.setdefault(fn, {})
+    attr = "oc_memo_" + fn.__name__
+
+    def memoized(ctx, stmt):
+      # The results for the children of a node are found once for each
+      # node, and stored on it along with the node, since pyang copies
+      # statements.
+      parent = stmt.parent
+      cached = parent.__dict__.get(attr)
+      if cached is None or cached[0] is not parent:
+        table = None
+        if getattr(parent, "i_uses", None) is not None:
+          key = parent_context(parent)
+          if key is not None:
+            pos = parent.pos
+            key = (pos.ref, pos.line, parent.keyword, parent.arg, key)
+            table = results.setdefault(key, {})
+        cached = (parent, table)
+        setattr(parent, attr, cached)
+
+      table = cached[1]
+      if table is None:
+        return fn(ctx, stmt)
+      key = context(stmt)
+      if key is None:
+        return fn(ctx, stmt)
+
+      pos = stmt.pos
+      key = (pos.ref, pos.line, stmt.keyword, stmt.arg, key)
+      result = table.get(key)
+      if result is None:
+        table[key] = OCGroupingMemo.record(ctx, stmt, fn)
+      elif result is False:
+        fn(ctx, stmt)
+      else:
+        for relation, tag, args in result:
+          pos = stmt.pos if relation is None else parent.pos
+          err_add(ctx.errors, pos, tag, args)
+
+    memoized.__name__ = fn.__name__
+    return memoized
+
+  @staticmethod
+  def record(ctx, stmt, fn):
+    """Run a check, and return its result in the form that is reused.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+        stmt: pyang.Statement that the check is run for.
+        fn: the check.
+
+    Returns:
+      A tuple of the errors reported, with None as the relation of errors
+      at the position of the statement and "parent" for those at the
+      position of its parent, or False where the result is not to be
+      reused.
+    """
+    # The errors are classified by the position that they were added at,
+    # since err_add adds a copy of the position.
+    start = len(ctx.errors)
+    fn(ctx, stmt)
+
+    stmt_pos = OCGroupingMemo.position_key(stmt.pos)
+    parent_pos = OCGroupingMemo.position_key(stmt.parent.pos)
+    result = []
+    for pos, tag, args in ctx.errors[start:]:
+      if tag in OCGroupingMemo.PATH_ERROR_CODES:
+        return False
+      key = OCGroupingMemo.position_key(pos)
+      if key == stmt_pos:
+        result.append((None, tag, args))
+      elif key == parent_pos:
+        result.append((u"parent", tag, args))
+      else:
+        return False
+    return tuple(result)
+
+  @staticmethod
+  def position_key(pos):
+    """Return the value by which the positions of errors are compared.
+
+    Args:
+        pos: pyang.error.Position, or a copy of one.
+    """
+    # err_add's shallow copy of a position shares the position of the
+    # uses statement of a copy, which identifies its instantiation.
+    return (pos.ref, pos.line, pos.uses_pos)
+
+  def wrap_validation_maps(self, compiled):
+    """Wrap the memoized checks in compiled validation maps.
+
+    Args:
+        compiled: validation maps as returned by
+          OCLintStages.compile_validation_maps.
+
+    Returns:
+      The validation maps with each memoized check wrapped.
+    """
+    contexts = OCGroupingMemo.context_functions()
+    wrapped = dict((fn, self.wrap(fn, *context))
+                   for fn, context in contexts.items())
+    return dict(
+        (stage, dict((keyword, tuple(wrapped.get(fn, fn) for fn in functions))
+                     for keyword, functions in table.items()))
+        for stage, table in compiled.items())
+
+
+class OCFailFast(object):
+  """Stopping validation at the first error at or above a level.
+
+    The errors of the context are replaced, before validation, with an
+    OCFailFastErrors list that checks each error as it is added. Once an
+    error at or above the level is added, and pyang would report it as an
+    error, pyang's Abort is raised from within the function that added
+    it, which pyang handles by ending the validation of the module. The
+    function that pyang runs for each (sub)module statement at the start
+    of each validation phase is wrapped, in a copy of pyang's validation
+    map that replaces it while the context is validated, to stop the
+    validation of the modules that are validated after that, or that
+    import the module.
+
+    pyang only handles Abort within validate_module, which is replaced
+    while the context is validated to count the modules being validated.
+    Errors that are added outside it, such as pyang's check for duplicate
+    namespaces, are recorded as the error that validation was stopped at
+    without raising Abort.
+
+    A lower ErrorLevel is more severe.
+  """
+
+  LEVEL_CHOICES = [l.name.lower() for l in ErrorLevel
+                   if l != ErrorLevel.WARNING]
+
+  def __init__(self, level):
+    self.level = ErrorLevel[level.upper()]
+    # The error that validation was stopped at.
+    self.failed = None
+    # The number of modules that validate_module is validating.
+    self.validating = 0
+
+  def applies(self, tag):
+    """Return whether an error code is at or above the level."""
+    return error.err_level(tag) <= self.level
+
+  def begin(self, ctx):
+    """Check the errors that are added to a context from now on.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+    """
+    self.failed = None
+    self.validating = 0
+    ctx.errors = OCFailFastErrors(ctx.errors, self, ctx)
+
+    validate_module = statements.validate_module
+
+    def counted(ctx, module):
+      self.validating += 1
+      try:
+        return validate_module(ctx, module)
+      finally:
+        self.validating -= 1
+    patch_pyang(ctx, statements, "validate_module", counted)
+
+    def stop(fn):
+      def fail_fast(ctx, stmt):
+        if self.failed is not None:
+          return "stop"
+        if fn is not None:
+          return fn(ctx, stmt)
+      fail_fast.oc_fail_fast_wrapped = fn
+      return fail_fast
+
+    validation_map = dict(statements._validation_map)
+    for phase in statements._validation_phases:
+      for keyword in ("module", "submodule"):
+        fn = validation_map.get((phase, keyword))
+        fn = getattr(fn, "oc_fail_fast_wrapped", fn)
+        validation_map[(phase, keyword)] = stop(fn)
+    patch_pyang(ctx, statements, "_validation_map", validation_map)
+
+  def check(self, ctx, err):
+    """Stop validation if an error is at or above the level.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+        err: pyang error tuple that was added.
+
+    Raises:
+      pyang.statements.Abort: if the error is the first at or above the
+        level, and is added while a module is being validated.
+    """
+    pos, tag, _ = err
+    if (self.failed is None and self.applies(tag) and
+        tag not in ctx.oc_disabled_codes and
+        OCLintOutput.reported_kind(ctx, pos, tag) == "error"):
+      self.failed = err
+      if self.validating:
+        raise statements.Abort
+
+
+class OCFailFastErrors(list):
+  """The errors of a context, checked by OCFailFast as they are added."""
+
+  def __init__(self, errors, fail_fast, ctx):
+    list.__init__(self, errors)
+    self.fail_fast = fail_fast
+    self.ctx = ctx
+
+  def append(self, err):
+    list.append(self, err)
+    self.fail_fast.check(self.ctx, err)
+
+  def extend(self, errors):
+    errors = list(errors)
+    list.extend(self, errors)
+    for err in errors:
+      self.fail_fast.check(self.ctx, err)
+
+
+class OCLintCache(object):
+  """Caching of the results of the OpenConfig checks for a module.
+
+    The openconfig_type and openconfig_reference stages visit the
+    (sub)module statement before any other statement in the module, and
+    pyang does not validate other modules during these phases, so each
+    statement visited belongs to the last module statement seen.
+
+    The errors that the checks report while a module is being validated
+    are stored under a key derived from the text and location of the
+    module and of each module it transitively imports or includes, the
+    plugin source, and the options that change the checks that are run.
+    When the key is found in the cache, the stored errors are replayed and
+    the checks are not run for the module. The preinit stage only scans
+    the module's own text, and is always run.
+  """
+
+  @staticmethod
+  def setup(ctx):
+    """Open the result cache for a context, if one is configured.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+    """
+    ctx.oc_cache = None
+    if not ctx.opts.openconfig_cache_dir:
+      return
+
+    ctx.oc_cache = lint_cache.LintResultCache(
+        ctx.opts.openconfig_cache_dir,
+        ctx.opts.openconfig_cache_size * 1024 * 1024)
+    # Per-module cache state, keyed by (sub)module statement, of a tuple
+    # of the cache key and the errors recorded for the module, which is
+    # None where the errors were replayed from the cache.
+    ctx.oc_cache_modules = {}
+    ctx.oc_cache_current = None
+
+    with open(os.path.splitext(__file__)[0] + ".py", "rb") as fd:
+      plugin_source = fd.read()
+    options = [
+        pyang.__version__,
+        hashlib.sha256(plugin_source).hexdigest(),
+        bool(ctx.opts.openconfig_only),
+        sorted(ctx.oc_disabled_codes),
+        sorted(ctx.opts.features),
+        list(ctx.opts.deviations),
+        ctx.opts.max_status,
+    ]
+    ctx.oc_cache_options = repr(options)
+
+  @staticmethod
+  def module_digest(ctx, module):
+    """Return the digest of the text of a (sub)module.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+        module: pyang.Statement for the (sub)module.
+    """
+    ref = module.pos.ref
+    digest = ctx.oc_module_digests.get(ref)
+    if digest is None:
+      handle = ctx.oc_module_handles.get(module.arg)
+      try:
+        text = ctx.repository.get_module_from_handle(handle)[2]
+        digest = lint_cache.text_digest(text)
+      except (TypeError, ValueError, ctx.repository.ReadError):
+        digest = "unknown"
+      ctx.oc_module_digests[ref] = digest
+    return digest
+
+  @staticmethod
+  def loaded_module(ctx, name, rev):
+    """Find a (sub)module that has been loaded into a context.
+
+    Unlike ctx.get_module, modules in the repository are not parsed to find
+    the latest revision of a module, such that the errors in other modules
+    of the same name are not added to the context.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+        name: name of the (sub)module.
+        rev: the revision of the (sub)module, or None for the latest
+          loaded revision.
+
+    Returns:
+      The pyang.Statement for the (sub)module, or None if it is not loaded.
+    """
+    if rev is not None:
+      return ctx.modules.get((name, rev))
+    loaded = [(r, m) for (n, r), m in ctx.modules.items()
+              if n == name and m is not None]
+    if not loaded:
+      return None
+    return max(loaded, key=lambda i: i[0])[1]
+
+  @staticmethod
+  def module_key(ctx, module):
+    """Compute the cache key for a (sub)module.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+        module: pyang.Statement for the (sub)module, whose imports and
+          includes have been resolved.
+
+    Returns:
+      A hex digest string.
+    """
+    closure = {}
+    pending = [module]
+    while pending:
+      m = pending.pop()
+      if m.pos.ref in closure:
+        continue
+      closure[m.pos.ref] = OCLintCache.module_digest(ctx, m)
+
+      deps = []
+      for i in m.search("import") + m.search("include"):
+        rev = i.search_one("revision-date")
+        deps.append((i.arg, rev.arg if rev is not None else None))
+      belongs_to = m.search_one("belongs-to")
+      if belongs_to is not None:
+        deps.append((belongs_to.arg, None))
+
+      for name, rev in deps:
+        dep = OCLintCache.loaded_module(ctx, name, rev)
+        if dep is None:
+          closure["missing:%s@%s" % (name, rev)] = ""
+        else:
+          pending.append(dep)
+
+    key = hashlib.sha256(ctx.oc_cache_options.encode("utf-8"))
+    for ref in sorted(closure):
+      key.update(("%s\0%s\0" % (ref, closure[ref])).encode("utf-8"))
+    return key.hexdigest()
+
+  @staticmethod
+  def run(ctx, stmt, functions):
+    """Run the checks for a statement, using the result cache.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+        stmt: pyang.Statement being validated.
+        functions: tuple of checks to be run for the statement.
+    """
+    if stmt.keyword in [u"module", u"submodule"]:
+      OCLintCache.begin_module(ctx, stmt)
+
+    state = ctx.oc_cache_modules.get(ctx.oc_cache_current)
+    if state is None:
+      for fn in functions:
+        fn(ctx, stmt)
+      return
+
+    recorded = state[1]
+    if recorded is None or not functions:
+      return
+
+    # Run the checks against an empty error list, such that errors that
+    # pyang would de-duplicate against other modules are still recorded.
+    errors = ctx.errors
+    ctx.errors = []
+    try:
+      for fn in functions:
+        fn(ctx, stmt)
+    finally:
+      new_errors, ctx.errors = ctx.errors, errors
+    for pos, tag, args in new_errors:
+      recorded.append((pos, tag, args))
+      err_add(ctx.errors, pos, tag, args)
+
+  @staticmethod
+  def begin_module(ctx, module):
+    """Start the checks for a (sub)module, replaying cached results.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+        module: pyang.Statement for the (sub)module.
+    """
+    ctx.oc_cache_current = module
+    if module in ctx.oc_cache_modules:
+      return
+
+    key = OCLintCache.module_key(ctx, module)
+    cached = ctx.oc_cache.get(key)
+    if cached is None:
+      ctx.oc_cache_modules[module] = (key, [])
+      return
+
+    modules = dict((m.arg, m) for m in ctx.modules.values() if m is not None)
+    for pos, tag, args in lint_cache.errors_from_json(cached, modules):
+      err_add(ctx.errors, pos, tag, args)
+    ctx.oc_cache_modules[module] = (key, None)
+
+  @staticmethod
+  def store(ctx):
+    """Store the results of modules that were checked in the cache.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+    """
+    if getattr(ctx, "oc_cache", None) is None:
+      return
+
+    stored = False
+    for module, (key, recorded) in list(ctx.oc_cache_modules.items()):
+      if recorded is not None and module.i_is_validated is True:
+        ctx.oc_cache.put(key, lint_cache.errors_to_json(recorded))
+        ctx.oc_cache_modules[module] = (key, None)
+        stored = True
+    if stored:
+      ctx.oc_cache.evict()
+
+
+class OCParseCache(object):
+  """Caching of the statement trees that pyang parses from YANG text.
+
+    pyang's YANG parser is replaced by OCCachingYangParser while the
+    modules of a context that has a parse cache are parsed and validated,
+    which looks up the text of each module in the parse cache of the
+    context. Entries are keyed by the text and location of the module,
+    the versions of pyang and Python, and the options that change how
+    text is parsed. A module whose parse reports an error is not cached,
+    such that the error is reported again. Each tree is stored as it is
+    parsed, before validation adds to it.
+  """
+
+  @staticmethod
+  def setup(ctx):
+    """Open the parse cache for a context, if one is configured.
+
+    The cache in --oc-cache-dir is used where it is given. Otherwise, a
+    process that lints many contexts, such as the lint daemon, may share
+    a cache between them, such as a lint_cache.MemoryParsedModuleCache,
+    as the openconfig_parse_cache attribute of the options.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+    """
+    ctx.oc_parse_cache = None
+    if ctx.opts.openconfig_cache_dir:
+      ctx.oc_parse_cache = lint_cache.ParsedModuleCache(
+          ctx.opts.openconfig_cache_dir,
+          ctx.opts.openconfig_cache_size * 1024 * 1024)
+    else:
+      ctx.oc_parse_cache = getattr(ctx.opts, "openconfig_parse_cache", None)
+    if ctx.oc_parse_cache is None:
+      return
+
+    ctx.oc_parse_cache_stored = False
+    OCParseCache.install(ctx)
+
+  @staticmethod
+  def install(ctx):
+    """Replace pyang's parser for a context that has a parse cache.
+
+    Args:
+        ctx: pyang.Context whose modules are to be parsed.
+    """
+    if getattr(ctx, "oc_parse_cache", None) is not None:
+      OCCachingYangParser.install(ctx)
+
+  @staticmethod
+  def key(ctx, ref, text):
+    """Compute the cache key of a module's text.
+
+    Args:
+        ctx: pyang.Context that the module is parsed for.
+        ref: the reference, usually the filename, of the module.
+        text: the module's text.
+
+    Returns:
+      A hex digest string.
+    """
+    options = [
+        pyang.__version__,
+        list(sys.version_info[:2]),
+        ref,
+        bool(ctx.keep_comments),
+        ctx.max_line_len,
+        bool(ctx.lax_quote_checks),
+    ]
+    key = hashlib.sha256(repr(options).encode("utf-8"))
+    key.update(text.encode("utf-8"))
+    return key.hexdigest()
+
+  @staticmethod
+  def evict(ctx):
+    """Bound the size of the cache, if modules were stored in it.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+    """
+    if getattr(ctx, "oc_parse_cache", None) is None:
+      return
+
+    if ctx.oc_parse_cache_stored:
+      ctx.oc_parse_cache.evict()
+      ctx.oc_parse_cache_stored = False
+
+
+class OCCachingYangParser(yang_parser.YangParser):
+  """pyang's YANG parser, reusing the trees of the context's parse cache.
+
+    Each parse, or read of a module from the cache, is recorded as a span
+    where --oc-trace is given.
+  """
+
+  @staticmethod
+  def install(ctx):
+    """Replace pyang's YANG parser until a context is validated.
+
+    Args:
+        ctx: pyang.Context whose modules are to be parsed.
+    """
+    if not issubclass(yang_parser.YangParser, OCCachingYangParser):
+      patch_pyang(ctx, yang_parser, "YangParser", OCCachingYangParser)
+
+  def parse(self, ctx, ref, text):
+    tracer = trace.tracer()
+    if tracer is None:
+      return self.parse_cached(ctx, ref, text)
+
+    begin = trace.clock()
+    module = None
+    try:
+      module = self.parse_cached(ctx, ref, text)
+      return module
+    finally:
+      tracer.add(u"parse %s" % (module.arg if module is not None else ref),
+                 u"parse", begin, trace.clock(), {u"ref": ref})
+
+  def parse_cached(self, ctx, ref, text):
+    cache = getattr(ctx, "oc_parse_cache", None)
+    if cache is None:
+      return super(OCCachingYangParser, self).parse(ctx, ref, text)
+
+    key = OCParseCache.key(ctx, ref, text)
+    module = cache.get(key)
+    if module is not None:
+      return module
+
+    errors = len(ctx.errors)
+    module = super(OCCachingYangParser, self).parse(ctx, ref, text)
+    if module is not None and len(ctx.errors) == errors:
+      cache.put(key, module)
+      ctx.oc_parse_cache_stored = True
+    return module
+
+
+class OCLintOutput(object):
+  """Machine-readable output of the errors that pyang reports.
+
+    Errors are selected, and classified as errors or warnings, as pyang
+    selects those that it writes. An "openconfig_output" validation phase
+    is added after pyang's own phases, in which the errors that have been
+    added since the previous (sub)module finished validation are written,
+    such that JSON Lines records are available while later modules are
+    still being validated. The errors that are added once all modules are
+    validated, and the SARIF log, are written after validation.
+  """
+
+  @staticmethod
+  def setup(ctx):
+    """Set up the output of errors for a context, if it is requested.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+    """
+    ctx.oc_output = None
+    ctx.oc_output_inputs = ([], [])
+    if not ctx.opts.openconfig_output_format:
+      return
+
+    ctx.oc_output = lint_output.writer(ctx.opts.openconfig_output_format,
+                                       sys.stdout)
+    ctx.oc_output_index = 0
+    # Errors that have been written, or skipped, which are held such that
+    # their ids are not reused.
+    ctx.oc_output_seen = []
+    ctx.oc_output_seen_ids = set()
+
+    add_validation_phase("openconfig_output")
+    statements.add_validation_fun("openconfig_output",
+                                  ["module", "submodule"],
+                                  OCLintOutput.module_validated)
+
+  @staticmethod
+  def begin(ctx, modules):
+    """Record the input modules, whose errors pyang reports.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+        modules: list of pyang.Statement for the input modules.
+    """
+    modulenames = []
+    for m in modules:
+      modulenames.append(m.arg)
+      modulenames.extend(i.arg for i in m.search("include"))
+    ctx.oc_output_inputs = (modulenames, [m.pos.ref for m in modules])
+
+  @staticmethod
+  def module_validated(ctx, stmt):
+    """Write the errors added since the previous (sub)module was validated.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+        stmt: pyang.Statement for the (sub)module.
+    """
+    start = ctx.oc_output_index
+    ctx.oc_output_index = len(ctx.errors)
+    OCLintOutput.write(ctx, ctx.errors[start:])
+
+  @staticmethod
+  def finish(ctx):
+    """Write the errors that have not yet been written, and end the output.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+    """
+    OCLintOutput.write(ctx, ctx.errors)
+    ctx.oc_output.close()
+
+  @staticmethod
+  def write(ctx, errors):
+    """Write the errors that have not yet been written.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+        errors: list of pyang error tuples.
+    """
+    records = []
+    for e in errors:
+      if id(e) in ctx.oc_output_seen_ids:
+        continue
+      ctx.oc_output_seen_ids.add(id(e))
+      ctx.oc_output_seen.append(e)
+      if e[1] in ctx.oc_disabled_codes:
+        continue
+      record = OCLintOutput.record(ctx, *e)
+      if record is not None:
+        records.append(record)
+    ctx.oc_output.write(records)
+
+  @staticmethod
+  def reported_kind(ctx, pos, tag):
+    """Return whether pyang reports an error as an error or a warning.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+        pos: pyang.error.Position of the error.
+        tag: error code.
+
+    Returns:
+      "error" or "warning", or None if pyang does not report the error.
+    """
+    opts = ctx.opts
+    if opts.ignore_errors or tag in opts.ignore_error_tags:
+      return None
+
+    if ctx.oc_fail_fast is not None and not ctx.oc_fail_fast.applies(tag):
+      return None
+
+    modulenames, filenames = ctx.oc_output_inputs
+    if (ctx.implicit_errors is False and
+        hasattr(pos.top, "i_modulename") and
+        pos.top.arg not in modulenames and
+        pos.top.i_modulename not in modulenames and
+        pos.ref not in filenames):
+      # errors in modules that were added implicitly are not reported.
+      return None
+
+    if error.is_warning(error.err_level(tag)) and tag not in opts.errors:
+      if "error" in opts.warnings and tag not in opts.warnings:
+        return "error"
+      elif "none" in opts.warnings:
+        return None
+      return "warning"
+    return "error"
+
+  @staticmethod
+  def record(ctx, pos, tag, args):
+    """Return the output record of an error, as pyang would report it.
+
+    Args:
+        ctx: pyang.Context for the current validation.
+        pos: pyang.error.Position of the error.
+        tag: error code.
+        args: arguments of the error message.
+
+    Returns:
+      A dictionary, or None if pyang does not report the error.
+    """
+    kind = OCLintOutput.reported_kind(ctx, pos, tag)
+    if kind is None:
+      return None
+
+    level = error.err_level(tag)
+    try:
+      severity = ErrorLevel(level).name
+    except ValueError:
+      severity = None
+
+    module = None
+    if pos.top is not None:
+      module = getattr(pos.top, "i_modulename", None) or pos.top.arg
+
+    uses = None
+    if pos.uses_pos is not None:
+      uses = {"file": pos.uses_pos.ref, "line": pos.uses_pos.line}
+
+    return {
+        "code": tag,
+        "severity": severity,
+        "kind": kind,
+        "file": pos.ref,
+        "line": pos.line,
+        "module": module,
+        "args": lint_output.json_args(args),
+        "message": error.err_to_str(tag, args),
+        "uses": uses,
+    }
+
+
+class CompressedPathTrie(object):
+  """Trie of the compressed paths of the data nodes of a set of modules.
+
+    Paths are compressed as ygot does: the "config" and "state"
+    containers are removed, as are the containers that surround lists,
+    and choice and case statements do not appear in a path. Nodes within
+    "config" and "state" containers that have the same compressed path
+    are merged, as are list keys with the leaves that they reference, so
+    neither is a clash.
+
+    Each node of the trie is a dictionary keyed by path element, with
+    values of a tuple of the list of CompressedNode at the path and the
+    trie node of their children. Each module has its own root, since the
+    top-level nodes of different modules are in different namespaces.
+  """
+
+  # A data node at a compressed path, the name of the container that was
+  # removed above it, or None, and whether it is within a "config" or
+  # "state" container.
+  CompressedNode = collections.namedtuple(
+      "CompressedNode", ["stmt", "removed", "opstate"])
+
+  def __init__(self):
+    self.roots = {}
+    # Pairs of CompressedNode that have the same compressed path.
+    self.collisions = []
+
+  def add_module(self, module):
+    """Add the data nodes of a module, including those that other
+    modules augment into it, to the trie.
+
+    Args:
+        module: pyang.Statement for the module.
+    """
+    root = self.roots.setdefault(module.arg, {})
+    pending = collections.deque([(module, root, None, False)])
+    while pending:
+      stmt, trie, removed, opstate = pending.popleft()
+      for ch in stmt.i_children:
+        if ch.keyword in [u"choice", u"case"]:
+          pending.append((ch, trie, removed, opstate))
+          continue
+        if ch.keyword not in COMPRESSED_PATH_KEYWORDS:
+          continue
+        if OCLintFunctions._is_key(ch):
+          continue
+
+        if ch.keyword == u"container":
+          if ch.arg in OPENCONFIG_OPSTATE_CONTAINERS:
+            pending.append((ch, trie, ch.arg, True))
+            continue
+          data = [i for i in ch.i_children
+                  if i.keyword in COMPRESSED_PATH_KEYWORDS]
+          if len(data) == 1 and data[0].keyword == u"list":
+            self.add_node(trie, data[0], ch.arg, opstate, pending)
+            continue
+
+        self.add_node(trie, ch, removed, opstate, pending)
+
+  def add_node(self, trie, stmt, removed, opstate, pending):
+    """Add a data node to a trie node, recording any collisions.
+
+    Args:
+        trie: trie node that the data node is added to.
+        stmt: pyang.Statement for the data node.
+        removed: name of the container removed between the data node and
+          its parent in the trie, or None.
+        opstate: whether the data node is within a "config" or "state"
+          container.
+        pending: deque that the data node is appended to, where it has
+          children that are to be added.
+    """
+    node = CompressedPathTrie.CompressedNode(stmt, removed, opstate)
+    entry = trie.get(stmt.arg)
+    if entry is None:
+      entry = trie[stmt.arg] = ([], {})
+
+    clashed = False
+    for other in entry[0]:
+      if not (opstate and other.opstate):
+        self.collisions.append((other, node))
+        clashed = True
+    entry[0].append(node)
+
+    if stmt.keyword in [u"container", u"list"]:
+      # The children of a node that clashes are not merged with those of
+      # the nodes it clashes with, such that only the clash is reported.
+      pending.append((stmt, {} if clashed else entry[1], None, opstate))
 
 
 class OCLintFunctions(object):
   """OpenConfig linter validation functions."""
 
+  # The scanner of the text rules, see text_scanner.
+  _text_scanner = None
+
   @staticmethod
   def check_module_rawtext(ctx, stmt):
-    """Perform validation of a module"s raw text.
+    """Perform validation of a module's raw text.
+
+    The text rules are matched in a single pass over the text, see
+    text_rules.
 
     Args:
       ctx: The pyang.Context for the current validation.
@@ -602,56 +2370,80 @@ class OCLintFunctions(object):
         Function is called once per module to reduce the number of
         iterations through the module.
     """
-    try:
-      mod_filename = stmt.pos.ref.split("/")[-1]
-      mod_filename = mod_filename.split(".")[0]
-    except IndexError:
-      err_add(ctx.errors, stmt.pos, "OC_LINTER_ERROR",
-              "Can't determine a module name for %s" % stmt.pos)
-
-    handle = None
-    for mod in ctx.repository.get_modules_and_revisions(ctx):
-      # stmt.pos.ref gives the reference to the file that this
-      # key statement was within
-      if mod[0] == mod_filename:
-        handle = mod
-        break
-
-    if handle is not None:
+    # stmt.pos.ref gives the reference to the file that this
+    # statement was within - use the text that pyang parsed where
+    # it is available.
+    text = getattr(ctx, "oc_module_text", {}).pop(stmt.pos.ref, None)
+    if text is None:
       try:
-        module = ctx.repository.get_module_from_handle(handle[2])
-      except (AttributeError, IndexError) as e:
+        mod_filename = stmt.pos.ref.split("/")[-1]
+        mod_filename = mod_filename.split(".")[0]
+      except IndexError:
+        err_add(ctx.errors, stmt.pos, "OC_LINTER_ERROR",
+                "Can't determine a module name for %s" % stmt.pos)
+
+      if not hasattr(ctx, "oc_module_handles"):
+        index_module_sources(ctx)
+      handle = ctx.oc_module_handles.get(mod_filename)
+
+      if handle is not None:
+        try:
+          text = ctx.repository.get_module_from_handle(handle)[2]
+        except (AttributeError, IndexError, ctx.repository.ReadError) as e:
+          err_add(ctx.errors, stmt.pos, "OC_LINTER_ERROR",
+                  "Can't find module %s: %s" % (stmt.pos.ref, e))
+          return
+      else:
         err_add(ctx.errors, stmt.pos, "OC_LINTER_ERROR",
-                "Can't find module %s: %s" % (stmt.pos.ref, e))
+                "Couldn't open module %s" % stmt.pos.ref)
         return
-    else:
-      err_add(ctx.errors, stmt.pos, "OC_LINTER_ERROR",
-              "Couldn't open module %s" % stmt.pos.ref)
-      return
 
-    key_re = re.compile(r"^([ ]+)?key([ ]+)(?P<arg>[^\"][a-zA-Z0-9\-_]+);$")
-    quoted_re = re.compile(r"^\".*\"$")
-
-    ln_count = 0
-    for ln in module[2].split("\n"):
-      ln_count += 1
-
-      # Remove the newline from the module
-      ln = ln.rstrip("\n")
-      if key_re.match(ln):
-        key_arg = key_re.sub(r"\g<arg>", ln)
-        if not quoted_re.match(key_arg):
-          # Need to create a fake position object for the
-          # key statement because of this pre-initialisation
-          # module parse.
-          pos = error.Position(stmt.pos.ref)
-          pos.line = ln_count
-
-          # Generate an error as the key argument is not
-          # quoted.
-          err_add(ctx.errors, pos, "OC_KEY_ARGUMENT_UNQUOTED",
-                  key_arg)
-      ln_count += 1
+    for rule, match, line in OCLintFunctions.text_scanner().scan(text):
+      rule.handler(ctx, stmt, match, line)
+
+  @staticmethod
+  def text_rules():
+    """Return the rules that check_module_rawtext matches in module text.
+
+    Returns:
+      A list of util.text_scan.TextRules, each with a handler that is
+      called with the context, the (sub)module statement, the match and
+      its line.
+    """
+    return [
+        text_scan.TextRule(u"OC_KEY_ARGUMENT_UNQUOTED", KEY_STATEMENT_PATTERN,
+                           OCLintFunctions.check_key_quoting),
+    ]
+
+  @staticmethod
+  def text_scanner():
+    """Return the TextScanner of the text rules, which is built once."""
+    if OCLintFunctions._text_scanner is None:
+      OCLintFunctions._text_scanner = text_scan.TextScanner(
+          OCLintFunctions.text_rules())
+    return OCLintFunctions._text_scanner
+
+  @staticmethod
+  def check_key_quoting(ctx, stmt, match, line):
+    """Check that the argument of a key statement is quoted.
+
+    Args:
+      ctx: The pyang.Context for the current validation.
+      stmt: The pyang.Statement for the (sub)module whose text matched.
+      match: the match of KEY_STATEMENT_PATTERN.
+      line: the line of the key statement.
+    """
+    key_arg = match.group("key_arg")
+    if not QUOTED_ARGUMENT_RE.match(key_arg):
+      # Need to create a fake position object for the
+      # key statement because of this pre-initialisation
+      # module parse.
+      pos = error.Position(stmt.pos.ref)
+      pos.line = line
+
+      # Generate an error as the key argument is not
+      # quoted.
+      err_add(ctx.errors, pos, "OC_KEY_ARGUMENT_UNQUOTED", key_arg)
 
   @staticmethod
   def is_openconfig_validatable_module(mod):
@@ -850,19 +2642,34 @@ class OCLintFunctions(object):
     Args:
       stmt: pyang.Statement for the entity being checked.
     """
-    is_key = False
     if stmt.parent.keyword == "list" and stmt.keyword == "leaf":
-      key_stmt = stmt.parent.search_one("key")
-      if key_stmt is not None:
-        if " " in key_stmt.arg:
-          key_parts = [i for i in key_stmt.arg.split(" ")]
-        else:
-          key_parts = [key_stmt.arg]
+      return stmt.arg in OCLintFunctions._list_keys(stmt.parent)
+    return False
+
+  @staticmethod
+  def _list_keys(list_stmt):
+    """Return the names of the keys of a list.
+
+    The names are computed once and stored on the list statement, along
+    with the list itself, since pyang copies statements when expanding
+    groupings.
 
-        if stmt.arg in key_parts:
-          is_key = True
+    Args:
+      list_stmt: pyang.Statement for the list.
+
+    Returns:
+      A frozenset of the names of the key leaves.
+    """
+    cached = list_stmt.__dict__.get("oc_list_keys")
+    if cached is not None and cached[0] is list_stmt:
+      return cached[1]
 
-    return is_key
+    keys = frozenset()
+    key_stmt = list_stmt.search_one("key")
+    if key_stmt is not None:
+      keys = frozenset(key_stmt.arg.split(" "))
+    list_stmt.oc_list_keys = (list_stmt, keys)
+    return keys
 
   @staticmethod
   def check_opstate(ctx, stmt):
@@ -872,8 +2679,6 @@ class OCLintFunctions(object):
       ctx: pyang.Context for validation
       stmt: pyang.Statement for a leaf or leaf-list
     """
-    pathstr = statements.mk_path_str(stmt)
-
     # leaves that are list keys are exempt from this check.  YANG
     # requires them at the top level of the list, i.e., not allowed
     # in a descendent container
@@ -894,13 +2699,11 @@ class OCLintFunctions(object):
 
       return
 
-    path_elements = yangpath.split_paths(pathstr)
     # count number of 'config' and 'state' elements in the path
-    confignum = path_elements.count(OPENCONFIG_CONFIG_CONTAINER)
-    statenum = path_elements.count(OPENCONFIG_STATE_CONTAINER)
+    _, confignum, statenum = schema_path(stmt)
     if confignum != 1 and statenum != 1:
       err_add(ctx.errors, stmt.pos, "OC_OPSTATE_CONTAINER_COUNT",
-              (pathstr))
+              (schema_path_str(stmt)))
 
     # for elements in a config or state container, make sure they have the
     # correct config property
@@ -918,107 +2721,111 @@ class OCLintFunctions(object):
 
         if stmt.i_config is False:
           # Allow nested containers within a state container
-          path_elements = yangpath.split_paths(pathstr)
-          if OPENCONFIG_STATE_CONTAINER in path_elements:
+          if statenum:
             valid_enclosing_state = True
 
         if valid_enclosing_state is False:
           err_add(ctx.errors, stmt.pos, "OC_OPSTATE_CONTAINER_NAME",
-                  (stmt.arg, pathstr))
+                  (stmt.arg, schema_path_str(stmt)))
 
   @staticmethod
-  def check_compressed_names(ctx, stmt):
-    """Check that a leaf node does not have a grandparent that has the
-    same name.
-
-    Args:
-      ctx: pyang.Context for the validation
-      stmt: pyang.Statement for the leaf node
-    """
-    if stmt.parent is None or stmt.parent.parent is None:
-      return
-
-    for grandparent in stmt.parent.parent.i_children:
-      if OCLintFunctions._is_key(stmt):
-        # There is a special case where a key of a list may share the name
-        # of its parent list. This is an allowable case - since the key
-        # leaf itself will be compressed out.
-        continue
-      elif grandparent.keyword in LEAFNODE_KEYWORDS:
-        # we only check containers because a grandparent leaf node is a list
-        # key (the only type of leaf that is not under a config or state container)
-        # and duplicate names must be allowed here.
-        continue
-      elif grandparent.arg == stmt.arg:
-        err_add(ctx.errors, stmt.pos, "OC_LEAF_DUPLICATE_COMPRESSED_NAME",
-          (stmt.arg, print_path(stmt), print_path(grandparent), stmt.parent.arg))
-    return
-      
-  
-  @staticmethod
-  def check_list_no_sibling(ctx, stmt):
+  def check_list_no_sibling(ctx, modules):
     """Check that a list has no sibling, and a non-list doesn't have a list as a
     sibling.
 
+    The siblings are checked once for each parent of an OpenConfig node,
+    after all of the modules are validated, such that the children added
+    to a parent by augments from any module are checked together, and
+    each parent is reported once. Every validated module is walked, as
+    a module of another type may instantiate an OpenConfig grouping.
+
     Args:
       ctx: pyang.Context for the validation
-      stmt: pyang.Statement for the node
+      modules: list of pyang.Statement for the validated OpenConfig
+        modules.
     """
+    parents = collections.OrderedDict()
+    for module in ctx.modules.values():
+      if module is None or getattr(module, "i_is_validated", False) is not True:
+        continue
+      for stmt in reference_statements(module):
+        if (stmt.parent is not None and
+            OCLintStages.defining_module_type(ctx, stmt) in
+            [ModuleType.OC, ModuleType.OCINFRA]):
+          parents.setdefault(id(stmt.parent), stmt.parent)
 
-    if stmt.parent is None:
-      return
-    siblings = [(i.keyword, i.arg) for i in stmt.parent.i_children
-                       if i.keyword in INSTANTIATED_DATA_KEYWORDS]
+    for parent in parents.values():
+      siblings = [(i.keyword, i.arg) for i in getattr(parent, "i_children", [])
+                  if i.keyword in INSTANTIATED_DATA_KEYWORDS]
 
-    has_list = False
-    for s in siblings:
-      if s[0] == "list":
-        has_list = True
-        break
+      has_list = False
+      for s in siblings:
+        if s[0] == "list":
+          has_list = True
+          break
 
-    if has_list and len(siblings) > 1:
-      err_add(ctx.errors, stmt.parent.pos,
-              "OC_LIST_HAS_SIBLING",
-              (stmt.parent.arg,
-               ", ".join((f"{s[0]}: {s[1]}" for s in siblings))))
+      if has_list and len(siblings) > 1:
+        err_add(ctx.errors, parent.pos,
+                "OC_LIST_HAS_SIBLING",
+                (parent.arg,
+                 ", ".join((f"{s[0]}: {s[1]}" for s in siblings))))
 
   @staticmethod
   def check_list_enclosing_container(ctx, stmt):
-    """Check that a list has an enclosing container and that its
-    name is not duplicated when path compression is performed.
+    """Check that a list has an enclosing container. Whether its name
+    is duplicated when path compression is performed is checked by
+    check_compressed_paths.
 
     Args:
       ctx: pyang.Context for the validation
       stmt: pyang.Statement for the list
     """
-
-    parent_substmts = [i.arg for i in stmt.parent.i_children
-                       if i.keyword in INSTANTIATED_DATA_KEYWORDS]
-
     if stmt.parent.keyword != "container":
       err_add(ctx.errors, stmt.parent.pos,
               "OC_LIST_NO_ENCLOSING_CONTAINER", stmt.arg)
 
-    # Check whether the list has a duplicated name when compression
-    # is applied.
-    grandparent = stmt.parent.parent
-    if grandparent:
-      for ch in grandparent.i_children:
-        if ch.keyword == "container" and ch.arg != stmt.parent.arg:
-          if len(ch.i_children) == 1 and ch.i_children[0].arg == stmt.arg \
-              and ch.i_children[0].keyword == "list":
-            err_add(ctx.errors, stmt.parent.pos,
-                    "OC_LIST_DUPLICATE_COMPRESSED_NAME",
-                    (stmt.arg, print_path(stmt), print_path(ch.i_children[0]), stmt.parent.arg))
-            
-        # We must recurse into config and state containers since they are to be
-        # removed.
-        if ch.keyword == "container" and ch.arg in OPENCONFIG_OPSTATE_CONTAINERS:
-          for e in ch.i_children:
-            if e.arg == stmt.arg:
-              err_add(ctx.errors, stmt.pos,
-                "OC_LIST_DUPLICATE_COMPRESSED_NAME",
-                (stmt.arg, print_path(stmt), print_path(e), stmt.parent.arg))
+  @staticmethod
+  def check_compressed_paths(ctx, modules):
+    """Check that no two data nodes have the same compressed path.
+
+    A trie of the compressed paths of all of the modules is built, such
+    that clashes between nodes that are added to a tree by augments from
+    different modules are found, as are those within a single module.
+    Each clash is reported once, on the node that is moved by the
+    compression, with the path and position of the node it clashes with.
+
+    Args:
+      ctx: pyang.Context for the validation
+      modules: list of pyang.Statement for the validated OpenConfig
+        modules.
+    """
+    trie = CompressedPathTrie()
+    for module in modules:
+      trie.add_module(module)
+
+    def is_openconfig(node):
+      return (OCLintStages.defining_module_type(ctx, node.stmt) in
+              [ModuleType.OC, ModuleType.OCINFRA])
+
+    for other, node in trie.collisions:
+      # Prefer the node that was moved by the compression, such that the
+      # error names the container whose removal causes the clash.
+      if node.removed is None and other.removed is not None:
+        node, other = other, node
+      if not is_openconfig(node):
+        if not is_openconfig(other):
+          continue
+        node, other = other, node
+
+      removed = node.removed
+      if removed is None:
+        removed = node.stmt.parent.arg
+      code = "OC_LEAF_DUPLICATE_COMPRESSED_NAME"
+      if node.stmt.keyword == "list":
+        code = "OC_LIST_DUPLICATE_COMPRESSED_NAME"
+      err_add(ctx.errors, node.stmt.pos, code,
+              (node.stmt.arg, print_path(node.stmt), print_path(other.stmt),
+               "%s:%d" % (other.stmt.pos.ref, other.stmt.pos.line), removed))
 
   @staticmethod
   def check_leaf_mirroring(ctx, stmt):
@@ -1060,7 +2867,7 @@ class OCLintFunctions(object):
     for elem in config_elem_names:
       if elem not in state_elem_names:
         err_add(ctx.errors, stmt.parent.pos, "OC_OPSTATE_APPLIED_CONFIG",
-                (elem, statements.mk_path_str(stmt, False)))
+                (elem, schema_path_str(stmt)))
 
   @staticmethod
   def check_yang_feature_usage(ctx, stmt):
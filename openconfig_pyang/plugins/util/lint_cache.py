@@ -0,0 +1,239 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+On-disk cache of lint results and parsed modules, keyed by content hash.
+
+Entries are stored as one file per key, JSON for lint results and a
+pickle for parsed modules. The modification time of an entry is updated
+when it is read, such that the least recently used entries of both kinds
+are removed first when the cache directory exceeds its size bound.
+
+Parsed modules may also be kept in memory, for a process that lints
+many sets of modules, such as the lint daemon.
+"""
+
+import collections
+import errno
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+from pyang import error
+
+
+def text_digest(text):
+  """Return a hex digest of a module's text."""
+  return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def position_to_json(pos):
+  """Serialise a pyang.error.Position, including its uses position."""
+  if pos is None:
+    return None
+  return {
+      "ref": pos.ref,
+      "line": pos.line,
+      "top": getattr(pos.top, "arg", None),
+      "uses_pos": position_to_json(pos.uses_pos),
+  }
+
+
+def position_from_json(data, modules):
+  """Deserialise a pyang.error.Position.
+
+  Args:
+    data: the serialised position.
+    modules: dictionary keyed by name of the (sub)module statements in
+      the context, used to restore the top statement of the position.
+  """
+  if data is None:
+    return None
+  pos = error.Position(data["ref"])
+  pos.line = data["line"]
+  pos.top = modules.get(data["top"])
+  pos.uses_pos = position_from_json(data["uses_pos"], modules)
+  return pos
+
+
+def errors_to_json(errors):
+  """Serialise a list of pyang error tuples."""
+  return [{"pos": position_to_json(pos), "tag": tag, "args": args}
+          for pos, tag, args in errors]
+
+
+def errors_from_json(data, modules):
+  """Deserialise a list of pyang error tuples."""
+  errors = []
+  for e in data:
+    args = e["args"]
+    # JSON does not distinguish tuples from lists, and pyang formats
+    # messages from tuples of arguments.
+    if isinstance(args, list):
+      args = tuple(args)
+    errors.append((position_from_json(e["pos"], modules), e["tag"], args))
+  return errors
+
+
+class LintResultCache(object):
+  """A size-bounded directory of cached lint results."""
+
+  SUFFIX = ".json"
+  # Entries of all kinds count towards the size bound of the directory.
+  ENTRY_SUFFIXES = (".json", ".pickle")
+
+  def __init__(self, directory, max_bytes):
+    self.directory = directory
+    self.max_bytes = max_bytes
+    try:
+      os.makedirs(directory)
+    except OSError as e:
+      if e.errno != errno.EEXIST:
+        raise
+
+  def _path(self, key):
+    return os.path.join(self.directory, key + self.SUFFIX)
+
+  def get(self, key):
+    """Return the cached value for key, or None if it is not cached."""
+    path = self._path(key)
+    try:
+      with open(path, "r") as fd:
+        value = json.load(fd)
+      os.utime(path, None)
+    except (IOError, OSError, ValueError):
+      return None
+    return value
+
+  def put(self, key, value):
+    """Store value for key, replacing any existing entry atomically."""
+    fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+    try:
+      with os.fdopen(fd, "w") as f:
+        json.dump(value, f)
+      os.rename(tmp, self._path(key))
+    except (IOError, OSError):
+      try:
+        os.remove(tmp)
+      except OSError:
+        pass
+
+  def evict(self):
+    """Remove the least recently used entries until within the bound."""
+    entries = []
+    total = 0
+    for name in os.listdir(self.directory):
+      if not name.endswith(self.ENTRY_SUFFIXES):
+        continue
+      try:
+        st = os.stat(os.path.join(self.directory, name))
+      except OSError:
+        continue
+      entries.append((st.st_mtime, st.st_size, name))
+      total += st.st_size
+
+    entries.sort()
+    for _, size, name in entries:
+      if total <= self.max_bytes:
+        break
+      try:
+        os.remove(os.path.join(self.directory, name))
+      except OSError:
+        pass
+      total -= size
+
+
+class ParsedModuleCache(LintResultCache):
+  """A size-bounded directory of parsed (sub)module statement trees.
+
+  Entries that cannot be loaded, such as those written by a different
+  version of pyang or Python, are removed when they are read.
+  """
+
+  SUFFIX = ".pickle"
+
+  def get(self, key):
+    """Return the cached statement for key, or None if it is not cached."""
+    path = self._path(key)
+    try:
+      with open(path, "rb") as fd:
+        value = pickle.load(fd)
+      os.utime(path, None)
+    except (IOError, OSError):
+      return None
+    except Exception:  # pylint: disable=broad-except
+      # unpickling can raise almost any exception for a stale entry.
+      try:
+        os.remove(path)
+      except OSError:
+        pass
+      return None
+    return value
+
+  def put(self, key, value):
+    """Store the statement for key, replacing any existing entry."""
+    fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+    try:
+      with os.fdopen(fd, "wb") as f:
+        # statement trees are deep, and pickled recursively.
+        pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+      os.rename(tmp, self._path(key))
+    except (IOError, OSError, pickle.PicklingError, RuntimeError):
+      try:
+        os.remove(tmp)
+      except OSError:
+        pass
+
+
+class MemoryParsedModuleCache(object):
+  """A size-bounded in-memory cache of parsed (sub)module statement trees.
+
+  Each tree is kept pickled, such that the tree that is returned for a
+  key is a new copy, which validation may add to.
+  """
+
+  def __init__(self, max_bytes):
+    self.max_bytes = max_bytes
+    # pickled statement keyed by key, in order of least recent use.
+    self.entries = collections.OrderedDict()
+    self.size = 0
+
+  def get(self, key):
+    """Return the cached statement for key, or None if it is not cached."""
+    data = self.entries.pop(key, None)
+    if data is None:
+      return None
+    self.entries[key] = data
+    return pickle.loads(data)
+
+  def put(self, key, value):
+    """Store the statement for key, replacing any existing entry."""
+    try:
+      # statement trees are deep, and pickled recursively.
+      data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, RuntimeError):
+      return
+    old = self.entries.pop(key, None)
+    if old is not None:
+      self.size -= len(old)
+    self.entries[key] = data
+    self.size += len(data)
+
+  def evict(self):
+    """Remove the least recently used entries until within the bound."""
+    while self.size > self.max_bytes and self.entries:
+      _, data = self.entries.popitem(last=False)
+      self.size -= len(data)
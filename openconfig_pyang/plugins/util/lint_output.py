@@ -0,0 +1,152 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+Machine-readable writers of lint errors.
+
+Each error is a record, a dictionary with the error code ("code"), its
+severity ("severity"), whether pyang reports it as an error or a warning
+("kind"), the file ("file") and line ("line") that it is reported at, the
+name of the module that the file belongs to ("module"), the arguments of
+the error message ("args") and the message ("message"). Where the error
+is within a grouping, the file and line of the uses statement that the
+error was found through are given ("uses"), which is otherwise null.
+
+JSON Lines records are written, and flushed, as they are given to the
+writer. A SARIF log can only be written once all of the records are
+known, so it is written when the writer is closed.
+"""
+
+import json
+
+from pyang import error
+
+SARIF_VERSION = "2.1.0"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+TOOL_NAME = "oc-pyang"
+TOOL_URI = "https://github.com/openconfig/oc-pyang"
+
+
+def json_args(args):
+  """Return the arguments of an error message as a JSON list."""
+  if not isinstance(args, tuple):
+    args = (args,)
+  return [a if isinstance(a, (str, int, float, bool)) or a is None
+          else str(a) for a in args]
+
+
+class JsonLinesWriter(object):
+  """Writes each record as a line of JSON as soon as it is given."""
+
+  def __init__(self, stream):
+    self.stream = stream
+
+  def write(self, records):
+    """Write records, and flush them to the stream.
+
+    Args:
+      records: list of error records.
+    """
+    if not records:
+      return
+    for record in records:
+      self.stream.write(json.dumps(record, sort_keys=True) + "\n")
+    self.stream.flush()
+
+  def close(self):
+    self.stream.flush()
+
+
+class SarifWriter(object):
+  """Writes the records as a SARIF log when it is closed."""
+
+  def __init__(self, stream):
+    self.stream = stream
+    self.records = []
+
+  def write(self, records):
+    """Add records to the log.
+
+    Args:
+      records: list of error records.
+    """
+    self.records.extend(records)
+
+  def close(self):
+    """Write the log of all of the records given to the writer."""
+    rules = {}
+    results = []
+    for record in self.records:
+      code = record["code"]
+      if code not in rules:
+        fmt = error.error_codes.get(code, (None, code))[1]
+        rules[code] = {
+            "id": code,
+            "shortDescription": {"text": fmt},
+            "properties": {"severity": record["severity"]},
+        }
+      results.append({
+          "ruleId": code,
+          "level": "error" if record["kind"] == "error" else "warning",
+          "message": {"text": record["message"]},
+          "locations": [{
+              "physicalLocation": {
+                  "artifactLocation": {"uri": record["file"]},
+                  "region": {"startLine": max(record["line"], 1)},
+              },
+              "logicalLocations": [
+                  {"name": record["module"], "kind": "module"},
+              ] if record["module"] else [],
+          }],
+          "relatedLocations": [{
+              "physicalLocation": {
+                  "artifactLocation": {"uri": record["uses"]["file"]},
+                  "region": {"startLine": max(record["uses"]["line"], 1)},
+              },
+              "message": {"text": "used here"},
+          }] if record["uses"] else [],
+          "properties": {
+              "severity": record["severity"],
+              "args": record["args"],
+          },
+      })
+
+    log = {
+        "version": SARIF_VERSION,
+        "$schema": SARIF_SCHEMA,
+        "runs": [{
+            "tool": {
+                "driver": {
+                    "name": TOOL_NAME,
+                    "informationUri": TOOL_URI,
+                    "rules": [rules[code] for code in sorted(rules)],
+                },
+            },
+            "results": results,
+        }],
+    }
+    self.stream.write(json.dumps(log, indent=2, sort_keys=True) + "\n")
+    self.stream.flush()
+
+
+def writer(output_format, stream):
+  """Return the writer for an output format.
+
+  Args:
+    output_format: "jsonl" or "sarif".
+    stream: file object that the records are written to.
+  """
+  if output_format == "sarif":
+    return SarifWriter(stream)
+  return JsonLinesWriter(stream)
@@ -0,0 +1,67 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+Single-pass scanning of the raw text of modules.
+
+Text rules check the text of a module rather than its statements, for
+what pyang does not retain once a module is parsed, such as how an
+argument is quoted. A TextScanner combines the patterns of its rules
+into one compiled pattern, such that the text of a module is scanned
+once however many rules there are, and yields each match with its rule
+and line number.
+
+Where the matches of two rules overlap, only the rule whose match starts
+first, or that is listed first, is given the match.
+"""
+
+import collections
+import re
+
+# A rule that is matched against the raw text of a module: the error
+# code that it reports, a regular expression, which is matched with
+# re.MULTILINE and must not use group names starting with "_rule", and
+# the function that is called with each match.
+TextRule = collections.namedtuple("TextRule", ["code", "pattern", "handler"])
+
+
+class TextScanner(object):
+  """Matches a list of TextRules against text in a single pass."""
+
+  def __init__(self, rules):
+    self.rules = list(rules)
+    self.pattern = re.compile(
+        "|".join("(?P<_rule%d>%s)" % (i, rule.pattern)
+                 for i, rule in enumerate(self.rules)), re.M)
+
+  def scan(self, text):
+    """Find the matches of the rules in text.
+
+    Args:
+      text: the text to scan.
+
+    Yields:
+      A tuple of the TextRule, the match and the line that the match
+      starts on, counted from 1, for each match in order.
+    """
+    if not self.rules:
+      return
+    line = 1
+    offset = 0
+    for m in self.pattern.finditer(text):
+      # Lines are counted up to each match, such that the text is only
+      # read once.
+      line += text.count("\n", offset, m.start())
+      offset = m.start()
+      yield self.rules[int(m.lastgroup[len("_rule"):])], m, line
@@ -0,0 +1,127 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+Timeline of a pyang run in the Chrome trace event format.
+
+Spans are recorded by the plugins of this package, once tracing has been
+started with start, as complete ("X") events, and written as JSON when
+the process exits, for viewing in chrome://tracing or Perfetto. Spans
+recorded within a span, such as the parse of a module that is imported
+within a validation phase, are shown nested beneath it.
+
+Where tracing has not been started, span does nothing.
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import threading
+import time
+
+_clock = getattr(time, "perf_counter", time.time)
+
+# The Tracer of the process, once tracing is started.
+_tracer = None
+
+
+class Tracer(object):
+  """The spans of a process, written to a trace file."""
+
+  def __init__(self, filename):
+    self.filename = filename
+    self.pid = os.getpid()
+    self.origin = _clock()
+    self.events = []
+
+  def add(self, name, category, start, end, args=None):
+    """Record a span.
+
+    Args:
+      name: the name of the span.
+      category: the category of the span, such as "parse".
+      start: the clock time at which the span started.
+      end: the clock time at which the span ended.
+      args: optional dictionary of the details of the span.
+    """
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": (start - self.origin) * 1e6,
+        "dur": (end - start) * 1e6,
+        "pid": self.pid,
+        "tid": threading.current_thread().ident,
+    }
+    if args:
+      event["args"] = args
+    self.events.append(event)
+
+  def write(self):
+    """Write the trace file, replacing any existing file."""
+    metadata = {"name": "process_name", "ph": "M", "pid": self.pid,
+                "args": {"name": "pyang"}}
+    try:
+      with open(self.filename, "w") as fd:
+        json.dump({"traceEvents": [metadata] + self.events,
+                   "displayTimeUnit": "ms"}, fd)
+    except (IOError, OSError):
+      pass
+
+
+def start(filename):
+  """Start tracing to filename, written when the process exits.
+
+  Tracing that has already been started to filename is continued, such
+  that the spans of every context in a process are written together.
+
+  Returns:
+    The Tracer of the process.
+  """
+  global _tracer
+  if _tracer is None or _tracer.filename != filename:
+    _tracer = Tracer(filename)
+    atexit.register(_tracer.write)
+  return _tracer
+
+
+def tracer():
+  """Return the Tracer of the process, or None if it is not tracing."""
+  return _tracer
+
+
+def clock():
+  """Return the time of the clock that spans are recorded with."""
+  return _clock()
+
+
+@contextlib.contextmanager
+def span(name, category, **args):
+  """Record the time spent within a with statement as a span.
+
+  Args:
+    name: the name of the span.
+    category: the category of the span.
+    **args: the details of the span.
+  """
+  recorder = _tracer
+  if recorder is None:
+    yield
+    return
+  begin = _clock()
+  try:
+    yield
+  finally:
+    recorder.add(name, category, begin, _clock(), args)
@@ -24,10 +24,10 @@ import os.path
 import re
 #from collections import OrderedDict
 #from lxml import etree
-import xml
 
-from util.markdown_emitter import MarkdownEmitter
-from util.html_emitter import HTMLEmitter
+# The emitters, which import jinja2 and six, are imported by emit_docs so
+# that they are only loaded when docs are produced.
+from util import trace
 from util import yangpath
 from util.yangdoc_defs import YangDocDefs
 from pyang import plugin
@@ -204,25 +204,30 @@ def emit_docs(ctx, modules, fd):
   ctx.mod_docs = []
   ctx.skip_keywords = []
   for module in modules:
-    mod = collect_docs(module, ctx)
+    with trace.span("docs collect %s" % module.arg, "emit"):
+      mod = collect_docs(module, ctx)
     ctx.mod_docs.append(mod)
 
   if ctx.opts.no_structure:
     ctx.skip_keywords = ['container', 'list']
 
   if ctx.opts.doc_format == "html":
+    from util.html_emitter import HTMLEmitter
     emitter = HTMLEmitter()
   else:
+    from util.markdown_emitter import MarkdownEmitter
     emitter = MarkdownEmitter()
   # write top level module and types
   for mod in ctx.mod_docs:
-    emitter.genModuleDoc(mod, ctx)
-  # visit each child element recursively and write its docs
-    for child in mod.module.children:
-      emit_child (child, emitter, ctx, fd, 1)
+    with trace.span("docs generate %s" % mod.module_name, "emit"):
+      emitter.genModuleDoc(mod, ctx)
+      # visit each child element recursively and write its docs
+      for child in mod.module.children:
+        emit_child (child, emitter, ctx, fd, 1)
 
   # emit docs for all of the current modules
-  docs = emitter.emitDocs(ctx)
+  with trace.span("docs emit", "emit"):
+    docs = emitter.emitDocs(ctx)
 
   fd.write(docs)
 
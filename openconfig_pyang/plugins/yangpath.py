@@ -30,6 +30,8 @@ from pyang import plugin
 from pyang import statements
 from pyang import error
 
+from util import trace
+
 
 def pyang_plugin_init():
     plugin.register_plugin(PathPlugin())
@@ -100,7 +102,8 @@ class PathPlugin(plugin.PyangPlugin):
         if (epos.top.arg in modulenames and
                   error.is_error(error.err_level(etag))):
             raise error.EmitError("%s contains errors" % epos.top.arg)
-    emit_paths(ctx, modules, fd)
+    with trace.span("paths", "emit"):
+      emit_paths(ctx, modules, fd)
 
 
 def emit_paths(ctx, modules, fd):
@@ -109,11 +112,12 @@ def emit_paths(ctx, modules, fd):
   for module in modules:
     children = [child for child in module.i_children]
     if children:
-      if (not ctx.opts.print_plain and not ctx.opts.relocate_output):
-        fd.write('\nmodule %s:\n' % module.i_modulename)
-      elif ctx.opts.relocate_output:
-        fd.write('\nmodule %s\n' % module.i_modulename)
-      print_children(children, module, fd, ' ', ctx, 1)
+      with trace.span("paths %s" % module.arg, "emit"):
+        if (not ctx.opts.print_plain and not ctx.opts.relocate_output):
+          fd.write('\nmodule %s:\n' % module.i_modulename)
+        elif ctx.opts.relocate_output:
+          fd.write('\nmodule %s\n' % module.i_modulename)
+        print_children(children, module, fd, ' ', ctx, 1)
 
   if ctx.opts.opstate_paths:
     fd.write('\nopstate paths (containing leaves):\n')
@@ -0,0 +1,184 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+Persisted index of the module files on a pyang search path.
+
+pyang lists, and stats each entry of, every directory on the search path
+when a context is created, to find the modules that imports and includes
+are resolved to. An IndexedFileRepository keeps the module files and
+subdirectories found in each directory in an index file, along with the
+modification time of the directory, and lists a directory again only
+where its modification time has changed, such that a scan of an
+unchanged tree costs one stat of each directory. Imports are then
+resolved by pyang from the indexed modules, as from a scan.
+
+Adding, removing or renaming a file changes the modification time of
+its directory; editing a module in place does not, but does not change
+the name, revision or path that the index holds for it either.
+"""
+
+import errno
+import json
+import os
+import tempfile
+import time
+
+from pyang import repository
+from pyang import syntax
+
+INDEX_FILENAME = "repository.index"
+INDEX_VERSION = 1
+
+# Directories modified this recently, in seconds, are listed again by the
+# next scan, since a later change within the resolution of the
+# modification time would otherwise not be seen.
+RACY_SECONDS = 2
+
+
+def read_index(path):
+  """Read the directories of an index file.
+
+  Args:
+    path: the path of the index file.
+
+  Returns:
+    A dictionary keyed by absolute directory path of a list of the
+    directory's modification time, or None if it is not to be trusted,
+    and its entries; an empty dictionary if the index cannot be read.
+  """
+  try:
+    with open(path, "r") as fd:
+      index = json.load(fd)
+  except (IOError, OSError, ValueError):
+    return {}
+  if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+    return {}
+  return index.get("directories") or {}
+
+
+def write_index(path, directories):
+  """Write the directories of an index file, replacing it atomically."""
+  dirname = os.path.dirname(path) or "."
+  try:
+    os.makedirs(dirname)
+  except OSError as e:
+    if e.errno != errno.EEXIST:
+      return
+  try:
+    fd, tmp = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+  except (IOError, OSError):
+    return
+  try:
+    with os.fdopen(fd, "w") as f:
+      json.dump({"version": INDEX_VERSION, "directories": directories}, f)
+    os.rename(tmp, path)
+  except (IOError, OSError):
+    try:
+      os.remove(tmp)
+    except OSError:
+      pass
+
+
+def list_directory(d):
+  """List the module files and subdirectories of a directory as pyang does.
+
+  Args:
+    d: the directory.
+
+  Returns:
+    A list, in directory order, of a list of the filename, module name,
+    revision and format of each readable module file, and a list of the
+    name of each subdirectory.
+  """
+  try:
+    filenames = os.listdir(d)
+  except OSError:
+    filenames = []
+
+  entries = []
+  for fname in filenames:
+    absfilename = os.path.join(d, fname)
+    if os.path.isfile(absfilename):
+      m = syntax.re_filename.search(fname)
+      if m is not None and os.access(absfilename, os.R_OK):
+        name, rev, in_format = m.groups()
+        entries.append([fname, name, rev, in_format])
+    elif os.path.isdir(absfilename):
+      entries.append([fname])
+  return entries
+
+
+class IndexedFileRepository(repository.FileRepository):
+  """A pyang FileRepository whose scan of the search path is persisted.
+
+  Attributes:
+    index_path: the path of the index file, or None to scan the search
+      path as pyang does.
+    listed: the number of directories listed by the last scan.
+    reused: the number of directories whose entries were read from the
+      index by the last scan.
+  """
+
+  def __init__(self, path="", index_path=None, **kwargs):
+    repository.FileRepository.__init__(self, path, **kwargs)
+    self.index_path = index_path
+    self.listed = 0
+    self.reused = 0
+
+  def _setup(self, ctx):
+    if self.index_path is None:
+      repository.FileRepository._setup(self, ctx)
+      return
+
+    index = read_index(self.index_path)
+    removed = []
+    now = time.time()
+    self.modules = []
+    self.listed = 0
+    self.reused = 0
+
+    def entries(d):
+      key = os.path.abspath(d)
+      try:
+        mtime = os.stat(d).st_mtime
+      except OSError:
+        if index.pop(key, None) is not None:
+          removed.append(key)
+        return []
+      cached = index.get(key)
+      if cached is not None and cached[0] is not None and cached[0] == mtime:
+        self.reused += 1
+        return cached[1]
+      self.listed += 1
+      dir_entries = list_directory(d)
+      index[key] = [mtime if now - mtime >= RACY_SECONDS else None,
+                    dir_entries]
+      return dir_entries
+
+    # The modules are added in the order that pyang's scan adds them.
+    def add_files_from_dir(d):
+      for entry in entries(d):
+        absfilename = os.path.join(d, entry[0])
+        if len(entry) > 1:
+          if absfilename.startswith("./"):
+            absfilename = absfilename[2:]
+          self.modules.append((entry[1], entry[2], (entry[3], absfilename)))
+        elif not self.no_path_recurse and d != ".":
+          add_files_from_dir(absfilename)
+
+    for d in self.dirs:
+      add_files_from_dir(d)
+    if removed or self.listed:
+      write_index(self.index_path, index)
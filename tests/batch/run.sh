@@ -0,0 +1,105 @@
+#!/bin/bash
+# Copyright 2026 The OpenConfig Authors.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Lays out the oclinter test cases as an openconfig/public repository,
+# with a .spec.yml build set for the succeed and for the fail modules of
+# each case, and checks that the batch linter reports the same result,
+# and errors, for each build set as the pyang command that
+# tests/integration/gen.go generates for it.
+
+TESTDIR="$(cd -P "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+CASEDIR=$TESTDIR/../oclinter
+FAIL=0
+
+# avoid python warnings causing our test cases to fail unexpectedly.
+export PYTHONWARNINGS="ignore"
+
+PLUGIN_DIR=$(/usr/bin/env python -c \
+      'import openconfig_pyang; import os; \
+       print("{}/plugins".format(os.path.dirname(openconfig_pyang.__file__)))')
+
+ROOT=$(mktemp -d)
+mkdir -p $ROOT/third_party/ietf $ROOT/release/models/extensions
+cp $CASEDIR/common/ietf-*.yang $CASEDIR/common/iana-*.yang \
+    $ROOT/third_party/ietf
+cp $CASEDIR/common/openconfig-extensions.yang $ROOT/release/models/extensions
+
+# Cases that import the modules of the case by name are left out, since
+# every case defines modules of the same names. Build sets are linted in
+# the byte order of their directories, as gen.go sorts them.
+CASES=$(cd $CASEDIR && LC_ALL=C ls | while read f; do [ -d $f ] && echo $f; done | \
+    grep -v "^\(common\|compression-augmentclash\|lists-no-sibling-augment\)$")
+
+expected=""
+for case in $CASES; do
+  mkdir $ROOT/release/models/$case
+  cp $CASEDIR/$case/*.yang $ROOT/release/models/$case
+  spec=$ROOT/release/models/$case/.spec.yml
+  for result in succeed fail; do
+    files=$(cd $ROOT/release/models/$case && ls *-$result*.yang 2>/dev/null)
+    [ -z "$files" ] && continue
+    echo "- name: $case-$result" >> $spec
+    echo "  build:" >> $spec
+    for f in $files; do
+      echo "    - yang/$case/$f" >> $spec
+    done
+    echo "  run-ci: true" >> $spec
+
+    paths=$(for f in $files; do echo $ROOT/release/models/$case/$f; done)
+    log=$(pyang --plugindir $PLUGIN_DIR --openconfig --oc-only -p $ROOT \
+        -p $ROOT/third_party/ietf $paths 2>&1)
+    if [ $? -ne 0 ]; then
+      expected+="FAIL $case-$result (release/models/$case,"
+      expected+=" $(echo $files | wc -w) files)"$'\n'"$log"$'\n'
+    else
+      expected+="PASS $case-$result (release/models/$case,"
+      expected+=" $(echo $files | wc -w) files)"$'\n'
+    fi
+  done
+done
+# Models that are not marked run-ci are not linted.
+printf -- "- name: skipped\n  build:\n    - yang/missing/missing.yang\n" \
+    >> $ROOT/release/models/extensions/.spec.yml
+
+# The results are the same however the sets are given to the workers,
+# and whether the workers are forked or are started without the plugins
+# loaded.
+for run in "1 imports fork" "4 imports fork" "4 manifest fork" \
+    "4 imports spawn" "4 manifest spawn"; do
+  set -- $run
+  got=$(/usr/bin/env python -c \
+      'import multiprocessing, sys; \
+       from openconfig_pyang import batch; \
+       multiprocessing.set_start_method(sys.argv[1]); \
+       sys.exit(batch.main(sys.argv[2:]))' \
+      $3 --models $ROOT --jobs $1 --schedule $2 2>&1 | sed 's/ [0-9.]*s$//')
+  if [ "$(echo "$expected" | sed '/^$/d')" != "$(echo "$got" | sed '$d')" ]; then
+    FAIL=$((FAIL+1))
+    diff <(echo "$expected" | sed '/^$/d') <(echo "$got" | sed '$d')
+    echo "batch-jobs-$1-$2-$3: FAILED"
+  else
+    echo "batch-jobs-$1-$2-$3: OK"
+  fi
+done
+
+rm -rf $ROOT
+
+if [ $FAIL -ne 0 ]; then
+  echo "test fail: $FAIL tests failed"
+  exit 127
+else
+  echo "test succeeded"
+  exit 0
+fi
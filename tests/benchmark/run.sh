@@ -0,0 +1,117 @@
+#!/bin/bash
+# Copyright 2026 The OpenConfig Authors.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Checks that the benchmarks record the start time of the linter, and the
+# time and memory of a small model, that starting the linter does not
+# import the dependencies of the doc emitters, that results compare
+# cleanly with themselves, that a time or peak memory beyond the
+# threshold of a baseline is reported as a regression, that given modules
+# are timed with and without --oc-grouping-memo, and that -p is required
+# where the test modules are not found.
+
+TESTDIR="$(cd -P "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+COMMONDIR=$TESTDIR/../oclinter/common
+FAIL=0
+
+# avoid python warnings causing our test cases to fail unexpectedly.
+export PYTHONWARNINGS="ignore"
+
+WORKDIR=$(mktemp -d)
+
+benchmark() {
+  /usr/bin/env python -m openconfig_pyang.benchmark -p $COMMONDIR \
+      --sizes small --repeat 1 "$@" >$WORKDIR/output 2>&1
+}
+
+report() {
+  if [ $1 -ne 0 ]; then
+    FAIL=$((FAIL+1))
+    cat $WORKDIR/output
+    echo "$2: FAILED"
+  else
+    echo "$2: OK"
+  fi
+}
+
+benchmark -o $WORKDIR/baseline.json && /usr/bin/env python -c \
+    'import json, sys; b = json.load(open(sys.argv[1])); \
+     assert b["startup_seconds"] > 0 and b["startup_modules"]; \
+     r = b["sizes"][0]; \
+     assert r["name"] == "small" and r["wall_seconds"] > 0; \
+     assert set(r["plugin_phases"]) == \
+         set(["preinit", "openconfig_type", "reference_2"]); \
+     assert r["checks"]["check_opstate"]["calls"]' $WORKDIR/baseline.json
+report $? record
+
+# The doc emitters' dependencies are only imported when docs are produced.
+/usr/bin/env python -c \
+    'import sys; from openconfig_pyang import oclint; oclint.init_plugins(); \
+     loaded = [m for m in ("jinja2", "six") if m in sys.modules]; \
+     assert not loaded, loaded' >$WORKDIR/output 2>&1
+report $? lazy-imports
+
+# A large threshold, and noise floor, allow for the variance of the runs.
+benchmark -o $WORKDIR/same.json --compare $WORKDIR/baseline.json \
+    --threshold 10 --min-seconds 1
+report $? compare-same
+
+# Reduce the baseline's wall time and peak memory to a twentieth.
+/usr/bin/env python -c \
+    'import json, sys; b = json.load(open(sys.argv[1])); \
+     r = b["sizes"][0]; \
+     r["wall_seconds"] /= 20; r["peak_memory_bytes"] //= 20; \
+     json.dump(b, open(sys.argv[2], "w"))' \
+    $WORKDIR/baseline.json $WORKDIR/faster.json
+! benchmark -o $WORKDIR/slower.json --compare $WORKDIR/faster.json \
+    --min-seconds 0
+res=$?
+grep -q "wall_seconds.*REGRESSION" $WORKDIR/output && \
+    grep -q "peak_memory_bytes.*REGRESSION" $WORKDIR/output
+report $((res + $?)) compare-regression
+
+# Given modules are linted in place of the generated models.
+benchmark -o $WORKDIR/memo.json --grouping-memo \
+    --module $COMMONDIR/../opstate-grouping-memo/openconfig-testcase-fail.yang \
+    && /usr/bin/env python -c \
+    'import json, sys; b = json.load(open(sys.argv[1])); \
+     [r] = b["sizes"]; \
+     assert r["name"] == "openconfig-testcase-fail" and "params" not in r; \
+     assert r["grouping_memo_wall_seconds"] > 0; \
+     assert r["grouping_memo_checks"]["check_opstate"]["calls"]' \
+    $WORKDIR/memo.json
+report $? grouping-memo-modules
+
+# Where the package is installed without the test modules, -p is required.
+PKGDIR=$(/usr/bin/env python -c \
+    'import openconfig_pyang, os; \
+     print(os.path.dirname(openconfig_pyang.__file__))')
+mkdir $WORKDIR/installed
+cp -r $PKGDIR $WORKDIR/installed
+! (cd $WORKDIR && PYTHONPATH=$WORKDIR/installed /usr/bin/env python -m \
+    openconfig_pyang.benchmark --sizes small --repeat 1 \
+    -o $WORKDIR/installed.json >$WORKDIR/output 2>&1)
+res=$?
+grep -q -- "-p is required" $WORKDIR/output
+report $((res + $?)) installed-no-path
+
+rm -rf $WORKDIR
+
+if [ $FAIL -ne 0 ]; then
+  echo "test fail: $FAIL tests failed"
+  exit 127
+else
+  echo "test succeeded"
+  exit 0
+fi
@@ -0,0 +1,93 @@
+#!/bin/bash
+# Copyright 2026 The OpenConfig Authors.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Checks that the synthetic model generator is deterministic, that the
+# models it generates lint cleanly, and that each kind of violation is
+# reported with its error code.
+
+TESTDIR="$(cd -P "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+COMMONDIR=$TESTDIR/../oclinter/common
+FAIL=0
+
+# avoid python warnings causing our test cases to fail unexpectedly.
+export PYTHONWARNINGS="ignore"
+
+PLUGIN_DIR=$(/usr/bin/env python -c \
+      'import openconfig_pyang; import os; \
+       print("{}/plugins".format(os.path.dirname(openconfig_pyang.__file__)))')
+
+WORKDIR=$(mktemp -d)
+
+generate() {
+  local dir=$1
+  shift
+  /usr/bin/env python -m openconfig_pyang.modelgen -o $WORKDIR/$dir "$@" \
+      >/dev/null
+}
+
+lint() {
+  pyang --openconfig --lint --plugindir $PLUGIN_DIR -p $COMMONDIR \
+      $WORKDIR/$1/*.yang 2>&1
+}
+
+report() {
+  if [ $1 -ne 0 ]; then
+    FAIL=$((FAIL+1))
+    echo "$2: FAILED"
+  else
+    echo "$2: OK"
+  fi
+}
+
+generate seed-a --modules 2 --seed 1
+generate seed-b --modules 2 --seed 1
+generate seed-c --modules 2 --seed 2
+diff -r $WORKDIR/seed-a $WORKDIR/seed-b >/dev/null
+report $? same-seed
+! diff -r $WORKDIR/seed-a $WORKDIR/seed-c >/dev/null
+report $? different-seed
+
+for params in "--modules 3 --depth 2 --fanout 2 --lists 4 --augments 2" \
+              "--depth 0 --lists 0 --groupings 0 --identities 0 --typedefs 0"; do
+  generate clean $params
+  output=$(lint clean)
+  res=$?
+  if [ $res -ne 0 ]; then
+    echo "$output"
+  fi
+  report $res "clean $params"
+  rm -rf $WORKDIR/clean
+done
+
+codes=$(/usr/bin/env python -c \
+    'from openconfig_pyang import modelgen; \
+     print(" ".join(modelgen.VIOLATIONS.values()))')
+generate violations --modules 2 --violations $(echo $codes | wc -w)
+output=$(pyang --openconfig --plugindir $PLUGIN_DIR --print-error-code \
+    -p $COMMONDIR $WORKDIR/violations/*.yang 2>&1)
+for code in $codes; do
+  echo "$output" | grep -q ": $code$"
+  report $? "violation $code"
+done
+
+rm -rf $WORKDIR
+
+if [ $FAIL -ne 0 ]; then
+  echo "test fail: $FAIL tests failed"
+  exit 127
+else
+  echo "test succeeded"
+  exit 0
+fi
@@ -0,0 +1,100 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+Checks that the lint API returns the errors that pyang reports for each
+oclinter test case, for modules given as files and as text, with a new
+context for each call and with a Linter that is kept between calls, and
+that an unknown error code is reported as invalid arguments rather than
+exiting the process.
+
+Usage: api.py <oclinter test case directory>
+"""
+
+from __future__ import print_function
+
+import difflib
+import glob
+import io
+import os
+import sys
+
+import openconfig_pyang
+
+from relint import pyang_lint
+
+
+def compare(name, result, expected):
+  # Messages may contain newlines, so compare the written text.
+  got = (result.exit_code,
+         "\n".join(str(e) for e in result.errors).splitlines())
+  missing = [e for e in result.errors
+             if e.code.startswith("OC_") and e.level is None]
+  if got != expected or missing:
+    print("Return code %d, expected %d, differences:" %
+          (got[0], expected[0]))
+    print("\n".join(difflib.unified_diff(
+        expected[1], got[1], "pyang", "api", lineterm="")))
+    for e in missing:
+      print("no level for %s" % e.code)
+    print("api-%s: FAILED" % name)
+    return 1
+  print("api-%s: OK" % name)
+  return 0
+
+
+def main(casedir):
+  os.chdir(casedir)
+  cases = sorted(d for d in os.listdir(".")
+                 if os.path.isdir(d) and d != "common")
+
+  failed = 0
+  with openconfig_pyang.Linter(path=["common"]) as linter:
+    for run in ["cold", "warm"]:
+      for case in cases:
+        files = sorted(glob.glob(os.path.join(case, "*.yang")))
+        expected = pyang_lint(["-p", "common"] + files)
+        failed += compare("%s-%s" % (case, run), linter.lint(files),
+                          expected)
+
+  files = ["lists-compression/openconfig-testcase-fail.yang",
+           "key-quoting-submodule/openconfig-submodule-fail.yang"]
+  texts = {}
+  for f in files:
+    with io.open(f, encoding="utf-8") as fd:
+      texts[f] = fd.read()
+  expected = pyang_lint(["-p", "common", "--oc-only"] + files)
+  failed += compare("texts", openconfig_pyang.lint(
+      texts=texts, path=["common"], args=["--oc-only"]), expected)
+
+  stderr = sys.stderr
+  sys.stderr = io.StringIO()
+  try:
+    openconfig_pyang.Linter(args=["--oc-disable", "OC_BOGUS"])
+    unknown_code = "no error"
+  except ValueError as e:
+    unknown_code = str(e)
+  finally:
+    sys.stderr = stderr
+  if "invalid arguments" in unknown_code:
+    print("api-unknown-code: OK")
+  else:
+    print(unknown_code)
+    print("api-unknown-code: FAILED")
+    failed += 1
+  return failed
+
+
+if __name__ == "__main__":
+  sys.exit(1 if main(os.path.abspath(sys.argv[1])) else 0)
@@ -0,0 +1,206 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+Checks that the lint client does not use a socket, or a directory for
+the default socket, that is not the user's, that it lints in-process
+where the daemon does not respond within the timeout, and that the
+daemon returns an error, rather than closing the connection, where
+linting fails unexpectedly or the arguments give an unknown error code,
+and that the modules that one request parses are not parsed again for a
+request for another set of modules.
+
+Usage: daemon_socket.py <oclinter test case directory>
+"""
+
+from __future__ import print_function
+
+import io
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+
+from openconfig_pyang import client
+from openconfig_pyang import daemon
+from openconfig_pyang import oclint
+
+from relint import pyang_lint
+
+ARGS = ["-p", "common", "lists-compression/openconfig-testcase-fail.yang"]
+
+
+def report(name, ok, detail=""):
+  if not ok:
+    if detail:
+      print(detail)
+    print("%s: FAILED" % name)
+    return 1
+  print("%s: OK" % name)
+  return 0
+
+
+def rejected(path, create=False):
+  try:
+    client.check_socket_path(path, create=create)
+  except (OSError, socket.error):
+    return True
+  return False
+
+
+def check_paths(workdir):
+  failed = 0
+
+  # The default directory is created for the user only.
+  tempfile.tempdir = workdir
+  try:
+    os.environ.pop("XDG_RUNTIME_DIR", None)
+    path = client.default_socket_path()
+    ok = not rejected(path, create=True)
+    mode = os.stat(os.path.dirname(path)).st_mode & 0o777
+    failed += report("socket-dir-created", ok and mode == 0o700,
+                     "mode %o" % mode)
+
+    # A directory that others may access is not used.
+    os.chmod(os.path.dirname(path), 0o755)
+    failed += report("socket-dir-shared", rejected(path, create=True))
+    os.chmod(os.path.dirname(path), 0o700)
+  finally:
+    tempfile.tempdir = None
+
+  # A file that is not a socket is not connected to, or removed.
+  path = os.path.join(workdir, "not-a-socket")
+  with open(path, "w") as fd:
+    fd.write("")
+  failed += report("socket-not-socket", rejected(path))
+
+  # A socket of another user can only be made where running as root.
+  if os.getuid() == 0:
+    path = os.path.join(workdir, "other.sock")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    os.chown(path, 65534, -1)
+    failed += report("socket-other-user", rejected(path))
+    sock.close()
+  return failed
+
+
+def check_timeout(workdir, expected):
+  # A socket that accepts requests but never responds to them.
+  path = os.path.join(workdir, "silent.sock")
+  sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+  sock.bind(path)
+  sock.listen(1)
+  timeout = client.REQUEST_TIMEOUT
+  client.REQUEST_TIMEOUT = 1
+  stderr = sys.stderr
+  sys.stderr = io.StringIO()
+  try:
+    got = client.main(["--socket", path] + ARGS)
+    lines = sys.stderr.getvalue().splitlines()
+  finally:
+    sys.stderr = stderr
+    client.REQUEST_TIMEOUT = timeout
+    sock.close()
+  return report("client-timeout", (got, lines) == expected,
+                "Return code %d, expected %d:\n%s" % (
+                    got, expected[0], "\n".join(lines)))
+
+
+def check_daemon_error(workdir):
+  path = os.path.join(workdir, "daemon.sock")
+  server = daemon.LintServer(path)
+  thread = threading.Thread(target=server.serve_forever)
+  thread.daemon = True
+  thread.start()
+
+  def fail(self, filenames):
+    raise RuntimeError("unexpected")
+
+  # The daemon writes the traceback of the failure, and the usage of the
+  # arguments, to stderr.
+  lint = oclint.LintSession.lint
+  oclint.LintSession.lint = fail
+  stderr = sys.stderr
+  sys.stderr = io.StringIO()
+  try:
+    response = client.request(path, os.getcwd(), ARGS)
+    oclint.LintSession.lint = lint
+    unknown = client.request(path, os.getcwd(),
+                             ["--oc-disable", "OC_BOGUS"] + ARGS)
+    serving = thread.is_alive()
+  finally:
+    sys.stderr = stderr
+    oclint.LintSession.lint = lint
+    server.shutdown()
+    server.server_close()
+  failed = report("daemon-error",
+                  "RuntimeError" in response.get("error", "") and
+                  not server.sessions, "response %s" % response)
+  failed += report("daemon-unknown-code", "error" in unknown and serving, "response %s" % unknown)
+  return failed
+
+
+def check_shared_parses(workdir):
+  path = os.path.join(workdir, "shared.sock")
+  server = daemon.LintServer(path)
+  thread = threading.Thread(target=server.serve_forever)
+  thread.daemon = True
+  thread.start()
+
+  get = server.parse_cache.get
+  found = []
+
+  def recording_get(key):
+    module = get(key)
+    if module is not None:
+      found.append(module.arg)
+    return module
+
+  server.parse_cache.get = recording_get
+  other = ["-p", "common", "key-quoting/openconfig-testcase-fail.yang"]
+  try:
+    client.request(path, os.getcwd(), ARGS)
+    response = client.request(path, os.getcwd(), other)
+  finally:
+    server.shutdown()
+    server.server_close()
+  expected = pyang_lint(other)
+  got = (response.get("exit_code"), response.get("lines"))
+  return report("daemon-shared-parses",
+                got == expected and "openconfig-extensions" in found and
+                len(server.sessions) == 2,
+                "response %s, expected %s, cached %s" % (
+                    response, expected, found))
+
+
+def main(casedir):
+  os.chdir(casedir)
+  oclint.init_plugins()
+  expected = pyang_lint(ARGS)
+  workdir = tempfile.mkdtemp()
+  try:
+    failed = check_paths(workdir)
+    failed += check_timeout(workdir, expected)
+    failed += check_daemon_error(workdir)
+    failed += check_shared_parses(workdir)
+  finally:
+    shutil.rmtree(workdir)
+  return failed
+
+
+if __name__ == "__main__":
+  sys.exit(1 if main(os.path.abspath(sys.argv[1])) else 0)
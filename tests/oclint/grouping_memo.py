@@ -0,0 +1,96 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+Checks that --oc-grouping-memo records the errors of a check for the
+first copy of a grouping, and replays them for the later copies that are
+in the same instantiation context rather than running the check again,
+and that the errors reported are those that are reported without it.
+
+Usage: grouping_memo.py <oclinter test case directory>
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+
+from openconfig_pyang import oclint
+
+ARGS = ["-p", "common", "opstate-grouping-memo/openconfig-testcase-fail.yang"]
+
+# The error of the config false leaf, at the first use of the grouping.
+EXPECTED = ("opstate-grouping-memo/openconfig-testcase-fail.yang:55 (at "
+            "opstate-grouping-memo/openconfig-testcase-fail.yang:22): error: "
+            "element \"count\" is in a \"config\" container and should have "
+            "config value true")
+
+
+def lint(args):
+  """Lint with --oc-only, counting the runs of check_opstate.
+
+  Returns:
+    A tuple of the return code and lines of the output, the number of
+    runs of check_opstate, and the results that were recorded.
+  """
+  plugin = oclint.openconfig_plugin_module()
+  functions = plugin.OCLintFunctions
+  memo = plugin.OCGroupingMemo
+  check_opstate = functions.__dict__["check_opstate"]
+  record = memo.__dict__["record"]
+  runs = []
+  recorded = []
+
+  def counted(ctx, stmt):
+    runs.append(stmt)
+    return check_opstate.__func__(ctx, stmt)
+
+  def recording(ctx, stmt, fn):
+    result = record.__func__(ctx, stmt, fn)
+    recorded.append(result)
+    return result
+
+  functions.check_opstate = staticmethod(counted)
+  memo.record = staticmethod(recording)
+  try:
+    opts, filenames = oclint.parse_args(["--oc-only"] + args)
+    code, errors = oclint.lint_module_set(opts, filenames)
+  finally:
+    functions.check_opstate = check_opstate
+    memo.record = record
+  output = "\n".join(e[2] for e in errors).splitlines()
+  return (code, output), len(runs), recorded
+
+
+def main(casedir):
+  os.chdir(casedir)
+  oclint.init_plugins()
+  full, full_runs, _ = lint(ARGS)
+  memoized, memo_runs, recorded = lint(["--oc-grouping-memo"] + ARGS)
+
+  # The error is recorded for the first copy, and no result is discarded.
+  replayed = [r for r in recorded if r]
+  if (memoized != full or EXPECTED not in full[1] or not replayed or
+      False in recorded or memo_runs >= full_runs):
+    print("Without memo (%d runs):\n%s" % (full_runs, "\n".join(full[1])))
+    print("With memo (%d runs):\n%s" % (memo_runs, "\n".join(memoized[1])))
+    print("Recorded: %s" % recorded)
+    print("grouping-memo-replay: FAILED")
+    return 1
+  print("grouping-memo-replay: OK")
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main(os.path.abspath(sys.argv[1])))
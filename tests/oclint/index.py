@@ -0,0 +1,113 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+Checks that an IndexedFileRepository finds the same modules, in the same
+order, as pyang's scan of the search path, from a new index, from an
+unchanged index without listing any directory, and after modules and
+directories are added and removed.
+
+Usage: index.py <oclinter test case directory>
+"""
+
+from __future__ import print_function
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from pyang import repository
+
+from openconfig_pyang import repository_index
+
+
+def age(root):
+  # Directories modified within RACY_SECONDS are always listed again, so
+  # the directories that have just been changed are given an older time.
+  now = time.time()
+  past = now - 10 * repository_index.RACY_SECONDS
+  for dirpath, _, _ in os.walk(root):
+    if os.stat(dirpath).st_mtime > past:
+      os.utime(dirpath, (past, past))
+
+
+def check(name, root, index_path, listed=None):
+  # The models are found both relative to the working directory, which
+  # is root, and by their absolute path.
+  path = os.pathsep.join(["models", os.path.join(root, "models"), "."])
+  expected = repository.FileRepository(
+      path, use_env=False).get_modules_and_revisions(None)
+  repos = repository_index.IndexedFileRepository(path, index_path=index_path,
+                                                 use_env=False)
+  got = repos.get_modules_and_revisions(None)
+  if got != expected or (listed is not None and repos.listed != listed):
+    print("Expected:\n  %s" % "\n  ".join(map(str, expected)))
+    print("Got (%d directories listed):\n  %s" % (
+        repos.listed, "\n  ".join(map(str, got))))
+    print("%s: FAILED" % name)
+    return 1
+  print("%s: OK" % name)
+  return 0
+
+
+def main(casedir):
+  casedir = os.path.abspath(casedir)
+  root = tempfile.mkdtemp()
+  cachedir = tempfile.mkdtemp()
+  index_path = os.path.join(cachedir, repository_index.INDEX_FILENAME)
+  failed = 0
+  cwd = os.getcwd()
+  os.chdir(root)
+  try:
+    models = os.path.join(root, "models")
+    for case in ("key-quoting", "key-quoting-submodule", "enum-case"):
+      shutil.copytree(os.path.join(casedir, case), os.path.join(models, case))
+    shutil.copy(os.path.join(casedir, "common", "openconfig-extensions.yang"),
+                models)
+    age(root)
+
+    failed += check("index-cold", root, index_path)
+    failed += check("index-warm", root, index_path, listed=0)
+
+    # Only the directories that are changed are listed again.
+    added = os.path.join(models, "key-quoting", "openconfig-added.yang")
+    with open(added, "w") as fd:
+      fd.write("module openconfig-added {}\n")
+    age(root)
+    failed += check("index-module-added", root, index_path, listed=1)
+    failed += check("index-module-added-warm", root, index_path, listed=0)
+
+    os.remove(added)
+    os.mkdir(os.path.join(models, "enum-case", "nested"))
+    shutil.copy(os.path.join(casedir, "common", "ietf-yang-types.yang"),
+                os.path.join(models, "enum-case", "nested"))
+    age(root)
+    failed += check("index-directory-added", root, index_path, listed=3)
+
+    shutil.rmtree(os.path.join(models, "key-quoting-submodule"))
+    age(root)
+    failed += check("index-directory-removed", root, index_path, listed=1)
+    failed += check("index-directory-removed-warm", root, index_path,
+                    listed=0)
+  finally:
+    os.chdir(cwd)
+    shutil.rmtree(root)
+    shutil.rmtree(cachedir)
+  return 1 if failed else 0
+
+
+if __name__ == "__main__":
+  sys.exit(main(sys.argv[1]))
@@ -0,0 +1,131 @@
+"""Copyright 2026 The OpenConfig Authors.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+   http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+
+
+Checks that a LintSession, as used by oclint --watch, reports the same
+errors as a new pyang run after modules are edited, touched, added and
+removed.
+
+Usage: relint.py <oclinter test case directory>
+"""
+
+from __future__ import print_function
+
+import difflib
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from openconfig_pyang import oclint
+
+
+def pyang_lint(args):
+  proc = subprocess.Popen(
+      ["pyang", "--openconfig", "--lint",
+       "--plugindir", oclint.plugin_dir()] + args,
+      stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+      universal_newlines=True)
+  _, err = proc.communicate()
+  return proc.returncode, err.splitlines()
+
+
+def edit(filename, old, new):
+  with open(filename) as fd:
+    text = fd.read()
+  if old not in text:
+    raise ValueError("%s does not contain %s" % (filename, old))
+  with open(filename, "w") as fd:
+    fd.write(text.replace(old, new, 1))
+
+
+def touch(filename):
+  # The modification time may not change within the resolution of the
+  # filesystem, so the file size is changed.
+  with open(filename, "a") as fd:
+    fd.write("\n")
+
+
+def main(casedir):
+  workdir = tempfile.mkdtemp()
+  try:
+    for case in os.listdir(casedir):
+      if not os.path.isdir(os.path.join(casedir, case)):
+        continue
+      shutil.copytree(os.path.join(casedir, case),
+                      os.path.join(workdir, case))
+    os.chdir(workdir)
+
+    filenames = sorted(f for f in glob.glob("*/*.yang")
+                       if not f.startswith("common/"))
+    args = ["-p", "common"] + filenames
+    opts, filenames = oclint.parse_args(args)
+    session = oclint.LintSession(opts)
+
+    steps = [
+        ("cold", None),
+        ("unchanged", None),
+        ("edit-input", lambda: edit(
+            "lists-compression/openconfig-testcase-fail.yang",
+            "container-two", "container-three")),
+        ("touch-dependency", lambda: touch(
+            "common/openconfig-extensions.yang")),
+        ("edit-submodule", lambda: edit(
+            "key-quoting-submodule/openconfig-submodule-fail.yang",
+            "key test-key;", "key \"test-key\";")),
+        ("touch-augment", lambda: touch(
+            "lists-no-sibling-augment/openconfig-testcase-fail-augment.yang")),
+        ("edit-augment-target", lambda: edit(
+            "lists-no-sibling-augment/openconfig-testcase-fail.yang",
+            "surrounding-container", "surrounding-container ")),
+        ("fix-augment-clash", lambda: edit(
+            "compression-augmentclash/openconfig-testcase-fail-augment.yang",
+            "container item {", "container other {")),
+        ("syntax-error", lambda: edit(
+            "enum-case/openconfig-testcase-fail.yang", "{", "{{")),
+        ("fix-syntax-error", lambda: edit(
+            "enum-case/openconfig-testcase-fail.yang", "{{", "{")),
+        ("add-search-module", lambda: shutil.copy(
+            "common/openconfig-extensions.yang",
+            "common/openconfig-extensions-copy.yang")),
+        ("remove-search-module", lambda: os.remove(
+            "common/openconfig-extensions-copy.yang")),
+    ]
+
+    failed = 0
+    for name, change in steps:
+      if change is not None:
+        change()
+      exit_code, lines = session.lint(filenames)
+      # Messages may contain newlines, so compare the written text.
+      got = (exit_code, "\n".join(lines).splitlines())
+      expected = pyang_lint(args)
+      if got != expected:
+        failed += 1
+        print("Return code %d, expected %d, differences:" %
+              (got[0], expected[0]))
+        print("\n".join(difflib.unified_diff(
+            expected[1], got[1], "pyang", "session", lineterm="")))
+        print("relint-%s: FAILED" % name)
+      else:
+        print("relint-%s: OK" % name)
+    return failed
+  finally:
+    shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+  sys.exit(1 if main(os.path.abspath(sys.argv[1])) else 0)
@@ -0,0 +1,424 @@
+#!/bin/bash
+# Copyright 2026 The OpenConfig Authors.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Checks that oclint reports the same errors, in the same order, and
+# with the same exit code when linting in parallel, including in worker
+# processes that are not forked, with results from the lint cache or
+# reused across grouping copies, incrementally as modules change, or
+# through the lint daemon, as it does when all modules are linted by a
+# single pyang process, that the lint API returns the same errors, that
+# the search path index finds the same modules, and that the client only
+# uses sockets that belong to the user. Also checks that
+# --oc-output-format writes a record for each error that pyang reports.
+
+TESTDIR="$(cd -P "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+CASEDIR=$TESTDIR/../oclinter
+FAIL=0
+
+# avoid python warnings causing our test cases to fail unexpectedly.
+export PYTHONWARNINGS="ignore"
+
+PLUGIN_DIR=$(/usr/bin/env python -c \
+      'import openconfig_pyang; import os; \
+       print("{}/plugins".format(os.path.dirname(openconfig_pyang.__file__)))')
+
+run_case() {
+  local name=$1
+  shift
+
+  single=$(cd $CASEDIR && pyang --openconfig --lint --plugindir $PLUGIN_DIR \
+      "$@" 2>&1)
+  singleres=$?
+  parallel=$(cd $CASEDIR && /usr/bin/env python -m openconfig_pyang.oclint \
+      --jobs 4 "$@" 2>&1)
+  parallelres=$?
+
+  if [ "$single" != "$parallel" ] || [ $singleres -ne $parallelres ]; then
+    FAIL=$((FAIL+1))
+    printf "Single process (return code $singleres):\n$single\n"
+    printf "Parallel (return code $parallelres):\n$parallel\n"
+    echo "$name: FAILED"
+  else
+    echo "$name: OK"
+  fi
+}
+
+# Compares the output of a parallel run whose worker processes are
+# started with the given multiprocessing start method, rather than forked
+# with the plugins loaded, with that of a single pyang process.
+run_start_method_case() {
+  local name=$1
+  local method=$2
+  shift 2
+
+  single=$(cd $CASEDIR && pyang --openconfig --lint --plugindir $PLUGIN_DIR \
+      "$@" 2>&1)
+  singleres=$?
+  parallel=$(cd $CASEDIR && /usr/bin/env python -c \
+      'import multiprocessing, sys; \
+       from openconfig_pyang import oclint; \
+       multiprocessing.set_start_method(sys.argv[1]); \
+       sys.exit(oclint.main(sys.argv[2:]))' \
+      $method --jobs 2 "$@" 2>&1)
+  parallelres=$?
+
+  if [ "$single" != "$parallel" ] || [ $singleres -ne $parallelres ]; then
+    FAIL=$((FAIL+1))
+    printf "Single process (return code $singleres):\n$single\n"
+    printf "Parallel, $method (return code $parallelres):\n$parallel\n"
+    echo "$name: FAILED"
+  else
+    echo "$name: OK"
+  fi
+}
+
+# Compares the output of the oclint script with that of pyang. With
+# --cache, given first, it checks that the search path is indexed in the
+# cache directory, and otherwise that no cache directory is written.
+run_script_case() {
+  local name=$1
+  shift
+  local cache=()
+  if [ "$1" == "--cache" ]; then
+    cache=(--cache)
+    shift
+  fi
+
+  local cachedir=$(mktemp -d)
+  expected=$(cd $CASEDIR && pyang --openconfig --lint \
+      --plugindir $PLUGIN_DIR "$@" 2>&1)
+  expectedres=$?
+  [ $expectedres -eq 0 ] && \
+    expected+=$'\n'"SUCCESS: no OpenConfig linter warnings"
+  got=$(cd $CASEDIR && XDG_CACHE_HOME=$cachedir \
+      $TESTDIR/../../bin/oclint "${cache[@]}" "$@" 2>&1)
+  gotres=$?
+  if [ ${#cache[@]} -ne 0 ]; then
+    [ -f $cachedir/oclint/repository.index ]
+  else
+    [ ! -e $cachedir/oclint ]
+  fi
+  cacheres=$?
+  if [ "$expected" != "$got" ] || [ $expectedres -ne $gotres ] || \
+     [ $cacheres -ne 0 ]; then
+    FAIL=$((FAIL+1))
+    printf "pyang (return code $expectedres):\n$expected\n"
+    printf "oclint (return code $gotres):\n$got\n"
+    echo "$name: FAILED"
+  else
+    echo "$name: OK"
+  fi
+  rm -rf $cachedir
+}
+
+# Compares the output of a cold and a warm run against a fresh cache, and
+# of a run where the parsed modules in the cache cannot be loaded, with
+# the output of an uncached run.
+run_cached_case() {
+  local name=$1
+  shift
+
+  local cachedir=$(mktemp -d)
+  uncached=$(cd $CASEDIR && pyang --openconfig --lint \
+      --plugindir $PLUGIN_DIR "$@" 2>&1)
+  uncachedres=$?
+  for run in cold warm stale; do
+    if [ $run == stale ]; then
+      for entry in $cachedir/*.pickle; do
+        echo stale > $entry
+      done
+    fi
+    cached=$(cd $CASEDIR && pyang --openconfig --lint \
+        --plugindir $PLUGIN_DIR --oc-cache-dir $cachedir "$@" 2>&1)
+    cachedres=$?
+    if [ "$uncached" != "$cached" ] || [ $uncachedres -ne $cachedres ]; then
+      FAIL=$((FAIL+1))
+      printf "Uncached (return code $uncachedres):\n$uncached\n"
+      printf "Cached, $run (return code $cachedres):\n$cached\n"
+      echo "$name-$run-cache: FAILED"
+    else
+      echo "$name-$run-cache: OK"
+    fi
+  done
+  rm -rf $cachedir
+}
+
+# Compares the output of the client, served by the daemon listening on
+# $SOCKET or linting in-process when no daemon is running, with that of
+# pyang.
+run_client_case() {
+  local name=$1
+  shift
+
+  expected=$(cd $CASEDIR && pyang --openconfig --lint \
+      --plugindir $PLUGIN_DIR "$@" 2>&1)
+  expectedres=$?
+  got=$(cd $CASEDIR && /usr/bin/env python -m openconfig_pyang.client \
+      --socket $SOCKET "$@" 2>&1)
+  gotres=$?
+  if [ "$expected" != "$got" ] || [ $expectedres -ne $gotres ]; then
+    FAIL=$((FAIL+1))
+    printf "pyang (return code $expectedres):\n$expected\n"
+    printf "Client (return code $gotres):\n$got\n"
+    echo "$name: FAILED"
+  else
+    echo "$name: OK"
+  fi
+}
+
+# Checks that --oc-stats does not change the reported errors, and that
+# it reports the statistics of the OpenConfig checks as JSON.
+run_stats_case() {
+  local name=$1
+  shift
+
+  expected=$(cd $CASEDIR && pyang --openconfig --lint \
+      --plugindir $PLUGIN_DIR "$@" 2>&1)
+  expectedres=$?
+  got=$(cd $CASEDIR && pyang --openconfig --lint \
+      --plugindir $PLUGIN_DIR --oc-stats json "$@" 2>&1)
+  gotres=$?
+  stats=$(echo "$got" | tail -n 1)
+  if [ "$expected" != "$(echo "$got" | sed '$d')" ] || \
+     [ $expectedres -ne $gotres ] || \
+     ! echo "$stats" | /usr/bin/env python -c \
+       'import json, sys; s = json.load(sys.stdin); \
+        assert any(c["name"] == "check check_opstate" and c["calls"] \
+                   for c in s)'; then
+    FAIL=$((FAIL+1))
+    printf "Without stats (return code $expectedres):\n$expected\n"
+    printf "With stats (return code $gotres):\n$got\n"
+    echo "$name: FAILED"
+  else
+    echo "$name: OK"
+  fi
+}
+
+# Compares the output with --oc-grouping-memo with that without it.
+run_memo_case() {
+  local name=$1
+  shift
+
+  expected=$(cd $CASEDIR && pyang --openconfig --lint \
+      --plugindir $PLUGIN_DIR "$@" 2>&1)
+  expectedres=$?
+  got=$(cd $CASEDIR && pyang --openconfig --lint \
+      --plugindir $PLUGIN_DIR --oc-grouping-memo "$@" 2>&1)
+  gotres=$?
+  if [ "$expected" != "$got" ] || [ $expectedres -ne $gotres ]; then
+    FAIL=$((FAIL+1))
+    printf "Without memo (return code $expectedres):\n$expected\n"
+    printf "With memo (return code $gotres):\n$got\n"
+    echo "$name: FAILED"
+  else
+    echo "$name: OK"
+  fi
+}
+
+# Checks that --oc-output-format does not change the reported errors, and
+# that it writes a JSON Lines record, or a SARIF result, for each of them.
+run_output_case() {
+  local name=$1
+  shift
+
+  expected=$(cd $CASEDIR && pyang --openconfig --lint \
+      --plugindir $PLUGIN_DIR "$@" 2>&1)
+  expectedres=$?
+  count=$(echo "$expected" | grep -c ": \(error\|warning\): ")
+  local output=$(mktemp)
+  for format in jsonl sarif; do
+    got=$(cd $CASEDIR && pyang --openconfig --lint \
+        --plugindir $PLUGIN_DIR --oc-output-format $format "$@" \
+        2>&1 >$output)
+    gotres=$?
+    if [ "$expected" != "$got" ] || [ $expectedres -ne $gotres ] || \
+       ! /usr/bin/env python -c \
+         'import json, sys; fmt, n = sys.argv[1], int(sys.argv[2]); \
+          t = sys.stdin.read(); \
+          r = ([json.loads(l) for l in t.splitlines()] if fmt == "jsonl" \
+               else json.loads(t)["runs"][0]["results"]); \
+          assert len(r) == n' $format $count <$output; then
+      FAIL=$((FAIL+1))
+      printf "Without output (return code $expectedres):\n$expected\n"
+      printf "With $format output (return code $gotres):\n$got\n"
+      cat $output
+      echo "$name-$format: FAILED"
+    else
+      echo "$name-$format: OK"
+    fi
+  done
+  rm -f $output
+}
+
+run_case all-testcases --oc-only -p common \
+  $(cd $CASEDIR && ls */*.yang | grep -v ^common/)
+run_case independent-sets -p common \
+  key-quoting/openconfig-testcase-fail.yang \
+  common/ietf-yang-types.yang \
+  enum-case/openconfig-testcase-fail.yang
+run_case key-quoting-submodule --oc-only -p common \
+  key-quoting-submodule/openconfig-testcase-fail.yang \
+  key-quoting-submodule/openconfig-submodule-fail.yang \
+  key-quoting/openconfig-testcase-fail.yang
+run_case lists-no-sibling-augment -p common \
+  lists-no-sibling-augment/openconfig-testcase-fail-augment.yang \
+  lists-no-sibling/openconfig-testcase-succeed.yang \
+  lists-no-sibling-augment/openconfig-testcase-fail.yang
+run_start_method_case independent-sets-spawn spawn -p common \
+  key-quoting/openconfig-testcase-fail.yang \
+  common/ietf-yang-types.yang \
+  enum-case/openconfig-testcase-fail.yang
+run_script_case script-fail -p common \
+  key-quoting/openconfig-testcase-fail.yang
+run_script_case script-cache-fail --cache -p common \
+  key-quoting/openconfig-testcase-fail.yang
+# Options of pyang's outputs are passed on to pyang.
+run_script_case script-pyang-option -f tree -p common \
+  key-quoting/openconfig-testcase-succeed.yang
+# Arguments that contain spaces are passed on as they are given.
+SPACEDIR=$(mktemp -d)
+ln -s $CASEDIR/common "$SPACEDIR/common models"
+run_script_case script-succeed --oc-only -p "$SPACEDIR/common models" \
+  key-quoting/openconfig-testcase-succeed.yang
+run_script_case script-cache-succeed --cache --oc-only \
+  -p "$SPACEDIR/common models" key-quoting/openconfig-testcase-succeed.yang
+rm -rf $SPACEDIR
+run_cached_case all-testcases -p common \
+  $(cd $CASEDIR && ls */*.yang | grep -v ^common/)
+run_cached_case key-quoting-submodule -p common \
+  key-quoting-submodule/openconfig-testcase-fail.yang \
+  key-quoting-submodule/openconfig-submodule-fail.yang
+run_stats_case stats-all-testcases -p common \
+  $(cd $CASEDIR && ls */*.yang | grep -v ^common/)
+run_memo_case memo-all-testcases -p common \
+  $(cd $CASEDIR && ls */*.yang | grep -v ^common/)
+run_output_case output-all-testcases -p common \
+  $(cd $CASEDIR && ls */*.yang | grep -v ^common/)
+run_output_case output-oc-only --oc-only -p common \
+  lists-compression/openconfig-testcase-fail.yang
+
+# The plugin's validation phases are registered once, however many times
+# a context is set up.
+if /usr/bin/env python -c \
+    'from pyang import plugin, statements; \
+     from openconfig_pyang import oclint; \
+     opts, _ = oclint.parse_args(["--oc-output-format", "jsonl", "a.yang"]); \
+     ctx = oclint.new_context(opts); \
+     [p.setup_ctx(ctx) for p in plugin.plugins]; \
+     phases = list(statements._validation_phases); \
+     assert len(phases) == len(set(phases)), phases'; then
+  echo "phases-registered-once: OK"
+else
+  FAIL=$((FAIL+1))
+  echo "phases-registered-once: FAILED"
+fi
+
+# The text of a module is only retained for the OpenConfig modules, whose
+# raw text is checked.
+if (cd $CASEDIR && /usr/bin/env python -c \
+    'from pyang import plugin; \
+     from openconfig_pyang import oclint; \
+     opts, _ = oclint.parse_args(["-p", "common", "a.yang"]); \
+     ctx = oclint.new_context(opts); \
+     [p.setup_ctx(ctx) for p in plugin.plugins]; \
+     refs = ["common/ietf-interfaces.yang", \
+             "common/openconfig-extensions.yang"]; \
+     [ctx.add_module(r, open(r).read()) for r in refs]; \
+     assert list(ctx.oc_module_text) == refs[1:], list(ctx.oc_module_text)')
+then
+  echo "text-retained-openconfig: OK"
+else
+  FAIL=$((FAIL+1))
+  echo "text-retained-openconfig: FAILED"
+fi
+
+# What the plugin replaces in pyang to cache, trace and stop the parse and
+# validation of a context's modules is restored once it is validated.
+RESTOREDIR=$(mktemp -d)
+if (cd $CASEDIR && /usr/bin/env python -c \
+    'import sys; \
+     from pyang import statements, yang_parser; \
+     from openconfig_pyang import oclint; \
+     pyang = (yang_parser.YangParser, statements.validate_module, \
+              statements._validation_phases, statements._validation_map); \
+     opts, files = oclint.parse_args(sys.argv[1:]); \
+     oclint.lint_module_set(opts, files); \
+     session = oclint.LintSession(opts); session.lint(files); \
+     assert pyang == (yang_parser.YangParser, statements.validate_module, \
+                      statements._validation_phases, \
+                      statements._validation_map); \
+     assert pyang[3] is statements._validation_map; \
+     assert not [f for f in statements._validation_map.values() \
+                 if hasattr(f, "oc_fail_fast_wrapped")]; \
+     assert type(statements._validation_phases) is list' \
+    --oc-cache-dir $RESTOREDIR --oc-trace $RESTOREDIR/trace.json \
+    --oc-fail-fast major -p common key-quoting/openconfig-testcase-fail.yang)
+then
+  echo "pyang-restored: OK"
+else
+  FAIL=$((FAIL+1))
+  echo "pyang-restored: FAILED"
+fi
+rm -rf $RESTOREDIR
+
+SOCKET=$(mktemp -u)
+/usr/bin/env python -m openconfig_pyang.daemon --socket $SOCKET 2>/dev/null &
+DAEMON=$!
+for i in $(seq 50); do
+  [ -S $SOCKET ] && break
+  sleep 0.1
+done
+for run in cold warm; do
+  run_client_case client-all-testcases-$run -p common \
+    $(cd $CASEDIR && ls */*.yang | grep -v ^common/)
+  run_client_case client-oc-only-$run --oc-only -p common \
+    key-quoting-submodule/openconfig-testcase-fail.yang \
+    key-quoting-submodule/openconfig-submodule-fail.yang
+done
+# Concurrent requests are queued by the daemon.
+for i in 1 2 3; do
+  run_client_case client-concurrent-$i -p common \
+    lists-compression/openconfig-testcase-fail.yang > $SOCKET.$i &
+done
+wait $(jobs -p | grep -v "^$DAEMON\$")
+for i in 1 2 3; do
+  cat $SOCKET.$i
+  grep -q ": OK" $SOCKET.$i || FAIL=$((FAIL+1))
+  rm -f $SOCKET.$i
+done
+kill $DAEMON
+wait $DAEMON 2>/dev/null
+run_client_case client-no-daemon -p common \
+  lists-compression/openconfig-testcase-fail.yang
+
+# The session used by --watch is compared with pyang as modules change.
+/usr/bin/env python $TESTDIR/relint.py $CASEDIR || FAIL=$((FAIL+1))
+# The errors returned by the lint API are compared with pyang's.
+/usr/bin/env python $TESTDIR/api.py $CASEDIR || FAIL=$((FAIL+1))
+# The index of the search path is compared with pyang's scan of it.
+/usr/bin/env python $TESTDIR/index.py $CASEDIR || FAIL=$((FAIL+1))
+# The errors of a check of a grouping copy are reused for later copies.
+/usr/bin/env python $TESTDIR/grouping_memo.py $CASEDIR || FAIL=$((FAIL+1))
+# The client only uses the user's sockets, and falls back to linting
+# in-process where the daemon does not respond or fails.
+/usr/bin/env python $TESTDIR/daemon_socket.py $CASEDIR || FAIL=$((FAIL+1))
+
+if [ $FAIL -ne 0 ]; then
+  echo "test fail: $FAIL tests failed"
+  exit 127
+else
+  echo "test succeeded"
+  exit 0
+fi
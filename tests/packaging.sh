@@ -46,7 +46,7 @@ if [ $? -ne 0 ]; then
 fi
 
 FAIL=0
-for TEST in oclinter; do
+for TEST in oclinter oclint modelgen benchmark batch trace; do
   echo "running test $TEST..."
   (cd /tmp; $TESTDIR/$TEST/run.sh)
   if [ $? -ne 0 ]; then
@@ -0,0 +1,96 @@
+#!/bin/bash
+# Copyright 2026 The OpenConfig Authors.
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Checks that --oc-trace does not change the output of pyang, and that it
+# writes a Chrome trace with a span for the parse and validation of each
+# module, each validation phase, and each stage of the outputs.
+
+TESTDIR="$(cd -P "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+CASEDIR=$TESTDIR/../oclinter
+FAIL=0
+
+# avoid python warnings causing our test cases to fail unexpectedly.
+export PYTHONWARNINGS="ignore"
+
+PLUGIN_DIR=$(/usr/bin/env python -c \
+      'import openconfig_pyang; import os; \
+       print("{}/plugins".format(os.path.dirname(openconfig_pyang.__file__)))')
+
+TRACE=$(mktemp)
+
+# Runs pyang with and without --oc-trace, and checks that the trace holds
+# a span of each of the names given after "--".
+run_case() {
+  local name=$1
+  shift
+  local args=()
+  while [ "$1" != "--" ]; do
+    args+=("$1")
+    shift
+  done
+  shift
+
+  expected=$(cd $CASEDIR && pyang --plugindir $PLUGIN_DIR "${args[@]}" 2>&1)
+  expectedres=$?
+  rm -f $TRACE
+  got=$(cd $CASEDIR && pyang --plugindir $PLUGIN_DIR --oc-trace $TRACE \
+      "${args[@]}" 2>&1)
+  gotres=$?
+  if [ "$expected" != "$got" ] || [ $expectedres -ne $gotres ] || \
+     ! /usr/bin/env python -c \
+       'import json, sys; \
+        events = json.load(open(sys.argv[1]))["traceEvents"]; \
+        names = set(e["name"] for e in events if e["ph"] == "X"); \
+        assert all(e["dur"] >= 0 for e in events if e["ph"] == "X"); \
+        missing = [n for n in sys.argv[2:] if n not in names]; \
+        assert not missing, "missing spans: %s" % missing' \
+       $TRACE "$@"; then
+    FAIL=$((FAIL+1))
+    printf "Without trace (return code $expectedres):\n$expected\n"
+    printf "With trace (return code $gotres):\n$got\n"
+    echo "$name: FAILED"
+  else
+    echo "$name: OK"
+  fi
+}
+
+run_case trace-lint --openconfig -p common \
+  key-quoting/openconfig-testcase-fail.yang -- \
+  "parse openconfig-testcase-fail" "parse openconfig-extensions" \
+  "validate openconfig-testcase-fail" "validate openconfig-extensions" \
+  "phase preinit" "phase import" "phase openconfig_type" \
+  "phase reference_2"
+run_case trace-paths -f paths -p common \
+  opstate-grouping-context/openconfig-testcase-succeed.yang -- \
+  "parse openconfig-testcase-succeed" "paths" \
+  "paths openconfig-testcase-succeed"
+run_case trace-oc-jstree -f oc-jstree -p common \
+  key-quoting/openconfig-testcase-succeed.yang -- \
+  "oc-jstree header" "oc-jstree css" "oc-jstree js" "oc-jstree body" \
+  "oc-jstree tree" "oc-jstree footer"
+run_case trace-docs -f docs --doc-format html -p common \
+  key-quoting/openconfig-testcase-succeed.yang -- \
+  "docs collect openconfig-testcase-succeed" \
+  "docs generate openconfig-testcase-succeed" "docs emit"
+
+rm -f $TRACE
+
+if [ $FAIL -ne 0 ]; then
+  echo "test fail: $FAIL tests failed"
+  exit 127
+else
+  echo "test succeeded"
+  exit 0
+fi